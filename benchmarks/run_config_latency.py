@@ -0,0 +1,107 @@
+"""
+Config preparation latency: deepcopy of the method config per run vs. a
+copy-on-write overlay on the memoized base (utils/run_config.py).
+
+    python benchmarks/run_config_latency.py --method nerfacto --runs 200
+
+Uses the real nerfstudio method config when nerfstudio is installed; otherwise
+(or with --synthetic) a generated dataclass tree of similar size.
+"""
+import argparse
+import copy
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import field, make_dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.run_config import apply_overlay  # noqa: E402
+
+
+def synthetic_config(depth=4, width=6, leaves=12):
+    """A nested dataclass tree roughly the size of a nerfstudio method config."""
+
+    def node(level):
+        fields = [(f"f{i}", float, field(default=float(i))) for i in range(leaves)]
+        fields.append(("items", list, field(default_factory=lambda: list(range(32)))))
+        if level < depth:
+            fields += [(f"c{i}", object, field(default_factory=lambda: node(level + 1))) for i in range(width if level else 3)]
+        return make_dataclass(f"Node{level}", fields)()
+
+    root = node(0)
+    # the paths a run overrides / owns, as in the Trainer tab
+    root.c0.c0 = node(depth)  # pipeline.datamanager.dataparser
+    return root, ("c0.c0", "c1", "c2"), {"f0": 1.0, "c0.c1.f1": 2.0, "c0.c0.f2": 3.0}
+
+
+def real_config(method):
+    from nerfstudio.configs import method_configs as mc
+
+    overrides = {
+        "max_num_iterations": 1000,
+        "steps_per_save": 500,
+        "vis": "tensorboard",
+        "viewer.websocket_port": 7008,
+        "pipeline.model.near_plane": 0.1,
+    }
+    return mc.all_methods[method], None, overrides
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--method", default="nerfacto")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--parallel", type=int, default=64, help="configs prepared at once, as for a sweep")
+    parser.add_argument("--synthetic", action="store_true")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        base, copy_paths, overrides = synthetic_config()
+        label = "synthetic tree"
+    else:
+        try:
+            base, copy_paths, overrides = real_config(args.method)
+            label = f"nerfstudio {args.method}"
+        except ImportError:
+            base, copy_paths, overrides = synthetic_config()
+            label = "synthetic tree (nerfstudio not installed)"
+
+    def deepcopy_run():
+        config = copy.deepcopy(base)
+        for path, value in overrides.items():
+            *parents, name = path.split(".")
+            node = config
+            for parent in parents:
+                node = getattr(node, parent)
+            setattr(node, name, value)
+        return config
+
+    def overlay_run():
+        if copy_paths is None:
+            return apply_overlay(base, overrides)
+        return apply_overlay(base, overrides, copy_paths)
+
+    print(f"config: {label}, median of {args.runs} runs")
+    for name, fn in (("deepcopy + setattr", deepcopy_run), ("overlay", overlay_run)):
+        single = timed(fn, args.runs)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            start = time.perf_counter()
+            list(pool.map(lambda _: fn(), range(args.parallel)))
+            batch = (time.perf_counter() - start) * 1e3
+        print(f"{name:<20} {single:>10.1f} us/config   {args.parallel} configs: {batch:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Training throughput of the WebUI training path (WebUITrainer.main ->
+train.launch -> train_loop) on CPU, for catching regressions from nerfstudio
+or torch upgrades on machines without a GPU.
+
+    python benchmarks/train_throughput.py --methods nerfacto --steps 200
+    python benchmarks/train_throughput.py --save_baseline      # store this machine's numbers
+    python benchmarks/train_throughput.py --tolerance 0.15     # exit 1 on a >15% regression
+
+Every method trains in its own spawned process on a small generated dataset,
+so peak RSS and torch state are per method. Results go to a JSON file and are
+compared with the baseline file when it exists.
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "train_throughput.json"
+# metric -> whether higher is better
+METRICS = {"setup_seconds": False, "steps_per_sec": True, "peak_rss_mb": False}
+
+
+def make_dataset(path: Path, num_images: int = 24, size: int = 64):
+    """
+    A nerfstudio-format dataset (transforms.json + images) of a shaded sphere
+    seen from cameras on a circle around it.
+    """
+    import numpy as np
+    from PIL import Image
+
+    (path / "images").mkdir(parents=True, exist_ok=True)
+    focal = size * 1.2
+    v, u = np.mgrid[0:size, 0:size] + 0.5
+    # camera space (OpenGL: x right, y up, looking down -z)
+    dirs = np.stack([(u - size / 2) / focal, -(v - size / 2) / focal, -np.ones_like(u)], -1)
+    dirs /= np.linalg.norm(dirs, axis=-1, keepdims=True)
+
+    frames = []
+    for i in range(num_images):
+        angle = 2 * math.pi * i / num_images
+        origin = np.array([4 * math.cos(angle), 4 * math.sin(angle), 1.0])
+        forward = -origin / np.linalg.norm(origin)
+        right = np.cross(forward, [0.0, 0.0, 1.0])
+        right /= np.linalg.norm(right)
+        up = np.cross(right, forward)
+        c2w = np.eye(4)
+        c2w[:3, :3] = np.stack([right, up, -forward], 1)
+        c2w[:3, 3] = origin
+
+        world_dirs = dirs @ c2w[:3, :3].T
+        # ray / unit sphere intersection
+        b = world_dirs @ origin
+        disc = b**2 - (origin @ origin - 1.0)
+        hit = disc > 0
+        t = -b - np.sqrt(np.where(hit, disc, 0.0))
+        normal = origin + t[..., None] * world_dirs
+        image = np.where(hit[..., None], 0.5 + 0.5 * normal, 1.0)
+        name = f"images/frame_{i:05d}.png"
+        Image.fromarray((image * 255).astype(np.uint8)).save(path / name)
+        frames.append({"file_path": name, "transform_matrix": c2w.tolist()})
+
+    transforms = {
+        "camera_model": "OPENCV",
+        "fl_x": focal,
+        "fl_y": focal,
+        "cx": size / 2,
+        "cy": size / 2,
+        "w": size,
+        "h": size,
+        "frames": frames,
+    }
+    (path / "transforms.json").write_text(json.dumps(transforms, indent=2))
+    return path
+
+
+def peak_rss_mb() -> float:
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def run_case(method: str, data: str, output_dir: str, steps: int, rays: int, queue):
+    """Entry point of the benchmark process of one method."""
+    from utils.run_config import build_run_config
+    from utils.trainer import WebUITrainer
+
+    # nothing but training in the timed loop: no viewer, evaluation or intermediate checkpoints
+    config = build_run_config(
+        method,
+        {
+            "data": Path(data),
+            "output_dir": Path(output_dir),
+            "timestamp": method,
+            "max_num_iterations": steps,
+            "steps_per_save": steps * 10,
+            "steps_per_eval_batch": steps * 10,
+            "steps_per_eval_image": steps * 10,
+            "steps_per_eval_all_images": steps * 10,
+            "mixed_precision": False,
+            "vis": "tensorboard",
+            "machine.device_type": "cpu",
+            "machine.num_devices": 1,
+            "machine.seed": 42,
+            "pipeline.datamanager.train_num_rays_per_batch": rays,
+            "pipeline.datamanager.eval_num_rays_per_batch": rays,
+        },
+    )
+    trainer = WebUITrainer()
+    trainer.config = config
+    start = time.time()
+    trainer.main()
+    end = time.time()
+
+    samples = list(trainer.telemetry.samples)
+    first, last = samples[0], samples[-1]
+    if last is first:
+        # shorter than one telemetry interval: time the rest of the run instead
+        last = {"step": steps - 1, "time": end}
+    queue.put(
+        {
+            # launch, dataset loading and model construction, up to the end of the first step
+            "setup_seconds": first["time"] - start,
+            "steps_per_sec": (last["step"] - first["step"]) / (last["time"] - first["time"]),
+            "peak_rss_mb": peak_rss_mb(),
+            "total_seconds": end - start,
+            "steps": steps,
+        }
+    )
+
+
+def environment() -> dict:
+    from importlib import metadata
+
+    def version(name):
+        try:
+            return metadata.version(name)
+        except metadata.PackageNotFoundError:
+            return None
+
+    return {
+        "python": platform.python_version(),
+        "torch": version("torch"),
+        "nerfstudio": version("nerfstudio"),
+        "machine": platform.machine(),
+        "cpus": len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count(),
+        "torch_threads": os.environ.get("OMP_NUM_THREADS"),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    """
+    Lines describing each metric against the baseline, and the number of
+    metrics that got worse by more than ``tolerance``.
+    """
+    lines, regressions = [], 0
+    for method, result in results.items():
+        base = baseline.get(method)
+        if base is None:
+            lines.append(f"{method}: no baseline")
+            continue
+        for metric, higher_is_better in METRICS.items():
+            if not base.get(metric):
+                continue
+            change = result[metric] / base[metric] - 1
+            worse = -change if higher_is_better else change
+            flag = "REGRESSION" if worse > tolerance else ""
+            regressions += bool(flag)
+            lines.append(f"{method:<16} {metric:<14} {base[metric]:>10.3f} -> {result[metric]:>10.3f} {change:+7.1%} {flag}")
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--methods", nargs="+", default=["nerfacto"])
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--rays", type=int, default=512, help="rays per training batch")
+    parser.add_argument("--images", type=int, default=24)
+    parser.add_argument("--image_size", type=int, default=64)
+    parser.add_argument("--output", type=Path, default=Path("train_throughput.json"))
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save_baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="relative change counted as a regression")
+    args = parser.parse_args()
+
+    try:
+        import nerfstudio  # noqa: F401
+        import torch  # noqa: F401
+    except ImportError as e:
+        sys.exit(f"The training benchmark needs nerfstudio and torch: {e}")
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="webui-bench-") as tmp:
+        data = make_dataset(Path(tmp) / "data", args.images, args.image_size)
+        ctx = multiprocessing.get_context("spawn")
+        for method in args.methods:
+            queue = ctx.Queue()
+            process = ctx.Process(
+                target=run_case,
+                args=(method, str(data), str(Path(tmp) / "outputs"), args.steps, args.rays, queue),
+            )
+            process.start()
+            process.join()
+            if process.exitcode != 0 or queue.empty():
+                sys.exit(f"{method}: benchmark process failed (exit code {process.exitcode})")
+            results[method] = queue.get()
+            r = results[method]
+            print(
+                f"{method:<16} setup {r['setup_seconds']:.2f} s  "
+                f"{r['steps_per_sec']:.2f} steps/s  peak RSS {r['peak_rss_mb']:.0f} MiB"
+            )
+
+    report = {"environment": environment(), "settings": vars(args) | {"output": None, "baseline": None}, "results": results}
+    args.output.write_text(json.dumps(report, indent=2, default=str))
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2, default=str))
+        print(f"Baseline written to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print("No baseline to compare with (run with --save_baseline)")
+        return
+    baseline = json.loads(args.baseline.read_text())
+    lines, regressions = compare(results, baseline["results"], args.tolerance)
+    print(f"Against baseline ({baseline['environment']}):")
+    print("\n".join(lines))
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
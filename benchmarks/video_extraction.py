@@ -0,0 +1,96 @@
+"""
+Frame extraction time of a video: one ffmpeg pass over the whole file (the
+serial path) vs. the segmented parallel extraction of utils/video_frames.py.
+
+    python benchmarks/video_extraction.py --duration 120 --size 3840x2160 --frames 300
+    python benchmarks/video_extraction.py --workers 4 8 16
+
+The video is generated with ffmpeg's testsrc2 source (H.264, one keyframe
+every 2 seconds). When nerfstudio is installed its own convert_video_to_images
+is timed too.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.video_frames import extract_frames  # noqa: E402
+
+
+def make_video(path: Path, duration: float, size: str, fps: int):
+    subprocess.run(
+        [
+            "ffmpeg", "-v", "error", "-y",
+            "-f", "lavfi", "-i", f"testsrc2=size={size}:rate={fps}:duration={duration}",
+            "-c:v", "libx264", "-preset", "ultrafast", "-g", str(2 * fps), "-pix_fmt", "yuv420p",
+            str(path),
+        ],
+        check=True,
+    )
+
+
+def timed(fn):
+    start = time.perf_counter()
+    count = fn()
+    return time.perf_counter() - start, count
+
+
+def nerfstudio_extraction(video: Path, output_dir: Path, frames: int):
+    from nerfstudio.process_data.process_data_utils import convert_video_to_images
+
+    summary, count = convert_video_to_images(video, output_dir, num_frames_target=frames, num_downscales=0, verbose=False)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds of video")
+    parser.add_argument("--size", default="3840x2160")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--frames", type=int, default=300, help="frames to extract")
+    parser.add_argument("--workers", type=int, nargs="+", default=[os.cpu_count() or 1])
+    parser.add_argument("--output", type=Path, default=Path("video_extraction.json"))
+    args = parser.parse_args()
+
+    if shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None:
+        sys.exit("The video benchmark needs ffmpeg and ffprobe on the PATH")
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="webui-bench-") as tmp:
+        video = Path(tmp) / "synthetic.mp4"
+        print(f"Generating a {args.duration:.0f}s {args.size} video...")
+        make_video(video, args.duration, args.size, args.fps)
+
+        cases = {"serial": lambda out: extract_frames(video, out, args.frames, workers=1)}
+        try:
+            import nerfstudio  # noqa: F401
+
+            cases["nerfstudio"] = lambda out: nerfstudio_extraction(video, out, args.frames)
+        except ImportError:
+            pass
+        for workers in args.workers:
+            cases[f"parallel x{workers}"] = lambda out, workers=workers: extract_frames(video, out, args.frames, workers)
+
+        for name, fn in cases.items():
+            out = Path(tmp) / name.replace(" ", "_")
+            seconds, count = timed(lambda: fn(out))
+            shutil.rmtree(out, ignore_errors=True)
+            results[name] = {"seconds": seconds, "frames": count}
+
+    serial = results["serial"]["seconds"]
+    for name, r in results.items():
+        print(f"{name:<16} {r['seconds']:7.2f} s  {r['frames']:4d} frames  {serial / r['seconds']:5.2f}x")
+    report = {"settings": vars(args) | {"output": None}, "results": results}
+    args.output.write_text(json.dumps(report, indent=2, default=str))
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,7 @@ u.generate_args = lambda config, visible=True: ([], [])
 
 # 2) Import your real UI and its config dict
 import modules.data_processor_tab as dpt_mod
-from modules.data_processor_tab import DataProcessorTab, dataprocessor_configs as real_configs
+from modules.data_processor_tab import DataProcessorTab, get_dataprocessor_configs
 import webui
 
 # 3) A dummy processor _instance_ (not class!) that just sleeps & bumps progress
@@ -35,32 +35,11 @@ class DummyProcessor:
         for line in self._proc.stdout:
             print(line.strip())
 
-# 4) An InlineProcess that runs the bound .main() on a thread
-class InlineProcess:
-    def __init__(self, target, *args, **kwargs):
-        self._target = target
-        self._alive = False
-    def start(self):
-        self._alive = True
-        threading.Thread(target=self._run, daemon=True).start()
-    def _run(self):
-        try:
-            self._target()
-        finally:
-            self._alive = False
-    def is_alive(self):
-        return self._alive
-    def terminate(self):
-        self._alive = False
-
 # 5) Patch the module’s dict to instances of DummyProcessor
 dummy_configs = {
-    name: DummyProcessor() for name in real_configs.keys()
+    name: DummyProcessor() for name in dpt_mod.DATAPROCESSOR_SUBCOMMANDS
 }
-dpt_mod.dataprocessor_configs = dummy_configs
-
-# 6) Patch multiprocessing.Process to our inline version
-dpt_mod.multiprocessing.Process = InlineProcess
+dpt_mod._dataprocessor_configs = dummy_configs
 
 # 7) Monkey-patch DataProcessorTab to default‐select the first method
 #    (so dataprocessor.value != None by default)
@@ -69,7 +48,7 @@ def _build_with_default(self):
     # call original…
     orig_build(self)
     # and then force the radio’s default value
-    first = list(dpt_mod.dataprocessor_configs.keys())[0]
+    first = list(get_dataprocessor_configs().keys())[0]
     self.dataprocessor.value = first
 
 DataProcessorTab._build_layout = _build_with_default
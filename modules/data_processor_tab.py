@@ -1,13 +1,16 @@
-import multiprocessing
-import subprocess
+import sys
+import glob
 import os
 import re
 from pathlib import Path
 import logging
 import time
 import argparse
+from collections import Counter
+from dataclasses import replace
+from functools import partial
 import gradio as gr
-from typing import Tuple, Any, Literal, get_origin, get_args
+from typing import Tuple, Any
 
 
 from utils.utils import (
@@ -16,44 +19,143 @@ from utils.utils import (
     browse_video,
     submit,
     generate_args,
+    track_rendered_args,
+    rendered_args,
 )
-from nerfstudio.scripts.process_data import (
-    ImagesToNerfstudioDataset,
-    # ProcessMetashape,
-    ProcessODM,
-    ProcessPolycam,
-    # ProcessRealityCapture,
-    ProcessRecord3D,
-    VideoToNerfstudioDataset,
-)
-from nerfstudio.process_data.colmap_converter_to_nerfstudio_dataset import ColmapConverterToNerfstudioDataset
-
-from utils.utils import run_cmd, extract_field_info
-
-field_constraints = extract_field_info(ColmapConverterToNerfstudioDataset)
-field_constraints.pop('crop_factor', None)      # TODO: solve tuple(float, float,..), not implemented for dinamic UI+
-import pprint
-pprint.pprint(field_constraints)
+from utils.utils import run_cmd
+from utils.schema_cache import get_schema_cache, resolve_type_specs
+from utils.output_stream import OutputBuffer, stream_changes, stream_output
+from utils.job_manager import get_job_manager, BATCH_THREADS_PER_JOB
+from utils.dataset_cache import get_dataset_cache, normalize_args
+from utils import incremental_processing
+from utils.incremental_processing import COLMAP_CAMERA_MODELS, plan_increment, record_when_done
+from utils import video_frames
+from utils.video_frames import NUM_FRAMES_TARGET
+from utils import frame_culling
+from utils.frame_culling import BLUR_RATIO, MAX_HASH_DISTANCE
+from utils.process_progress import ProcessProgress, progress_html, progress_text
 
 current_path = Path(__file__).parent
-dataprocessor_configs = {
-    "ImagesToNerfstudioDataset": ImagesToNerfstudioDataset(current_path, current_path),
-    "VideoToNerfstudioDataset": VideoToNerfstudioDataset(current_path, current_path),
-    "ProcessPolycam": ProcessPolycam(current_path, current_path),
-    # "ProcessMetashape": ProcessMetashape(current_path, current_path, current_path),
-    # "ProcessRealityCapture": ProcessRealityCapture(current_path, current_path, current_path),
-    "ProcessRecord3D": ProcessRecord3D(current_path, current_path),
-    "ProcessODM": ProcessODM(current_path, current_path),
+
+# map tab name → CLI subcommand
+DATAPROCESSOR_SUBCOMMANDS = {
+    "ImagesToNerfstudioDataset": "images",
+    "VideoToNerfstudioDataset": "video",
+    "ProcessPolycam": "polycam",
+    "ProcessRecord3D": "record3d",
+    "ProcessODM": "odm",
 }
 
 
+_dataprocessor_configs = None  # built by get_dataprocessor_configs
+_field_constraints = None  # built by get_field_constraints
+
+
+def get_dataprocessor_configs():
+    """
+    Build the data-processor config instances on first use.
+
+    nerfstudio.scripts.process_data is only imported here, so loading this
+    module (and starting the WebUI) does not pay for it.
+    """
+    global _dataprocessor_configs
+    if _dataprocessor_configs is None:
+        from nerfstudio.scripts.process_data import (
+            ImagesToNerfstudioDataset,
+            # ProcessMetashape,
+            ProcessODM,
+            ProcessPolycam,
+            # ProcessRealityCapture,
+            ProcessRecord3D,
+            VideoToNerfstudioDataset,
+        )
+
+        _dataprocessor_configs = {
+            "ImagesToNerfstudioDataset": ImagesToNerfstudioDataset(current_path, current_path),
+            "VideoToNerfstudioDataset": VideoToNerfstudioDataset(current_path, current_path),
+            "ProcessPolycam": ProcessPolycam(current_path, current_path),
+            # "ProcessMetashape": ProcessMetashape(current_path, current_path, current_path),
+            # "ProcessRealityCapture": ProcessRealityCapture(current_path, current_path, current_path),
+            "ProcessRecord3D": ProcessRecord3D(current_path, current_path),
+            "ProcessODM": ProcessODM(current_path, current_path),
+        }
+    return _dataprocessor_configs
+
+
+def get_field_constraints():
+    """Field specs of ColmapConverterToNerfstudioDataset by name, read from the schema cache on first use."""
+    global _field_constraints
+    if _field_constraints is None:
+        from nerfstudio.process_data.colmap_converter_to_nerfstudio_dataset import ColmapConverterToNerfstudioDataset
+
+        specs = get_schema_cache().get(
+            "dataprocessor/ColmapConverterToNerfstudioDataset", ColmapConverterToNerfstudioDataset, resolve_type_specs
+        )
+        constraints = {spec["name"]: spec for spec in specs}
+        constraints.pop('crop_factor', None)      # TODO: solve tuple(float, float,..), not implemented for dinamic UI+
+        logging.getLogger(__name__).debug("Field constraints loaded", extra={"fields": list(constraints)})
+        _field_constraints = constraints
+    return _field_constraints
+
+
 BOX_CHARS = re.compile(r'[\u2500-\u257f]')
+LOG_TAIL_LINES = 200  # lines of process output shown in the log box
 
 def _clean_line(line: str) -> str:
     # remove box‐drawing + trim
     return BOX_CHARS.sub("", line).strip()
 
 
+VIDEO_STAGING_DIR = "video_frames"  # frames of a parallel video extraction, below the output directory
+CULLED_STAGING_DIR = "culled_frames"  # images kept by frame culling, below the output directory
+VIDEO_EXTENSIONS = {".mp4", ".mov", ".avi", ".mkv", ".webm", ".m4v"}
+BATCH_COLUMNS = ["Input", "Output", "Method", "Job", "State", "Last Output"]
+
+
+def expand_batch_inputs(text: str) -> list[Path]:
+    """
+    Paths listed in ``text``, one path or glob pattern per line.
+
+    Globs are expanded in sorted order, duplicates are dropped and paths
+    that do not exist are skipped.
+    """
+    inputs, seen = [], set()
+    for pattern in text.splitlines():
+        pattern = os.path.expanduser(pattern.strip())
+        if not pattern:
+            continue
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            path = Path(match)
+            if path.exists() and path not in seen:
+                seen.add(path)
+                inputs.append(path)
+    return inputs
+
+
+def batch_method(dataprocessor: str, path: Path) -> str:
+    """Data processor for one batch item: videos and image folders are told apart by the path."""
+    if dataprocessor in ("ImagesToNerfstudioDataset", "VideoToNerfstudioDataset"):
+        if path.is_file() and path.suffix.lower() in VIDEO_EXTENSIONS:
+            return "VideoToNerfstudioDataset"
+        return "ImagesToNerfstudioDataset"
+    return dataprocessor
+
+
+def plan_batch(inputs: list[Path], output_root: str) -> list[tuple[Path, Path]]:
+    """Map every input to its own directory under ``output_root``, named after the input."""
+    plan, used = [], set()
+    for path in inputs:
+        name = path.stem if path.is_file() else path.name
+        candidate, i = name, 1
+        while candidate in used:
+            i += 1
+            candidate = f"{name}_{i}"
+        used.add(candidate)
+        plan.append((path, Path(output_root) / candidate))
+    return plan
+
+
 class DataProcessorTab:
     def __init__(self, args: argparse.Namespace):
         super().__init__()
@@ -68,18 +170,25 @@ class DataProcessorTab:
 
         self.root_dir = args.root_dir  # root directory
         self.run_in_new_terminal = args.run_in_new_terminal  # run in new terminal
+        self.lazy_ui = args.lazy_ui  # render config panels on demand
+        self.streaming = args.streaming  # push output from a generator instead of timer polling
+        self.stream_max_fps = args.stream_max_fps  # max updates per second when streaming
+        self.output_log_rate = args.processing_output_log_rate  # output lines per second logged for its jobs
 
         self.dataprocessor_args = {}
         self.dataprocessor_args_cmd = ""
+        self.num_frames_target = NUM_FRAMES_TARGET  # of VideoToNerfstudioDataset, not a converter field
+        self.culling = {"enabled": False, "blur_ratio": BLUR_RATIO, "max_distance": MAX_HASH_DISTANCE}
 
         self.dataprocessor_groups = []     # keep track of the dataprocessor groups
         self.dataprocessor_group_idx = {}  # keep track of the dataprocessor group index
-        self.dataprocessor_arg_list = []   # gr components for the dataprocessor args
+        self.dataprocessor_arg_list = []   # gr components for the dataprocessor args (lazy_ui: the session's gr.State)
         self.dataprocessor_arg_names = []  # keep track of the dataprocessor args names
         self.dataprocessor_arg_idx = {}    # record the start and end index of the dataprocessor args
 
-        self.process = None
-        self.start_time = None
+        self.job = None               # latest job submitted from this tab
+        self.output = OutputBuffer()  # process output, shared by all jobs of this tab
+        self.batch = []               # (input, output, method, job) of the latest batch
 
 
     def setup_ui(self):
@@ -89,15 +198,28 @@ class DataProcessorTab:
     def _build_layout(self):
         with gr.Tab(label="Process Data"):
             self.status = gr.Textbox(label="Status", lines=1, placeholder="Waiting")
+            self.progress_bar = gr.HTML()
             self.timer  = gr.Timer(value=1, active=False)
+            self.output_seq = gr.State(0)  # next output line this client has not seen yet
 
             with gr.Row():
                 self.dataprocessor = gr.Radio(
-                    choices=list(dataprocessor_configs.keys()), label="Method", scale=5
+                    choices=list(DATAPROCESSOR_SUBCOMMANDS.keys()), label="Method", scale=5
                 )
                 self.run_button = gr.Button(value="Process", variant="primary", scale=1)
                 self.cmd_button = gr.Button(value="Show Command", scale=1)
                 self.stop_button = gr.Button(value="Stop", variant="stop", scale=1)
+                with gr.Column(scale=1, min_width=160):
+                    self.reuse_cache = gr.Checkbox(
+                        label="Reuse Cached Output", value=True, visible=get_dataset_cache().enabled
+                    )
+                    self.incremental = gr.Checkbox(label="Only Add New Images", value=False)
+                    self.parallel_video = gr.Checkbox(label="Parallel Frame Extraction", value=True)
+
+            with gr.Accordion("Process Output", open=False):
+                self.log_box = gr.Textbox(
+                    show_label=False, lines=10, max_lines=20, autoscroll=True, interactive=False
+                )
 
             if os.name == "nt":
                 with gr.Row():
@@ -167,8 +289,15 @@ class DataProcessorTab:
                     )
                     self.out_button.click(submit, inputs=self.output_path, outputs=self.output_path)
 
+            self._build_batch_ui()
+            self._build_culling_ui()
+
             with gr.Accordion("Data Processor Config", open=False):
-                for key, config in dataprocessor_configs.items():
+                if self.lazy_ui:
+                    self._build_rendered_processor_ui()
+                    return
+
+                for key, config in get_dataprocessor_configs().items():
                     group, generated_args, labels = self._build_processor_ui(config)
                     self.dataprocessor_arg_list += generated_args
                     self.dataprocessor_arg_names += labels
@@ -181,23 +310,78 @@ class DataProcessorTab:
                         len(self.dataprocessor_groups) - 1
                     )
 
-    def _build_processor_ui(self, config_instance):
+    def _build_batch_ui(self):
+        with gr.Accordion("Batch Processing", open=False):
+            with gr.Row():
+                self.batch_inputs = gr.Textbox(
+                    label="Inputs",
+                    lines=4,
+                    placeholder="One folder, video or glob per line, e.g. /captures/2024-*/",
+                    scale=4,
+                )
+                with gr.Column(scale=1):
+                    self.batch_workers = gr.Number(
+                        label=f"Parallel Workers (~{BATCH_THREADS_PER_JOB} cores each)",
+                        value=get_job_manager().limits["batch"],
+                        precision=0,
+                        minimum=1,
+                    )
+                    self.batch_button = gr.Button(value="Process Batch", variant="primary")
+                    self.batch_stop_button = gr.Button(value="Stop Batch", variant="stop")
+            self.batch_output_root = gr.Textbox(
+                label="Output Root",
+                lines=1,
+                placeholder="Every input is written to <output root>/<input name>",
+            )
+            self.batch_table = gr.Dataframe(headers=BATCH_COLUMNS, interactive=False)
+            self.batch_timer = gr.Timer(value=2, active=False)
+
+    def _build_culling_ui(self):
+        with gr.Accordion("Frame Culling", open=False):
+            with gr.Row():
+                enabled = gr.Checkbox(label="Drop Blurry and Near-Duplicate Frames", value=False, scale=1)
+                blur_ratio = gr.Slider(
+                    label="Min Sharpness (fraction of the median)", minimum=0.0, maximum=1.0, step=0.05,
+                    value=BLUR_RATIO, scale=2,
+                )
+                max_distance = gr.Slider(
+                    label="Near-Duplicate Hash Distance (bits)", minimum=0, maximum=16, step=1,
+                    value=MAX_HASH_DISTANCE, scale=2,
+                )
+            for component in (enabled, blur_ratio, max_distance):
+                component.change(self.set_culling, inputs=[enabled, blur_ratio, max_distance], outputs=None)
+
+    def set_culling(self, enabled, blur_ratio, max_distance):
+        self.culling = {"enabled": bool(enabled), "blur_ratio": float(blur_ratio), "max_distance": int(max_distance)}
+
+    def _build_rendered_processor_ui(self):
+        """Render only the config panel of the selected data processor, its values kept per session in a gr.State."""
+        rendered = gr.State({})
+        self.dataprocessor_arg_list = [rendered]
+
+        @gr.render(inputs=self.dataprocessor)
+        def render_processor_args(dataprocessor):
+            if not dataprocessor:
+                return
+            config = get_dataprocessor_configs()[dataprocessor]
+            _, components, names = self._build_processor_ui(config, visible=True)
+            track_rendered_args(components, names, rendered, f"dataprocessor/{dataprocessor}")
+
+    def _build_processor_ui(self, config_instance, visible=False):
         """
         Dynamically build a Gradio UI group for the given data-processor config instance.
         Returns: (group, components, names)
         """
-        field_info = extract_field_info(type(config_instance))
-        field_info["verbose"] = {"type": bool, "valid_values": None, "default": True}
+        config_type = type(config_instance)
+        field_specs = get_schema_cache().get(f"dataprocessor/{config_type.__name__}", config_type, resolve_type_specs)
+        field_specs = [spec for spec in field_specs if spec["name"] != "verbose"]
+        field_specs.append({"name": "verbose", "kind": "bool", "choices": None, "default": True})
 
         components, names = [], []
         # TODO: avoid the data, output_dir, and eval_data
-        with gr.Group(visible=False) as group:
-            for field_name, info in field_info.items():
-                typ = info["type"]
-                default = info["default"]
-                valid_values = info["valid_values"]
-
-                field_comps, field_names = self._make_field_components(field_name, typ, default, valid_values)
+        with gr.Group(visible=visible) as group:
+            for spec in field_specs:
+                field_comps, field_names = self._make_field_components(spec)
 
                 # If it's a multi-element row, wrap them
                 if len(field_comps) > 1:
@@ -211,23 +395,27 @@ class DataProcessorTab:
         return group, components, names
     
 
-    def _make_field_components(self, field_name, typ, default, valid_values):
+    def _make_field_components(self, spec):
         """
         Returns:
-          - a list of 1+ Gradio components for this field
+          - a list of 1+ Gradio components for this field spec
           - a list of corresponding field_name entries (one per component)
         """
+        field_name = spec["name"]
+        kind = spec["kind"]
+        default = spec["default"]
+
         # 1) Literal → Dropdown
-        if valid_values:
+        if kind == "literal":
             comp = gr.Dropdown(
-                choices=list(valid_values),
+                choices=spec["choices"],
                 label=field_name,
                 value=default,
             )
             return [comp], [field_name]
 
         # 2) Bool → Checkbox
-        if typ is bool:
+        if kind == "bool":
             comp = gr.Checkbox(
                 label=field_name,
                 value=bool(default),
@@ -235,34 +423,32 @@ class DataProcessorTab:
             return [comp], [field_name]
 
         # 3) Numeric → Number
-        if typ in (int, float):
+        if kind in ("int", "float"):
             comp = gr.Number(
                 label=field_name,
                 value=default,
-                precision=(0 if typ is int else None),
+                precision=(0 if kind == "int" else None),
             )
             return [comp], [field_name]
 
         # 4) Sequence → one component per element
-        origin = get_origin(typ)
-        args = get_args(typ)
-        if origin in (list, tuple) and args:
-            subtype = args[0]
-            length = len(default) if isinstance(default, (list, tuple)) else len(args)
+        if kind == "sequence":
+            item_kind = spec["item_kind"]
+            length = spec["length"]
             comps, names = [], []
             for i in range(length):
-                val = default[i] if isinstance(default, (list, tuple)) else None
+                val = default[i] if isinstance(default, list) and i < len(default) else None
 
-                if subtype is bool:
+                if item_kind == "bool":
                     c = gr.Checkbox(label=f"{field_name}[{i}]", value=bool(val))
-                elif subtype in (int, float):
+                elif item_kind in ("int", "float"):
                     c = gr.Number(
                         label=f"{field_name}[{i}]",
                         value=val if val is not None else 0,
-                        precision=0 if subtype is int else None,
+                        precision=0 if item_kind == "int" else None,
                     )
-                elif get_origin(subtype) is Literal:
-                    opts = list(get_args(subtype))
+                elif item_kind == "literal":
+                    opts = spec["item_choices"]
                     c = gr.Dropdown(
                         label=f"{field_name}[{i}]",
                         choices=opts,
@@ -288,34 +474,57 @@ class DataProcessorTab:
         
     def _wire_events(self):
         ''' Connect events to the UI components '''
-         # show/hide config panels       
-        self.dataprocessor.change(
-            self.update_dataprocessor_args_visibility,
-            inputs=self.dataprocessor,
-            outputs=self.dataprocessor_groups,
-        )
+         # show/hide config panels (rendered on demand in lazy mode)
+        if not self.lazy_ui:
+            self.dataprocessor.change(
+                self.update_dataprocessor_args_visibility,
+                inputs=self.dataprocessor,
+                outputs=self.dataprocessor_groups,
+            )
          
          # run → get args → start job → show initial status + turn timer ON
-        self.run_button.click(
+        run_event = self.run_button.click(
             self.get_dataprocessor_args,
             inputs=[self.dataprocessor] + self.dataprocessor_arg_list,
             outputs=None,
-        ).then(
-            self.run_dataprocessor,
-            inputs=[self.dataprocessor, self.data_path, self.output_path],
-            outputs=[self.status, self.timer],
-        ).then(
-            lambda: ('Processing', gr.update(active=True)),
-            inputs=None,
-            outputs=self.timer,            
         )
+        if self.streaming:
+            # the handler itself pushes output until the job exits, no timer
+            run_event.then(
+                self.stream_dataprocessor,
+                inputs=[
+                    self.dataprocessor,
+                    self.data_path,
+                    self.output_path,
+                    self.reuse_cache,
+                    self.incremental,
+                    self.parallel_video,
+                ],
+                outputs=[self.status, self.log_box, self.progress_bar],
+                concurrency_limit=None,
+            )
+        else:
+            # the handler turns the timer on, unless the output was reused from the cache
+            run_event.then(
+                self.run_dataprocessor,
+                inputs=[
+                    self.dataprocessor,
+                    self.data_path,
+                    self.output_path,
+                    self.reuse_cache,
+                    self.incremental,
+                    self.parallel_video,
+                ],
+                outputs=[self.status, self.timer],
+            )
 
-        # Reiterative polling
-        self.timer.tick(
-            self.update_status,
-            inputs=None,
-            outputs=[self.status, self.timer]
-        )
+            # Reiterative polling
+            self.timer.tick(
+                self.update_status,
+                inputs=self.output_seq,
+                outputs=[self.status, self.log_box, self.timer, self.output_seq]
+            )
+            self.timer.tick(self.update_progress_bar, inputs=None, outputs=self.progress_bar)
 
         # Show the command
         self.cmd_button.click(
@@ -330,38 +539,145 @@ class DataProcessorTab:
 
         self.stop_button.click(self.stop, inputs=None, outputs=self.status)
 
-    def update_status(self):
-        if self.start_time is None:
-            return "Idle", gr.update(active=False)
+        # batch: same config args, one job per input on the "batch" resource class
+        batch_event = self.batch_button.click(
+            self.get_dataprocessor_args,
+            inputs=[self.dataprocessor] + self.dataprocessor_arg_list,
+            outputs=None,
+        )
+        batch_inputs = [self.dataprocessor, self.batch_inputs, self.batch_output_root, self.batch_workers]
+        if self.streaming:
+            batch_event.then(
+                self.stream_batch,
+                inputs=batch_inputs,
+                outputs=[self.status, self.batch_table],
+                concurrency_limit=None,
+            )
+        else:
+            batch_event.then(
+                self.run_batch,
+                inputs=batch_inputs,
+                outputs=[self.status, self.batch_table, self.batch_timer],
+            )
+            self.batch_timer.tick(
+                self.update_batch_status,
+                inputs=None,
+                outputs=[self.status, self.batch_table, self.batch_timer],
+            )
+        self.batch_stop_button.click(self.stop_batch, inputs=None, outputs=self.status)
+
+    def update_status(self, last_seq=0):
+        """
+        Report everything the job printed since ``last_seq``.
+
+        Returns (status, log box, timer, next sequence number). The output is
+        drained by the job's reader thread, so the tick rate only affects how
+        often the browser is updated, not how fast the process can write.
+        """
+        job = self.job
+        if job is None:
+            return "Idle", gr.skip(), gr.update(active=False), last_seq
+
+        lines, next_seq = self.output.read_since(last_seq)
+        if job.state == "queued":
+            position = get_job_manager().queue_position(job)
+            return f"Queued (position {position})", gr.skip(), gr.update(active=True), next_seq
+        if job.is_active():
+            if lines:
+                log = "\n".join(self.output.tail(LOG_TAIL_LINES))
+                return self._status_text(job, lines[-1]), log, gr.update(active=True), next_seq
+            return gr.skip(), gr.skip(), gr.update(active=True), next_seq
 
-        code = self.process.poll()
-        if code is None:
-            raw = self.process.stdout.readline()
-            line = _clean_line(raw)
-            if line:
-                self.logger.info("Process output: %s", line)
-                return line, gr.update(active=True)
-            return gr.skip(), gr.update(active=True)
+        # Job has finished, its output is fully drained at this point
+        log = "\n".join(self.output.tail(LOG_TAIL_LINES)) if lines else gr.skip()
+        status = self._finish(job, lines[-1] if lines else "")
+        return status, log, gr.update(active=False), next_seq
 
-        # Process has exited
-        elapsed = int(time.time() - self.start_time)
-        remaining = _clean_line(self.process.stdout.read())
-        self.start_time = None
+    def update_progress_bar(self):
+        job = self.job
+        return progress_html(job.progress) if job is not None and job.is_active() else ""
 
+    @staticmethod
+    def _status_text(job, last_line):
+        """The parsed progress of the job, or its last output line while no stage was recognized."""
+        return progress_text(job.progress) if job.progress.get("stage") else last_line
+
+    def _submit(self, name, resource, argv, output=None, before=None):
+        """Submit an ns-process-data style job whose output is parsed into ``job.progress``."""
+        progress = {}
+        job_manager = get_job_manager()
+        policy = job_manager.output_log
+        return job_manager.submit(
+            name,
+            resource,
+            argv=argv,
+            output=output if output is not None else OutputBuffer(),
+            clean=_clean_line,
+            progress=progress,
+            on_line=ProcessProgress(progress),
+            # COLMAP prints a line per image and image pair, log less of it than of other jobs
+            output_log=replace(policy, rate=self.output_log_rate) if policy is not None else None,
+            before=before,
+        )
+
+    def _finish(self, job, remaining):
+        """Log the outcome of the finished job and return the final status."""
+        code = job.returncode
+        elapsed = int(job.elapsed)
+        if self.job is job:
+            self.job = None
+
+        if job.state == "cancelled":
+            return "Process stopped"
         if code != 0:
-            if remaining:
+            if job.error:
+                msg = f"Processor failed to launch: {job.error}"
+            elif remaining:
                 msg = f"Processor failed (code {code}), last output: {remaining}"
             else:
                 msg = f"Processor failed (code {code})"
-            self.logger.error(msg)
-            return f"Error (code {code})", gr.update(active=False)
+            self.logger.error(msg, extra={"job_id": job.job_id})
+            return f"Error (code {code})"
         else:
-            self.logger.info("Processor completed successfully in %ds", elapsed)
-            return f"Done! ({elapsed}s)", gr.update(active=False)
-  
-            
-        
-    def run_dataprocessor(self, dataprocessor: str, data_path: str, output_dir: str)-> Tuple[str, dict]:
+            self.logger.info("Processor completed successfully in %ds", elapsed, extra={"job_id": job.job_id})
+            return f"Done! ({elapsed}s)"
+
+    def stream_dataprocessor(
+        self, dataprocessor, data_path, output_dir, reuse_cache=True, incremental=False, parallel_video=False
+    ):
+        """
+        Generator handler for streaming mode: submit the job, then push (status, log,
+        progress bar) updates as output arrives, at most ``stream_max_fps`` times per second.
+        """
+        seq = self.output.next_seq
+        result = self.run_dataprocessor(dataprocessor, data_path, output_dir, reuse_cache, incremental, parallel_video)
+        if isinstance(result, str):
+            yield result, gr.skip(), ""
+            return
+        job = self.job
+        if job is None:
+            # nothing to add incrementally, nothing to wait for
+            yield result[0], "\n".join(self.output.tail(LOG_TAIL_LINES)), ""
+            return
+        yield result[0], gr.skip(), ""
+
+        last_line = ""
+        for lines, seq in stream_output(self.output, job.is_active, seq, self.stream_max_fps):
+            if lines:
+                last_line = lines[-1]
+                log = "\n".join(self.output.tail(LOG_TAIL_LINES))
+                yield self._status_text(job, last_line), log, progress_html(job.progress)
+        yield self._finish(job, last_line), gr.skip(), ""
+
+    def run_dataprocessor(
+        self,
+        dataprocessor: str,
+        data_path: str,
+        output_dir: str,
+        reuse_cache: bool = True,
+        incremental: bool = False,
+        parallel_video: bool = False,
+    ) -> Tuple[str, dict]:
         if not dataprocessor:
             return "Please select a data processor"
         if not data_path:
@@ -369,39 +685,256 @@ class DataProcessorTab:
         if not output_dir:
             return "Please select an output directory"
 
-        argv = self._parse_and_build_argv(dataprocessor, data_path, output_dir)
-        self.logger.info("Launching", extra={"argv": argv})
+        if incremental:
+            if dataprocessor != "ImagesToNerfstudioDataset":
+                return "Only ImagesToNerfstudioDataset outputs can be updated incrementally", gr.update(active=False)
+            result = self._run_incremental(data_path, output_dir)
+            if result is not None:
+                return result
+            # not possible for this output, fall through to a full run
 
-        try:
-            self.process = subprocess.Popen(
-                argv,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                shell=False,    # <-- only path
+        cull = self.culling["enabled"] and dataprocessor in ("ImagesToNerfstudioDataset", "VideoToNerfstudioDataset")
+        # video frames are culled between the extraction stage and the images pipeline
+        parallel_video = (parallel_video or cull) and dataprocessor == "VideoToNerfstudioDataset"
+        if parallel_video:
+            argv = self._video_argv(data_path, output_dir)
+        elif cull:
+            staging = str(Path(output_dir) / CULLED_STAGING_DIR)
+            argv = self._culling_argv(data_path, staging) + self._parse_and_build_argv(
+                "ImagesToNerfstudioDataset", staging, output_dir
             )
-        except Exception:
-            self.logger.exception("Failed to spawn process")
-            return "Error launching", gr.update(active=False)
-        
-        self.logger.debug("Subprocess launched", extra={"pid": self.process.pid})
-        self.start_time = time.time()
+        else:
+            argv = self._parse_and_build_argv(dataprocessor, data_path, output_dir)
+        # the frames of a culled run are not numbered after the capture, so it cannot be topped up
+        record_inputs = dataprocessor == "ImagesToNerfstudioDataset" and not cull
+        if cull:
+            (Path(output_dir) / incremental_processing.MANIFEST_NAME).unlink(missing_ok=True)
+        before = None
+        if get_dataset_cache().enabled:
+            manifest = {"subcommand": DATAPROCESSOR_SUBCOMMANDS[dataprocessor], "data_path": data_path, "argv": argv}
+            cache_args = self._cache_args(dataprocessor, parallel_video)
+            before = partial(self._use_cache, cache_args, data_path, output_dir, manifest, reuse_cache)
+        self.logger.info("Launching", extra={"argv": argv})
+
+        job_manager = get_job_manager()
+        self.job = self._submit(
+            f"{DATAPROCESSOR_SUBCOMMANDS[dataprocessor]}: {Path(data_path).name}",
+            "cpu",
+            argv,
+            self.output,
+            before=before,
+        )
+        self.logger.debug("Job submitted", extra={"job_id": self.job.job_id})
+        if record_inputs:
+            # lets later runs add new images of the capture incrementally
+            record_when_done(self.job, data_path, output_dir)
+        if self.job.state == "queued":
+            return f"Queued (position {job_manager.queue_position(self.job)})", gr.update(active=True)
         return "Processing started", gr.update(active=True)
 
+    def _run_incremental(self, data_path: str, output_dir: str):
+        """
+        Submit a job adding the new images of ``data_path`` to the processed
+        dataset in ``output_dir``. Returns (status, timer), or None when a full
+        run is needed.
+        """
+        args = self.dataprocessor_args
+        if args.get("sfm_tool") == "hloc" or args.get("camera_type", "perspective") not in COLMAP_CAMERA_MODELS:
+            self.output.append("Incremental processing needs COLMAP and a perspective or fisheye camera, running a full run")
+            return None
+        increment = plan_increment(Path(data_path), Path(output_dir))
+        if not increment.possible:
+            self.output.append(f"Cannot add images incrementally ({increment.reason}), running a full run")
+            self.logger.info("Full run instead of incremental", extra={"reason": increment.reason})
+            return None
+        if not increment.new:
+            self.job = None
+            return "No new images in the capture, the dataset is up to date", gr.update(active=False)
+
+        argv = [
+            sys.executable,
+            incremental_processing.__file__,
+            "--data", data_path,
+            "--output-dir", output_dir,
+            "--camera-type", args.get("camera_type", "perspective"),
+            "--matching-method", args.get("matching_method", "vocab_tree"),
+            "--colmap-cmd", args.get("colmap_cmd", "colmap"),
+        ]
+        if args.get("gpu") is False:
+            argv.append("--no-gpu")
+        self.logger.info("Launching", extra={"argv": argv, "new_images": len(increment.new)})
+        job_manager = get_job_manager()
+        self.job = self._submit(f"images (+{len(increment.new)}): {Path(data_path).name}", "cpu", argv, self.output)
+        if self.job.state == "queued":
+            return f"Queued (position {job_manager.queue_position(self.job)})", gr.update(active=True)
+        return f"Adding {len(increment.new)} new images", gr.update(active=True)
+
+    def _video_argv(self, data_path: str, output_dir: str) -> list[str]:
+        """
+        Extract the video frames with one ffmpeg process per core into a
+        staging folder, then run the images pipeline on them.
+        """
+        staging = str(Path(output_dir) / VIDEO_STAGING_DIR)
+        images_argv = self._parse_and_build_argv("ImagesToNerfstudioDataset", staging, output_dir)
+        if self.culling["enabled"]:
+            images_argv = self._culling_argv(staging) + images_argv
+        return [
+            sys.executable,
+            video_frames.__file__,
+            "--data", data_path,
+            "--staging", staging,
+            "--num-frames", str(self.num_frames_target),
+            "--cleanup",
+            "--",
+        ] + images_argv
+
+    def _culling_argv(self, data_path: str, staging: str = None) -> list[str]:
+        """
+        Prefix running the frame culling stage on ``data_path`` before the
+        command that follows it. Kept frames are linked into ``staging``;
+        without one the dropped frames are deleted in place.
+        """
+        argv = [
+            sys.executable,
+            frame_culling.__file__,
+            "--data", data_path,
+            "--blur-ratio", str(self.culling["blur_ratio"]),
+            "--max-distance", str(self.culling["max_distance"]),
+        ]
+        if staging:
+            argv += ["--staging", staging, "--cleanup"]
+        return argv + ["--"]
+
+    def _cache_args(self, dataprocessor: str, parallel_video: bool = False) -> dict:
+        """The args of the job that are part of its dataset cache key."""
+        args = normalize_args(self.dataprocessor_args, get_field_constraints())
+        if dataprocessor == "VideoToNerfstudioDataset":
+            # both are sampled differently, and the frame count is not a converter field
+            args.update(num_frames_target=self.num_frames_target, segmented_extraction=parallel_video)
+        if self.culling["enabled"]:
+            args.update(frame_culling=[self.culling["blur_ratio"], self.culling["max_distance"]])
+        return args
+
+    def _use_cache(self, args, data_path, output_dir, manifest, reuse, job):
+        """
+        ``before`` hook of a processing job. Fingerprinting reads all inputs,
+        so it runs on the job's thread rather than in the click handler.
+        Returns 0 when ``output_dir`` was filled from the dataset cache, so the
+        processor does not run; otherwise the output is cached once the job is done.
+        """
+        cache = get_dataset_cache()
+        try:
+            key = cache.key_of(manifest["subcommand"], data_path, args)
+        except OSError:
+            self.logger.warning("Could not fingerprint the inputs", extra={"data_path": data_path})
+            return None
+        if reuse:
+            cached = cache.materialize(key, output_dir)
+            if cached is not None:
+                processed = time.strftime("%Y-%m-%d %H:%M", time.localtime(cached["created"]))
+                job.output.append(
+                    f"Reused the cached output of an identical run from {processed} ({cached['files']} files)"
+                )
+                return 0
+        cache.store_when_done(job, key, output_dir, manifest)
+        return None
+
+    def run_batch(self, dataprocessor, batch_inputs, output_root, workers):
+        """
+        Submit one job per batch input. Returns (status, table, batch timer).
+
+        The jobs run on the JobManager's "batch" class, ``workers`` at a time.
+        """
+        if not dataprocessor:
+            return "Please select a data processor", gr.skip(), gr.skip()
+        if not output_root:
+            return "Please select an output root", gr.skip(), gr.skip()
+        inputs = expand_batch_inputs(batch_inputs or "")
+        if not inputs:
+            return "No existing inputs match the batch list", gr.skip(), gr.skip()
+
+        job_manager = get_job_manager()
+        if workers:
+            job_manager.set_limit("batch", max(1, int(workers)))
+
+        self.batch = []
+        for data_path, output_dir in plan_batch(inputs, output_root):
+            method = batch_method(dataprocessor, data_path)
+            argv = self._parse_and_build_argv(method, str(data_path), str(output_dir))
+            job = self._submit(f"{DATAPROCESSOR_SUBCOMMANDS[method]}: {data_path.name}", "batch", argv)
+            self.batch.append((data_path, output_dir, method, job))
+        self.logger.info(
+            "Batch submitted",
+            extra={"items": len(self.batch), "workers": job_manager.limits["batch"]},
+        )
+        return self._batch_summary(), self.batch_rows(), gr.update(active=True)
+
+    def update_batch_status(self):
+        active = any(job.is_active() for *_, job in self.batch)
+        return self._batch_summary(), self.batch_rows(), gr.update(active=active)
+
+    def stream_batch(self, dataprocessor, batch_inputs, output_root, workers):
+        """Generator handler for streaming mode: submit the batch and push the table when it changes."""
+        status, table, _ = self.run_batch(dataprocessor, batch_inputs, output_root, workers)
+        yield status, table
+        if not self.batch:
+            return
+        yield from stream_changes(
+            lambda: (self._batch_summary(), self.batch_rows()),
+            lambda: any(job.is_active() for *_, job in self.batch),
+            self.stream_max_fps,
+        )
+
+    def batch_rows(self):
+        rows = []
+        job_manager = get_job_manager()
+        for data_path, output_dir, method, job in self.batch:
+            state = job.state
+            if state == "queued":
+                state = f"queued ({job_manager.queue_position(job)})"
+            elif state == "failed" and job.returncode is not None:
+                state = f"failed ({job.returncode})"
+            last = job.output.tail(1)
+            last = last[0] if last else ""
+            if job.is_active():
+                last = self._status_text(job, last)
+            rows.append([str(data_path), str(output_dir), DATAPROCESSOR_SUBCOMMANDS[method], job.job_id, state, last])
+        return rows
+
+    def _batch_summary(self):
+        states = Counter(job.state for *_, job in self.batch)
+        finished = states["done"] + states["failed"] + states["cancelled"]
+        summary = f"Batch: {finished}/{len(self.batch)} finished"
+        details = ", ".join(f"{count} {state}" for state, count in sorted(states.items()))
+        return f"{summary} ({details})"
+
+    def stop_batch(self):
+        job_manager = get_job_manager()
+        # cancel queued items first so they do not start as running ones exit
+        jobs = sorted((job for *_, job in self.batch), key=lambda job: job.state != "queued")
+        cancelled = sum(job_manager.cancel(job.job_id) for job in jobs)
+        return f"Batch stopped ({cancelled} jobs cancelled)"
+
     def get_dataprocessor_args(self, dataprocessor, *args):
         temp_args = {}
         args = list(args)
         cmd = ""
-        names = self.dataprocessor_arg_names[
-            self.dataprocessor_arg_idx[dataprocessor][0] : self.dataprocessor_arg_idx[
-                dataprocessor
-            ][1]
-        ]
-        values = args[
-            self.dataprocessor_arg_idx[dataprocessor][0] : self.dataprocessor_arg_idx[
-                dataprocessor
-            ][1]
-        ]
+        if self.lazy_ui:
+            names, values = rendered_args(args[0], f"dataprocessor/{dataprocessor}")
+        else:
+            names = self.dataprocessor_arg_names[
+                self.dataprocessor_arg_idx[dataprocessor][0] : self.dataprocessor_arg_idx[
+                    dataprocessor
+                ][1]
+            ]
+            values = args[
+                self.dataprocessor_arg_idx[dataprocessor][0] : self.dataprocessor_arg_idx[
+                    dataprocessor
+                ][1]
+            ]
+        field_constraints = get_field_constraints()
+        if dataprocessor == "VideoToNerfstudioDataset":
+            self.num_frames_target = int(dict(zip(names, values)).get("num_frames_target") or NUM_FRAMES_TARGET)
         for key, value in zip(names, values):
             if key not in field_constraints:
                 continue
@@ -413,14 +946,14 @@ class DataProcessorTab:
                 continue
 
             # Enforce literal-based validation
-            if constraints["valid_values"] and value not in constraints["valid_values"]:
+            if constraints["choices"] and value not in constraints["choices"]:
                 continue
 
             if key == 'crop_bottom':
                 print('-----', key, value)
             temp_args[key] = value
 
-            if constraints["type"] == bool:
+            if constraints["kind"] == "bool":
                 key_str = f"--{key}" if value else f"--no-{key}"
                 cmd += f" {key_str}"
             else:
@@ -435,9 +968,9 @@ class DataProcessorTab:
         return update_info
 
     def stop(self):
-        if self.process:
-            self.logger.info("Terminating process", extra={"pid": self.process.pid})
-            self.process.terminate()
+        if self.job:
+            self.logger.info("Cancelling job", extra={"job_id": self.job.job_id})
+            get_job_manager().cancel(self.job.job_id)
         return "Process stopped"
 
     def generate_cmd(self, dataprocessor, data_path,output_dir):
@@ -475,24 +1008,17 @@ class DataProcessorTab:
         2) Uses field_constraints to decide flag format.
         3) Returns a shell‐safe argv list for subprocess.Popen(shell=False).
         """
-        # map tab name → CLI subcommand
-        subcmd_map  = {
-            "ImagesToNerfstudioDataset": "images",
-            "VideoToNerfstudioDataset": "video",
-            "ProcessPolycam": "polycam",
-            "ProcessRecord3D": "record3d",
-            "ProcessODM": "odm",
-        }
-        subcmd = subcmd_map[dataprocessor]
+        subcmd = DATAPROCESSOR_SUBCOMMANDS[dataprocessor]
         argv = ["ns-process-data", subcmd, "--data", data_path, "--output_dir", output_dir]
 
+        field_constraints = get_field_constraints()
         for key, val in self.dataprocessor_args.items():
-            decl_type = field_constraints[key]["type"]
+            kind = field_constraints[key]["kind"]
             flag = f"--{key.replace('_','-')}"
-            if decl_type is bool:
+            if kind == "bool":
                 if val:
                     argv.append(flag)
-            elif decl_type in (list, tuple):
+            elif kind == "sequence":
                 argv.append(flag)
                 argv.extend(str(x) for x in val)
             else:
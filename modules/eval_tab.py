@@ -0,0 +1,58 @@
+import argparse
+import logging
+
+import gradio as gr
+
+from utils.checkpoint_eval import get_checkpoint_evaluator
+from utils.eval_store import EVAL_COLUMNS
+from utils.utils import run_picker
+
+PENDING_COLUMNS = ["Step", "State", "Job ID"]
+
+
+class EvalTab:
+    def __init__(self, args: argparse.Namespace):
+        super().__init__()
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.root_dir = args.root_dir  # root directory
+        self.evaluator = get_checkpoint_evaluator(args.root_dir)
+
+    def setup_ui(self):
+        with gr.Tab(label="Evaluate") as tab:
+            status = gr.Textbox(label="Status", lines=1, placeholder="Waiting")
+            timer = gr.Timer(value=5, active=False)
+            with gr.Row():
+                config_path = gr.Textbox(
+                    label="Config Path",
+                    lines=1,
+                    placeholder="Select a run below",
+                    scale=4,
+                )
+                eval_button = gr.Button(value="Evaluate All Checkpoints", variant="primary", scale=1)
+                refresh_button = gr.Button(value="Refresh Runs", scale=1)
+            run_table, refresh_runs = run_picker(self.root_dir, config_path)
+            results = gr.Dataframe(headers=EVAL_COLUMNS, label="Results", interactive=False, max_height=300)
+            pending = gr.Dataframe(headers=PENDING_COLUMNS, label="Queued Evaluations", interactive=False, max_height=200)
+
+            tab.select(refresh_runs, inputs=None, outputs=run_table)
+            refresh_button.click(refresh_runs, inputs=None, outputs=run_table)
+            # results are read from the in-memory store, so switching runs is instant
+            config_path.change(self.update_results, inputs=config_path, outputs=[results, pending, timer])
+            timer.tick(self.update_results, inputs=config_path, outputs=[results, pending, timer])
+            eval_button.click(self.evaluate, inputs=config_path, outputs=[status, timer])
+
+    def update_results(self, config_path):
+        """Returns (results, pending evaluations, timer); the timer runs while evaluations are pending."""
+        if not config_path:
+            return [], [], gr.update(active=False)
+        pending = self.evaluator.pending_rows(config_path)
+        return self.evaluator.store.rows(config_path), pending, gr.update(active=bool(pending))
+
+    def evaluate(self, config_path):
+        if not config_path:
+            raise gr.Error("Please select a run")
+        jobs = self.evaluator.evaluate_run(config_path)
+        if not jobs:
+            return "Every intact checkpoint of this run is evaluated or queued", gr.skip()
+        self.logger.info("Evaluations queued", extra={"config": config_path, "jobs": len(jobs)})
+        return f"{len(jobs)} evaluations queued", gr.update(active=True)
@@ -1,5 +1,6 @@
-import multiprocessing
 import os
+import re
+import logging
 from pathlib import Path
 import argparse
 import gradio as gr
@@ -8,55 +9,120 @@ from utils.utils import (
     browse_folder,
     browse_cfg,
     submit,
+    run_picker,
     generate_args,
+    track_rendered_args,
+    rendered_args,
 )
-from nerfstudio.scripts.exporter import (
-    ExportCameraPoses,
-    ExportGaussianSplat,
-    ExportMarchingCubesMesh,
-    ExportPointCloud,
-    ExportPoissonMesh,
-    ExportTSDFMesh,
-)
+from utils.output_stream import OutputBuffer, stream_output
+from utils.job_manager import get_job_manager
 
 current_path = Path(__file__).parent
 
-exporter_configs = {
-    "ExportCameraPoses": ExportCameraPoses(current_path, current_path),
-    "ExportGaussianSplat": ExportGaussianSplat(current_path, current_path),
-    "ExportMarchingCubesMesh": ExportMarchingCubesMesh(current_path, current_path),
-    "ExportPointCloud": ExportPointCloud(current_path, current_path),
-    "ExportPoissonMesh": ExportPoissonMesh(current_path, current_path),
-    "ExportTSDFMesh": ExportTSDFMesh(current_path, current_path),
+# map tab name → ns-export subcommand
+EXPORTER_SUBCOMMANDS = {
+    "ExportCameraPoses": "cameras",
+    "ExportGaussianSplat": "gaussian-splat",
+    "ExportMarchingCubesMesh": "marching-cubes",
+    "ExportPointCloud": "pointcloud",
+    "ExportPoissonMesh": "poisson",
+    "ExportTSDFMesh": "tsdf",
 }
+EXPORTER_NAMES = list(EXPORTER_SUBCOMMANDS)
+
+LOG_TAIL_LINES = 200
+
+# ns-export output that marks the start of a stage, checked in order
+EXPORT_STAGES = [
+    (re.compile(r"Computing Point Cloud", re.I), "Computing point cloud"),
+    (re.compile(r"Estimating Point Cloud Normals", re.I), "Estimating normals"),
+    (re.compile(r"Integrating the TSDF", re.I), "Integrating TSDF"),
+    (re.compile(r"Computing Mesh", re.I), "Computing mesh"),
+    (re.compile(r"Texturing mesh", re.I), "Texturing mesh"),
+    (re.compile(r"Saving", re.I), "Saving"),
+]
+POINT_COUNT = re.compile(r"([\d,]+) points", re.I)
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+
+def _clean_line(line: str) -> str:
+    # drop rich's colour codes and progress bar redraws
+    return ANSI_ESCAPE.sub("", line).split("\r")[-1].strip()
+
+
+def parse_export_progress(line: str, progress: dict) -> bool:
+    """
+    Update ``progress`` (``stage``, ``points``) from one line of ns-export output.
+
+    Returns True if anything changed.
+    """
+    changed = False
+    for pattern, stage in EXPORT_STAGES:
+        if pattern.search(line):
+            changed = progress.get("stage") != stage
+            progress["stage"] = stage
+            break
+    match = POINT_COUNT.search(line)
+    if match:
+        points = int(match.group(1).replace(",", ""))
+        changed = changed or progress.get("points") != points
+        progress["points"] = points
+    return changed
+
+
+_exporter_configs = None  # built by get_exporter_configs
+
+
+def get_exporter_configs():
+    """Build the exporter config instances on first use (imports nerfstudio.scripts.exporter)."""
+    global _exporter_configs
+    if _exporter_configs is None:
+        from nerfstudio.scripts import exporter
+
+        _exporter_configs = {
+            name: getattr(exporter, name)(current_path, current_path)
+            for name in EXPORTER_NAMES
+        }
+    return _exporter_configs
 
 
 class ExporterTab:
     def __init__(self, args: argparse.Namespace):
         super().__init__()
+        self.logger = logging.getLogger(self.__class__.__name__)
         self.root_dir = args.root_dir  # root directory
         self.run_in_new_terminal = args.run_in_new_terminal  # run in new terminal
+        self.lazy_ui = args.lazy_ui  # render config panels on demand
+        self.streaming = args.streaming  # push progress from a generator instead of timer polling
+        self.stream_max_fps = args.stream_max_fps  # max updates per second when streaming
 
         self.exporter_args = {}
 
         self.exporter_groups = []  # keep track of the exporter groups
         self.exporter_group_idx = {}  # keep track of the exporter group index
-        self.exporter_arg_list = []  # gr components for the exporter args
+        self.exporter_arg_list = []  # gr components for the exporter args (lazy_ui: the session's gr.State)
         self.exporter_arg_names = []  # keep track of the exporter args names
         self.exporter_arg_idx = {}  # record the start and end index of the exporter args
 
-        self.p = None
+        self.job = None  # latest export job submitted from this tab
+        self.output = OutputBuffer()  # ns-export output, shared by all jobs of this tab
 
     def setup_ui(self):
-        with gr.Tab(label="Export"):
+        with gr.Tab(label="Export") as tab:
             status = gr.Textbox(label="Status", lines=1, placeholder="Waiting")
+            timer = gr.Timer(value=1, active=False)
+            output_seq = gr.State(0)  # next output line this client has not seen yet
             with gr.Row():
                 exporter = gr.Radio(
-                    choices=list(exporter_configs.keys()), label="Method", scale=5
+                    choices=EXPORTER_NAMES, label="Method", scale=5
                 )
                 run_button = gr.Button(
                     value="Export", variant="primary", scale=1)
                 stop_button = gr.Button(value="Stop", variant="stop", scale=1)
+            with gr.Accordion("Export Output", open=False):
+                log_box = gr.Textbox(
+                    show_label=False, lines=10, max_lines=20, autoscroll=True, interactive=False
+                )
             if os.name == "nt":
                 with gr.Row():
                     data_path = gr.Textbox(
@@ -87,20 +153,14 @@ class ExporterTab:
                         scale=5,
                     )
                     input_button = gr.Button(value="Submit", scale=1)
+                    refresh_button = gr.Button(value="Refresh Runs", scale=1)
                 with gr.Row():
-                    file_explorer = gr.FileExplorer(
-                        label="Browse",
-                        scale=1,
-                        root_dir=self.root_dir,
-                        file_count="single",
-                        height=300,
-                        glob="*.yml",
-                    )
-                    file_explorer.change(
-                        lambda x: str(x), inputs=file_explorer, outputs=data_path
-                    )
+                    run_table, refresh_runs = run_picker(self.root_dir, data_path)
                     input_button.click(
                         submit, inputs=data_path, outputs=data_path)
+                # the run index is refreshed when the tab is opened, not when the page is built
+                tab.select(refresh_runs, inputs=None, outputs=run_table)
+                refresh_button.click(refresh_runs, inputs=None, outputs=run_table)
                 with gr.Row():
                     output_dir = gr.Textbox(
                         label="Output Path",
@@ -123,33 +183,61 @@ class ExporterTab:
                     out_button.click(submit, inputs=output_dir,
                                      outputs=output_dir)
             with gr.Accordion("Exporter Config", open=False):
-                for key, config in exporter_configs.items():
-                    with gr.Group(visible=False) as group:
+                if self.lazy_ui:
+                    # the values of the rendered args are kept per session
+                    rendered = gr.State({})
+                    self.exporter_arg_list = [rendered]
+
+                    @gr.render(inputs=exporter)
+                    def render_exporter_args(key):
+                        if not key:
+                            return
                         generated_args, labels = generate_args(
-                            config, visible=True)
-                        self.exporter_arg_list += generated_args
-                        self.exporter_arg_names += labels
-                        self.exporter_arg_idx[key] = [
-                            len(self.exporter_arg_list) - len(generated_args),
-                            len(self.exporter_arg_list),
-                        ]
-                        self.exporter_groups.append(group)
-                        self.exporter_group_idx[key] = len(
-                            self.exporter_groups) - 1
-                exporter.change(
-                    self.update_exporter_args_visibility,
-                    inputs=exporter,
-                    outputs=self.exporter_groups,
-                )
-            run_button.click(
+                            get_exporter_configs()[key], visible=True, key=f"exporter/{key}")
+                        track_rendered_args(generated_args, labels, rendered, f"exporter/{key}")
+                else:
+                    for key, config in get_exporter_configs().items():
+                        with gr.Group(visible=False) as group:
+                            generated_args, labels = generate_args(
+                                config, visible=True, key=f"exporter/{key}")
+                            self.exporter_arg_list += generated_args
+                            self.exporter_arg_names += labels
+                            self.exporter_arg_idx[key] = [
+                                len(self.exporter_arg_list) - len(generated_args),
+                                len(self.exporter_arg_list),
+                            ]
+                            self.exporter_groups.append(group)
+                            self.exporter_group_idx[key] = len(
+                                self.exporter_groups) - 1
+                    exporter.change(
+                        self.update_exporter_args_visibility,
+                        inputs=exporter,
+                        outputs=self.exporter_groups,
+                    )
+            run_event = run_button.click(
                 self.get_exporter_args,
                 inputs=[exporter] + self.exporter_arg_list,
                 outputs=None,
-            ).then(
-                self.run_exporter,
-                inputs=[exporter, data_path, output_dir],
-                outputs=status,
             )
+            if self.streaming:
+                run_event.then(
+                    self.stream_exporter,
+                    inputs=[exporter, data_path, output_dir],
+                    outputs=[status, log_box],
+                    concurrency_limit=None,
+                )
+            else:
+                # the handler only submits the job, the timer reports its progress
+                run_event.then(
+                    self.run_exporter,
+                    inputs=[exporter, data_path, output_dir],
+                    outputs=[status, timer],
+                )
+                timer.tick(
+                    self.update_status,
+                    inputs=output_seq,
+                    outputs=[status, log_box, timer, output_seq],
+                )
             stop_button.click(self.stop, inputs=None, outputs=status)
 
     def update_exporter_args_visibility(self, exporter):
@@ -159,38 +247,118 @@ class ExporterTab:
         return update_info
 
     def run_exporter(self, exporter, data_path, output_dir):
+        """Submit the export and return at once; the export runs as an ns-export subprocess."""
+        error = self._start_exporter(exporter, data_path, output_dir)
+        if error is not None:
+            return error, gr.skip()
+        return f"Export started (job {self.job.job_id})", gr.update(active=True)
+
+    def update_status(self, last_seq=0):
+        """
+        Report the progress of the running export and its output since ``last_seq``.
+
+        Returns (status, log box, timer, next sequence number).
+        """
+        job = self.job
+        if job is None:
+            return "Idle", gr.skip(), gr.update(active=False), last_seq
+
+        lines, next_seq = self.output.read_since(last_seq)
+        log = "\n".join(self.output.tail(LOG_TAIL_LINES)) if lines else gr.skip()
+        if job.is_active():
+            return self._progress(job), log, gr.update(active=True), next_seq
+        return self._result(job), log, gr.update(active=False), next_seq
+
+    def stream_exporter(self, exporter, data_path, output_dir):
+        """
+        Generator handler for streaming mode: submit the export, then push
+        (status, log) updates as its output arrives.
+        """
+        seq = self.output.next_seq
+        error = self._start_exporter(exporter, data_path, output_dir)
+        if error is not None:
+            yield error, gr.skip()
+            return
+        job = self.job
+        yield self._progress(job), gr.skip()
+
+        for lines, seq in stream_output(self.output, job.is_active, seq, self.stream_max_fps):
+            if lines:
+                yield self._progress(job), "\n".join(self.output.tail(LOG_TAIL_LINES))
+        yield self._result(job), gr.skip()
+
+    def _progress(self, job):
+        if job.state == "queued":
+            return f"Queued (position {get_job_manager().queue_position(job)})"
+        progress = job.progress
+        status = progress.get("stage", "Exporting")
+        if "points" in progress:
+            status += f", {progress['points']:,} points"
+        return f"{status}... ({int(job.elapsed)}s)"
+
+    def _result(self, job):
+        if job.state == "cancelled":
+            return "Export stopped"
+        if job.returncode != 0:
+            if job.error:
+                return f"Export failed to launch: {job.error}"
+            return f"Export failed (code {job.returncode})"
+        return f"Exporting finished ({int(job.elapsed)}s)"
+
+    def _build_argv(self, exporter, data_path, output_dir):
+        argv = [
+            "ns-export",
+            EXPORTER_SUBCOMMANDS[exporter],
+            "--load-config",
+            data_path,
+            "--output-dir",
+            output_dir,
+        ]
+        for key, value in self.exporter_args.items():
+            # ns-export turns flag conversion off, so booleans take an explicit value
+            argv.extend([f"--{key.replace('_', '-')}", str(value)])
+        return argv
+
+    def _start_exporter(self, exporter, data_path, output_dir):
+        """Submit the export job. Returns an error message, or None on success."""
         if exporter == "":
             return "Please select a exporter"
         if data_path == "":
             return "Please select a data path"
         if output_dir == "":
             return "Please select a output directory"
-        data_path = Path(data_path)
-        output_dir = Path(output_dir)
-        exporter = exporter_configs[exporter]
-        exporter.load_config = data_path
-        exporter.output_dir = output_dir
 
-        for key, value in self.exporter_args.items():
-            setattr(exporter, key, value)
-        self.p = multiprocessing.Process(target=exporter.main)
-        self.p.start()
-        self.p.join()
-        return "Exporting finished"
+        argv = self._build_argv(exporter, data_path, output_dir)
+        self.logger.info("Launching", extra={"argv": argv})
+        progress = {}
+        self.job = get_job_manager().submit(
+            f"{exporter}: {Path(data_path).parent.name}",
+            "export",
+            argv=argv,
+            output=self.output,
+            clean=_clean_line,
+            progress=progress,
+            on_line=lambda line: parse_export_progress(line, progress),
+        )
+        return None
 
     def get_exporter_args(self, exporter, *args):
         temp_args = {}
         args = list(args)
-        names = self.exporter_arg_names[
-            self.exporter_arg_idx[exporter][0]: self.exporter_arg_idx[exporter][1]
-        ]
-        values = args[
-            self.exporter_arg_idx[exporter][0]: self.exporter_arg_idx[exporter][1]
-        ]
+        if self.lazy_ui:
+            names, values = rendered_args(args[0], f"exporter/{exporter}")
+        else:
+            names = self.exporter_arg_names[
+                self.exporter_arg_idx[exporter][0]: self.exporter_arg_idx[exporter][1]
+            ]
+            values = args[
+                self.exporter_arg_idx[exporter][0]: self.exporter_arg_idx[exporter][1]
+            ]
         for key, value in zip(names, values):
             temp_args[key] = value
         self.exporter_args = temp_args
 
     def stop(self):
-        self.p.terminate()
-        return "Export stopped"
+        if self.job is not None and get_job_manager().cancel(self.job.job_id):
+            return "Stopping export..."
+        return "No export running"
@@ -0,0 +1,59 @@
+import argparse
+import logging
+
+import gradio as gr
+
+from utils.job_manager import get_job_manager
+
+JOB_COLUMNS = ["ID", "Name", "Resource", "Priority", "State", "Exit Code", "Slot", "Elapsed"]
+
+
+class JobsTab:
+    def __init__(self, args: argparse.Namespace):
+        super().__init__()
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.job_manager = get_job_manager()
+
+    def setup_ui(self):
+        with gr.Tab(label="Jobs") as tab:
+            status = gr.Textbox(label="Status", lines=1, placeholder="Waiting")
+            limits = gr.Textbox(
+                label="Concurrency Limits", lines=1, interactive=False, value=self.describe_limits
+            )
+            with gr.Row():
+                job_id = gr.Textbox(label="Job ID", lines=1, scale=4)
+                cancel_button = gr.Button(value="Cancel", variant="stop", scale=1)
+                refresh_button = gr.Button(value="Refresh", scale=1)
+            table = gr.Dataframe(
+                headers=JOB_COLUMNS,
+                value=self.job_manager.rows,
+                interactive=False,
+            )
+            # started and stopped by the WebUI as the tab is selected, so hidden tables are not polled
+            self.poll_timer = gr.Timer(value=2, active=False)
+
+            tab.select(self.job_manager.rows, inputs=None, outputs=table)
+            self.poll_timer.tick(self.job_manager.rows, inputs=None, outputs=table)
+            table.select(self.select_job, inputs=None, outputs=job_id)
+            cancel_button.click(self.cancel, inputs=job_id, outputs=status).then(
+                self.job_manager.rows, inputs=None, outputs=table
+            )
+            refresh_button.click(self.job_manager.rows, inputs=None, outputs=table)
+            refresh_button.click(self.describe_limits, inputs=None, outputs=limits)
+
+    def describe_limits(self):
+        return ", ".join(f"{resource}: {limit}" for resource, limit in self.job_manager.limits.items())
+
+    def select_job(self, evt: gr.SelectData):
+        # the job ID is the first column of the selected row
+        return evt.row_value[0]
+
+    def cancel(self, job_id):
+        if not job_id:
+            raise gr.Error("Please select a job")
+        if self.job_manager.cancel(str(job_id)):
+            return f"Job {job_id} cancelled"
+        job = self.job_manager.get(str(job_id))
+        if job is not None and job.is_active():
+            return f"Job {job_id} runs inside the WebUI and cannot be cancelled"
+        return f"Job {job_id} is not queued or running"
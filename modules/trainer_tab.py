@@ -1,15 +1,44 @@
 import os
+import time
+import logging
+import threading
+from functools import partial
 from pathlib import Path
 import webbrowser
 import argparse
 import gradio as gr
-from traitlets import Instance
+import pandas as pd
 
-from nerfstudio.configs import dataparser_configs as dc, method_configs as mc
-from nerfstudio.configs.external_methods import ExternalMethodDummyTrainerConfig
+from utils.job_manager import get_job_manager
+from utils.output_stream import stream_changes
 from utils.trainer import WebUITrainer
-from utils.utils import run_cmd, get_folder_path, browse_folder, submit, generate_args
-from nerfstudio.viewer_legacy.server import viewer_utils
+from utils.training_supervisor import TrainingSupervisor
+from utils.run_config import build_run_config
+from utils.run_index import get_run_index
+from utils.checkpoint_resume import (
+    config_final_step,
+    find_resume_point,
+    resume_overrides,
+    resume_point_of,
+)
+from utils.sweep import MedianStoppingRule, Sweep, SweepRun, expand_runs, parse_sweep_spec
+from utils.utils import (
+    run_cmd,
+    get_folder_path,
+    browse_folder,
+    submit,
+    generate_args,
+    config_specs,
+    track_rendered_args,
+    rendered_args,
+    run_picker,
+)
+
+
+def _plot_frame(series):
+    """Long-format DataFrame (step, value, series) for gr.LinePlot."""
+    rows = [(step, value, name) for name, points in series.items() for step, value in points]
+    return pd.DataFrame(rows, columns=["step", "value", "series"])
 
 
 class TrainerTab(WebUITrainer):
@@ -17,6 +46,14 @@ class TrainerTab(WebUITrainer):
         super().__init__()
         self.root_dir = args.root_dir  # root directory
         self.run_in_new_terminal = args.run_in_new_terminal  # run in new terminal
+        self.lazy_ui = args.lazy_ui  # load the method registry when the tab is opened
+        self.streaming = args.streaming  # push status from a generator while training
+        self.stream_max_fps = args.stream_max_fps  # max updates per second when streaming
+        self.train_supervisor = args.train_supervisor  # train in a child process, controlled over a pipe
+        self.supervisor = None
+        self.sweep = None  # latest sweep, its runs are always supervised
+        self.resume_point = None  # checkpoint the latest training continues from, if any
+        self.logger = logging.getLogger(self.__class__.__name__)
 
         self.model_args_cmd = ""
         self.dataparser_args_cmd = ""
@@ -25,16 +62,17 @@ class TrainerTab(WebUITrainer):
 
         self.dataparser_groups = []  # keep track of the dataparser groups
         self.dataparser_group_idx = {}  # keep track of the dataparser group index
-        self.dataparser_arg_list = []  # gr components for the dataparser args
+        self.dataparser_arg_list = []  # gr components for the dataparser args (lazy_ui: the session's gr.State)
         self.dataparser_arg_names = []  # keep track of the dataparser args names
         self.dataparser_arg_idx = {}  # record the start and end index of the dataparser args
 
         self.model_groups = []  # keep track of the model groups
         self.model_group_idx = {}  # keep track of the model group index
-        self.model_arg_list = []  # gr components for the model args
+        self.model_arg_list = []  # gr components for the model args (lazy_ui: the session's gr.State)
         self.model_arg_names = []  # keep track of the model args names
         self.model_arg_idx = {}  # record the start and end index of the model args
 
+
         self.num_devices = args.num_devices
         self.device_type = args.device_type
         self.num_machines = args.num_machines
@@ -43,6 +81,20 @@ class TrainerTab(WebUITrainer):
         self.user_websocket_port = args.websocket_port
 
         self.use_external_methods = args.use_external_methods
+        self.method_descriptions = {}
+        self.dataparsers = {}
+        if not self.lazy_ui:
+            self.load_registry()
+
+        self.websocket_port = None
+        self.job = None  # training job on the JobManager's "gpu" queue
+
+    def load_registry(self):
+        """Import the nerfstudio method and dataparser registries (slow, done once)."""
+        if self.method_descriptions:
+            return
+        from nerfstudio.configs import dataparser_configs as dc, method_configs as mc
+
         if self.use_external_methods:
             self.method_descriptions = mc.all_descriptions
             self.dataparsers = dc.all_dataparsers
@@ -50,10 +102,16 @@ class TrainerTab(WebUITrainer):
             self.method_descriptions = mc.descriptions
             self.dataparsers = dc.dataparsers
 
-        self.websocket_port = None
+    def on_open(self):
+        """Populate the method and dataparser choices the first time the tab is shown (lazy_ui)."""
+        self.load_registry()
+        return (
+            gr.update(choices=list(self.method_descriptions.keys())),
+            gr.update(choices=["default"] + list(self.dataparsers.keys())),
+        )
 
     def setup_ui(self):
-        with gr.Tab(label="Train"):
+        with gr.Tab(label="Train") as self.tab:
             status = gr.Textbox(label="Status", lines=1, placeholder="Waiting")
             with gr.Row():
                 run_button = gr.Button(value="Train", variant="primary")
@@ -63,6 +121,13 @@ class TrainerTab(WebUITrainer):
                 viser_button = gr.Button(value="Open Viser", variant="secondary")
                 viser_button.click(self.open_viser, inputs=None, outputs=None)
 
+            with gr.Accordion("Telemetry", open=False):
+                telemetry_summary = gr.Textbox(show_label=False, lines=2, interactive=False)
+                with gr.Row():
+                    loss_plot = gr.LinePlot(x="step", y="value", color="series", label="Losses", height=250)
+                    rate_plot = gr.LinePlot(x="step", y="value", color="series", label="Iterations / s", height=250)
+            telemetry_timer = gr.Timer(value=2, active=False)
+
             with gr.Row():
                 max_num_iterations = gr.Slider(
                     minimum=0,
@@ -78,6 +143,11 @@ class TrainerTab(WebUITrainer):
                     label="Steps Per Save",
                     value=2000,
                 )
+                resume = gr.Checkbox(
+                    label="Resume",
+                    info="Continue the latest interrupted run with the same method, config and dataset",
+                    value=False,
+                )
 
             if os.name == "nt":
                 with gr.Row():
@@ -142,62 +212,42 @@ class TrainerTab(WebUITrainer):
                         value="viewer",
                     )
 
-            with gr.Accordion("Model Config", open=False):
-                for key, value in self.method_descriptions.items():
-                    with gr.Group(visible=False) as group:
-                        if key in mc.all_methods:
-                            if (
-                                type(mc.all_methods[key])
-                                is ExternalMethodDummyTrainerConfig
-                            ):
-                                continue
-
-                            model_config = mc.all_methods[key].pipeline.model  # type: ignore
-                            generated_args, labels = generate_args(
-                                model_config, visible=True
-                            )
-                            self.model_arg_list += generated_args
-                            self.model_arg_names += labels
-                            self.model_arg_idx[key] = [
-                                len(self.model_arg_list) - len(generated_args),
-                                len(self.model_arg_list),
-                            ]
-                            self.model_groups.append(group)
-                            self.model_group_idx[key] = len(self.model_groups) - 1
-                method.change(
-                    self.update_model_args_visibility,
-                    inputs=method,
-                    outputs=self.model_groups,
-                )
+            self.open_outputs = [method, dataparser]
 
-            with gr.Accordion("Data Parser Config", open=False):
-                for key, parser_config in self.dataparsers.items():
-                    with gr.Group(visible=False) as group:
-                        generated_args, labels = generate_args(
-                            parser_config, visible=True
-                        )
-                        self.dataparser_arg_list += generated_args
-                        self.dataparser_arg_names += labels
-                        self.dataparser_arg_idx[key] = [
-                            len(self.dataparser_arg_list) - len(generated_args),
-                            len(self.dataparser_arg_list),
-                        ]
-                        self.dataparser_groups.append(group)
-                        self.dataparser_group_idx[key] = len(self.dataparser_groups) - 1
-                dataparser.change(
-                    self.update_dataparser_args_visibility,
-                    inputs=dataparser,
-                    outputs=self.dataparser_groups,
+            if self.lazy_ui:
+                self._build_rendered_config_ui(method, dataparser)
+            else:
+                self._build_config_ui(method, dataparser)
+
+            train_inputs = [
+                data_path,
+                method,
+                max_num_iterations,
+                steps_per_save,
+                dataparser,
+                visualizer,
+            ]
+            self._build_sweep_ui(method, dataparser, train_inputs, status)
+            self._build_resume_ui(status, telemetry_timer)
+            if not self.streaming:
+                update_event = run_button.click(
+                    self.update_status,
+                    inputs=[data_path, method, dataparser, visualizer],
+                    outputs=status,
                 )
-
-            update_event = run_button.click(
-                self.update_status,
-                inputs=[data_path, method, dataparser, visualizer],
-                outputs=status,
-                # every=1,
+                telemetry_timer.tick(
+                    self.update_status,
+                    inputs=[data_path, method, dataparser, visualizer],
+                    outputs=status,
+                )
+            run_button.click(lambda: gr.update(active=True), inputs=None, outputs=telemetry_timer)
+            telemetry_timer.tick(
+                self.update_telemetry,
+                inputs=None,
+                outputs=[telemetry_summary, loss_plot, rate_plot, telemetry_timer],
             )
 
-            run_button.click(
+            train_event = run_button.click(
                 self.get_model_args,
                 inputs=[method] + self.model_arg_list,
                 outputs=None,
@@ -205,18 +255,20 @@ class TrainerTab(WebUITrainer):
                 self.get_data_parser_args,
                 inputs=[dataparser] + self.dataparser_arg_list,  # type: ignore
                 outputs=None,
-            ).then(
-                self.run_train,
-                inputs=[
-                    data_path,
-                    method,
-                    max_num_iterations,
-                    steps_per_save,
-                    dataparser,
-                    visualizer,
-                ],
-                outputs=None,
             )
+            if self.streaming:
+                update_event = train_event.then(
+                    self.stream_train,
+                    inputs=train_inputs + [resume],
+                    outputs=status,
+                    concurrency_limit=None,
+                )
+            else:
+                train_event.then(
+                    self.run_train,
+                    inputs=train_inputs + [resume],
+                    outputs=None,
+                )
 
             pause_button.click(self.pause, inputs=None, outputs=pause_button)
 
@@ -245,7 +297,161 @@ class TrainerTab(WebUITrainer):
                 outputs=status,
             )
 
+    def _build_sweep_ui(self, method, dataparser, train_inputs, status):
+        with gr.Accordion("Sweep", open=False):
+            sweep_spec = gr.Textbox(
+                label="Swept Model Fields",
+                lines=4,
+                placeholder="One field per line, e.g.\n"
+                "num_proposal_iterations = 1, 2\n"
+                "distortion_loss_mult = loggrid(0.0001, 0.01, 3)\n"
+                "interlevel_loss_mult = uniform(0.5, 2.0)",
+            )
+            with gr.Row():
+                samples = gr.Number(label="Samples per Grid Point (random ranges)", value=4, precision=0, minimum=1)
+                seed = gr.Number(label="Seed", value=0, precision=0)
+                early_stopping = gr.Checkbox(label="Stop Underperforming Runs (median rule)", value=True)
+                metric = gr.Textbox(label="Metric (loss or train metric)", value="rgb_loss")
+                direction = gr.Radio(label="Better", choices=[("lower", "min"), ("higher", "max")], value="min")
+                grace_steps = gr.Number(label="Grace Steps", value=2000, precision=0, minimum=0)
+            with gr.Row():
+                sweep_button = gr.Button(value="Run Sweep", variant="primary")
+                sweep_stop_button = gr.Button(value="Stop Sweep", variant="stop")
+            gr.Markdown("Sweep runs are supervised, run without the viewer and use the device slots of the Jobs tab.")
+            sweep_table = gr.Dataframe(
+                headers=["Run", "Parameters", "State", "Step", "Best Metric", "It/s"], interactive=False
+            )
+            sweep_timer = gr.Timer(value=5, active=False)
+
+        sweep_button.click(
+            self.get_model_args,
+            inputs=[method] + self.model_arg_list,
+            outputs=None,
+        ).then(
+            self.get_data_parser_args,
+            inputs=[dataparser] + self.dataparser_arg_list,  # type: ignore
+            outputs=None,
+        ).then(
+            self.run_sweep,
+            inputs=train_inputs + [sweep_spec, samples, seed, early_stopping, metric, direction, grace_steps],
+            outputs=[status, sweep_table, sweep_timer],
+        )
+        sweep_timer.tick(self.update_sweep, inputs=None, outputs=[status, sweep_table, sweep_timer])
+        sweep_stop_button.click(self.stop_sweep, inputs=None, outputs=status)
+
+    def _build_resume_ui(self, status, telemetry_timer):
+        with gr.Accordion("Resume Run", open=False) as accordion:
+            with gr.Row():
+                resume_config = gr.Textbox(
+                    label="Config Path",
+                    lines=1,
+                    placeholder="Select an interrupted run below",
+                    scale=4,
+                )
+                resume_button = gr.Button(value="Resume Selected Run", variant="primary", scale=1)
+                refresh_button = gr.Button(value="Refresh Runs", scale=1)
+            run_table, refresh_runs = run_picker(self.root_dir, resume_config)
+        # the run index is only walked when the accordion is opened
+        accordion.expand(refresh_runs, inputs=None, outputs=run_table)
+        refresh_button.click(refresh_runs, inputs=None, outputs=run_table)
+        resume_button.click(self.resume_run, inputs=resume_config, outputs=status).success(
+            lambda: gr.update(active=True), inputs=None, outputs=telemetry_timer
+        )
+
+    def _build_config_ui(self, method, dataparser):
+        """Build a hidden config group for every method and dataparser."""
+        from nerfstudio.configs import method_configs as mc
+        from nerfstudio.configs.external_methods import ExternalMethodDummyTrainerConfig
+
+        with gr.Accordion("Model Config", open=False):
+            for key, value in self.method_descriptions.items():
+                with gr.Group(visible=False) as group:
+                    if key in mc.all_methods:
+                        if (
+                            type(mc.all_methods[key])
+                            is ExternalMethodDummyTrainerConfig
+                        ):
+                            continue
+
+                        model_config = mc.all_methods[key].pipeline.model  # type: ignore
+                        generated_args, labels = generate_args(
+                            model_config, visible=True, key=f"model/{key}"
+                        )
+                        self.model_arg_list += generated_args
+                        self.model_arg_names += labels
+                        self.model_arg_idx[key] = [
+                            len(self.model_arg_list) - len(generated_args),
+                            len(self.model_arg_list),
+                        ]
+                        self.model_groups.append(group)
+                        self.model_group_idx[key] = len(self.model_groups) - 1
+            method.change(
+                self.update_model_args_visibility,
+                inputs=method,
+                outputs=self.model_groups,
+            )
+
+        with gr.Accordion("Data Parser Config", open=False):
+            for key, parser_config in self.dataparsers.items():
+                with gr.Group(visible=False) as group:
+                    generated_args, labels = generate_args(
+                        parser_config, visible=True, key=f"dataparser/{key}"
+                    )
+                    self.dataparser_arg_list += generated_args
+                    self.dataparser_arg_names += labels
+                    self.dataparser_arg_idx[key] = [
+                        len(self.dataparser_arg_list) - len(generated_args),
+                        len(self.dataparser_arg_list),
+                    ]
+                    self.dataparser_groups.append(group)
+                    self.dataparser_group_idx[key] = len(self.dataparser_groups) - 1
+            dataparser.change(
+                self.update_dataparser_args_visibility,
+                inputs=dataparser,
+                outputs=self.dataparser_groups,
+            )
+
+    def _build_rendered_config_ui(self, method, dataparser):
+        """
+        Render only the config panels of the selected method and dataparser.
+        The values of the rendered args are kept per session in a gr.State,
+        the only input the run buttons get for them.
+        """
+        model_args, dataparser_args = gr.State({}), gr.State({})
+        self.model_arg_list = [model_args]
+        self.dataparser_arg_list = [dataparser_args]
+        with gr.Accordion("Model Config", open=False):
+
+            @gr.render(inputs=method)
+            def render_model_args(key):
+                if not key:
+                    return
+                from nerfstudio.configs import method_configs as mc
+                from nerfstudio.configs.external_methods import ExternalMethodDummyTrainerConfig
+
+                if key not in mc.all_methods or type(mc.all_methods[key]) is ExternalMethodDummyTrainerConfig:
+                    return
+                generated_args, labels = generate_args(
+                    mc.all_methods[key].pipeline.model, visible=True, key=f"model/{key}"  # type: ignore
+                )
+                track_rendered_args(generated_args, labels, model_args, f"model/{key}")
+
+        with gr.Accordion("Data Parser Config", open=False):
+
+            @gr.render(inputs=dataparser)
+            def render_dataparser_args(key):
+                if key not in self.dataparsers:
+                    return
+                generated_args, labels = generate_args(
+                    self.dataparsers[key], visible=True, key=f"dataparser/{key}"
+                )
+                track_rendered_args(generated_args, labels, dataparser_args, f"dataparser/{key}")
+
     def update_status(self, data_path, method, data_parser, visualizer):
+        if self.job is not None and self.job.state == "queued":
+            return "Queued (position {})".format(get_job_manager().queue_position(self.job))
+        if self.supervisor is not None:
+            return self._supervised_status()
         if self.trainer is not None and self.trainer.step != 0:
             if self.trainer.training_state == "paused":
                 return "Paused"
@@ -257,11 +463,93 @@ class TrainerTab(WebUITrainer):
             check = self.check(data_path, method, data_parser, visualizer)
             if check is not None:
                 return check
-            return "Initializing... Please check the terminal for more information."
+            return self._initializing_status()
+
+    def _initializing_status(self):
+        if self.resume_point is not None:
+            return "Resuming from step {}... Please check the terminal for more information.".format(
+                self.resume_point.load_step
+            )
+        return "Initializing... Please check the terminal for more information."
+
+    def _supervised_status(self):
+        status = self.supervisor.status
+        state = status["state"]
+        if state == "starting" or (state == "training" and status["step"] == 0):
+            return self._initializing_status()
+        if state == "paused":
+            return "Paused"
+        if state == "completed":
+            return "Training Finished!"
+        if state == "stopped":
+            return "Stopped at step {}".format(status["step"])
+        if state == "failed":
+            return "Training failed. Please check the terminal for more information."
+        return "Step: {} ({:.1f} it/s)".format(status["step"], status["steps_per_sec"])
+
+    def current_telemetry(self):
+        return self.supervisor.telemetry if self.supervisor is not None else self.telemetry
+
+    def update_telemetry(self):
+        """
+        Returns (summary, loss plot, rate plot, timer). The series are
+        downsampled on the server, so each plot gets at most PLOT_POINTS points per series.
+        """
+        telemetry = self.current_telemetry()
+        active = self.job is not None and self.job.is_active()
+        return (
+            telemetry.summary(),
+            _plot_frame(telemetry.series("losses")),
+            _plot_frame(telemetry.series("steps_per_sec")),
+            gr.update(active=active),
+        )
+
+    def stream_train(
+        self,
+        data_path,
+        method,
+        max_num_iterations,
+        steps_per_save,
+        data_parser,
+        visualizer,
+        resume=False,
+    ):
+        """
+        Generator handler for streaming mode: queue the training on the JobManager
+        and push the status whenever it changes, at most ``stream_max_fps`` times per second.
+        """
+        check = self.check(data_path, method, data_parser, visualizer)
+        if check is not None:
+            yield check
+            return
+
+        args = (data_path, method, max_num_iterations, steps_per_save, data_parser, visualizer, resume)
+        if self.run_in_new_terminal:
+            self.run_train(*args)
+            yield "Training started in a new terminal"
+            return
+
+        self.trainer = None
+        self.supervisor = None
+        job = self.run_train(*args)
+        yield from stream_changes(
+            lambda: self.update_status(data_path, method, data_parser, visualizer),
+            job.is_active,
+            self.stream_max_fps,
+        )
+        if job.state == "failed":
+            yield "Training failed. Please check the terminal for more information."
 
     def pause(self):
         """Pause or resume the training."""
         """FIXME: If paused by webui, the viser pause button will work as resume button. """
+        if self.supervisor is not None:
+            if self.supervisor.status["state"] == "paused":
+                self.supervisor.send("resume")
+                return "Pause"
+            if not self.supervisor.send("pause"):
+                raise gr.Error("Training is not running")
+            return "Resume"
         if self.trainer is not None:
             if self.trainer.training_state == "paused":
                 self.trainer.training_state = "training"
@@ -275,6 +563,21 @@ class TrainerTab(WebUITrainer):
 
     def stop(self):
         # stop the training
+        if self.job is not None and self.job.state == "queued":
+            get_job_manager().cancel(self.job.job_id)
+            return "Training cancelled before it started"
+        if self.supervisor is not None:
+            status = self.supervisor.status
+            # stop() waits for the checkpoint to be written, do it off the request thread
+            threading.Thread(target=self.supervisor.stop, name="training-stop", daemon=True).start()
+            if "base_dir" not in status:
+                return "Stopped before training started"
+            return (
+                "Stopping. Config and checkpoint saved at "
+                + str(Path(status["base_dir"]) / "config.yml")
+                + " and "
+                + status["checkpoint_dir"]
+            )
         if self.trainer is not None:
             config_path = self.config.get_base_dir() / "config.yml"
             ckpt_path = self.trainer.checkpoint_dir
@@ -302,44 +605,236 @@ class TrainerTab(WebUITrainer):
         steps_per_save,
         data_parser,
         visualizer,
+        resume=False,
     ):
+        self.resume_point = None
+        overrides = {}
+        if resume:
+            self.resume_point = self.find_resume_point(data_path, method, max_num_iterations, data_parser)
+            if self.resume_point is None:
+                self.logger.info("No interrupted run to resume, starting from step 0", extra={"method": method})
+            else:
+                self.logger.info(
+                    "Resuming run",
+                    extra={"config": self.resume_point.config_path, "step": self.resume_point.load_step},
+                )
+                overrides = resume_overrides(self.resume_point, max_num_iterations)
         cmd = self.generate_cmd(
             data_path,
             method,
-            max_num_iterations,
+            overrides.get("max_num_iterations", max_num_iterations),
             steps_per_save,
             data_parser,
             visualizer,
+            extra_args=" ".join(
+                "--{} {}".format(key.replace("_", "-"), value)
+                for key, value in overrides.items()
+                if key != "max_num_iterations"
+            ),
         )
         print(cmd)
         if self.run_in_new_terminal:
             run_cmd(cmd)
         else:
-            # set up the config
-            config = mc.all_methods[method]
-            config.data = Path(data_path)
-            config.max_num_iterations = max_num_iterations
-            config.steps_per_save = steps_per_save
-            config.vis = visualizer
-
-            if self.user_websocket_port > 0 and viewer_utils.is_port_open(
-                self.user_websocket_port
-            ):
-                self.websocket_port = self.user_websocket_port
-            else:
-                self.websocket_port = viewer_utils.get_free_port()
-            config.viewer.websocket_port = self.websocket_port
+            overrides["viewer.websocket_port"] = self._pick_websocket_port()
+            config = self._build_config(
+                data_path,
+                method,
+                max_num_iterations,
+                steps_per_save,
+                data_parser,
+                visualizer,
+                overrides,
+            )
+            return self._submit_config(f"train: {method}", config)
 
-            if data_parser != "default":
-                config.pipeline.datamanager.dataparser = self.dataparsers[data_parser]
-                for key, value in self.dataparser_args.items():
-                    setattr(config.pipeline.datamanager.dataparser, key, value)
+    def _pick_websocket_port(self):
+        from nerfstudio.viewer_legacy.server import viewer_utils
+
+        if self.user_websocket_port > 0 and viewer_utils.is_port_open(self.user_websocket_port):
+            self.websocket_port = self.user_websocket_port
+        else:
+            self.websocket_port = viewer_utils.get_free_port()
+        return self.websocket_port
+
+    def _submit_config(self, name, config):
+        """Queue the training of ``config`` on the "gpu" class, supervised or in this process."""
+        if self.train_supervisor:
+            self.supervisor = TrainingSupervisor(config)
+            self.job = get_job_manager().submit(
+                name,
+                "gpu",
+                target=partial(self._run_supervised, self.supervisor),
+                on_cancel=self.supervisor.stop,
+            )
+        else:
+            self.stop_requested = False
+            self.job = get_job_manager().submit(
+                name, "gpu", target=partial(self._run_config, config), on_cancel=self.request_stop
+            )
+        return self.job
+
+    def find_resume_point(self, data_path, method, max_num_iterations, data_parser):
+        """
+        Latest intact checkpoint of an interrupted run in the run index with the
+        same method, dataset and model / dataparser settings as the form.
+        """
+        expected = {f"pipeline.model.{key}": value for key, value in self.model_args.items()}
+        if data_parser != "default":
+            for key, value in self.dataparser_args.items():
+                expected[f"pipeline.datamanager.dataparser.{key}"] = value
+        index = get_run_index(self.root_dir)
+        index.refresh(force=True)
+        return find_resume_point(index.records(), method, data_path, expected, int(max_num_iterations))
+
+    def resume_run(self, config_path):
+        """Resume the run of ``config_path`` (picked from the run index) with its own saved config."""
+        import yaml
+
+        if not config_path:
+            raise gr.Error("Please select a run")
+        if self.run_in_new_terminal:
+            raise gr.Error("Resuming a selected run is not supported with --run_in_new_terminal")
+        if self.job is not None and self.job.is_active():
+            raise gr.Error("A training is already running")
+        try:
+            config = yaml.load(Path(config_path).read_text(), Loader=yaml.Loader)
+        except (OSError, yaml.YAMLError) as e:
+            raise gr.Error(f"Cannot load {config_path}: {e}")
+        target_step = config_final_step(config)
+        run = {"config": config_path, "model_dir": str(config.relative_model_dir)}
+        point = resume_point_of(run, target_step)
+        if point is None:
+            raise gr.Error("The run has finished or has no intact checkpoint to resume from")
+        for key, value in resume_overrides(point, target_step).items():
+            setattr(config, key, value)
+        config.viewer.websocket_port = self._pick_websocket_port()
+
+        self.trainer = None
+        self.supervisor = None
+        self.resume_point = point
+        self.logger.info("Resuming run", extra={"config": config_path, "step": point.load_step})
+        job = self._submit_config(f"train: {config.method_name} (resume)", config)
+        return f"Resuming from step {point.load_step} of {target_step} (job {job.job_id})"
+
+    def _build_config(
+        self, data_path, method, max_num_iterations, steps_per_save, data_parser, visualizer, overrides=None
+    ):
+        """
+        The config of one run, layered over the shared base config of ``method``
+        (see utils/run_config.py); the registry and the base are never modified.
+        """
+        run_overrides = {
+            "data": Path(data_path),
+            "max_num_iterations": max_num_iterations,
+            "steps_per_save": steps_per_save,
+            "vis": visualizer,
+        }
+        if data_parser != "default":
+            run_overrides["pipeline.datamanager.dataparser"] = self.dataparsers[data_parser]
+            for key, value in self.dataparser_args.items():
+                run_overrides[f"pipeline.datamanager.dataparser.{key}"] = value
+        for key, value in self.model_args.items():
+            run_overrides[f"pipeline.model.{key}"] = value
+        run_overrides.update(overrides or {})
+        return build_run_config(method, run_overrides)
+
+    def run_sweep(
+        self,
+        data_path,
+        method,
+        max_num_iterations,
+        steps_per_save,
+        data_parser,
+        visualizer,
+        sweep_spec,
+        samples,
+        seed,
+        early_stopping,
+        metric,
+        direction,
+        grace_steps,
+    ):
+        """
+        Expand the sweep spec into a run matrix and queue one supervised
+        training per run on the "gpu" class. Returns (status, table, timer).
+        """
+        from nerfstudio.configs import method_configs as mc
 
-            for key, value in self.model_args.items():
-                setattr(config.pipeline.model, key, value)
-            # from nerfstudio.scripts import train
-            self.config = config
-            self.main()
+        check = self.check(data_path, method, data_parser, visualizer)
+        if check is not None:
+            return check, gr.skip(), gr.skip()
+        specs = {
+            spec["name"]: spec
+            for spec in config_specs(mc.all_methods[method].pipeline.model, key=f"model/{method}")
+        }
+        try:
+            runs = expand_runs(parse_sweep_spec(sweep_spec or "", specs), int(samples or 1), int(seed or 0))
+        except ValueError as e:
+            raise gr.Error(str(e))
+        if not runs or not runs[0]:
+            raise gr.Error("Please specify at least one swept field")
+
+        sweep = Sweep(
+            sweep_id=time.strftime("%Y%m%d-%H%M%S"),
+            stopping_rule=MedianStoppingRule(metric, int(grace_steps), direction=direction) if early_stopping else None,
+            metric=metric,
+            direction=direction,
+        )
+        # runs are headless, several viewers would fight over the websocket port
+        run_vis = "+".join(v for v in visualizer.split("+") if not v.startswith("viewer")) or "tensorboard"
+        job_manager = get_job_manager()
+        for index, params in enumerate(runs):
+            overrides = {f"pipeline.model.{key}": value for key, value in params.items()}
+            # outputs/<data>-sweep-<id>/<method>/run-<index>
+            overrides["experiment_name"] = f"{Path(data_path).name}-sweep-{sweep.sweep_id}"
+            overrides["timestamp"] = f"run-{index:03d}"
+            config = self._build_config(
+                data_path, method, max_num_iterations, steps_per_save, data_parser, run_vis, overrides
+            )
+            supervisor = TrainingSupervisor(config)
+            job = job_manager.submit(
+                f"sweep {sweep.sweep_id} #{index}: {method}",
+                "gpu",
+                target=partial(self._run_supervised, supervisor),
+                on_cancel=supervisor.stop,
+            )
+            sweep.runs.append(SweepRun(index, params, supervisor, job))
+        sweep.start()
+        self.sweep = sweep
+        self.logger.info("Sweep queued", extra={"sweep_id": sweep.sweep_id, "runs": len(runs)})
+        return f"Sweep {sweep.sweep_id}: {len(runs)} runs queued", sweep.rows(), gr.update(active=True)
+
+    def update_sweep(self):
+        """Refresh the results table, the sweep stops runs on its own. Returns (status, table, timer)."""
+        sweep = self.sweep
+        if sweep is None:
+            return gr.skip(), gr.skip(), gr.update(active=False)
+        active = sweep.is_active()
+        done = sum(not run.job.is_active() for run in sweep.runs)
+        status = f"Sweep {sweep.sweep_id}: {done}/{len(sweep.runs)} runs finished"
+        return status, sweep.rows(), gr.update(active=active)
+
+    def stop_sweep(self):
+        if self.sweep is None:
+            raise gr.Error("No sweep running")
+        self.sweep.stop()
+        job_manager = get_job_manager()
+        # queued runs first, so they do not start when running ones exit
+        runs = sorted(self.sweep.runs, key=lambda run: run.job.state != "queued")
+        for run in runs:
+            threading.Thread(target=job_manager.cancel, args=(run.job.job_id,), daemon=True).start()
+        return f"Sweep {self.sweep.sweep_id} stopped"
+
+    def _run_supervised(self, supervisor):
+        # runs on the job's runner thread once the JobManager has assigned a device slot
+        job = get_job_manager().current_job()
+        return supervisor.run(job.slot if job is not None else None)
+
+    def _run_config(self, config):
+        # runs on the job's runner thread, so pause/stop keep working on self.trainer
+        self.config = config
+        self.main()
 
     def generate_cmd(
         self,
@@ -349,6 +844,7 @@ class TrainerTab(WebUITrainer):
         steps_per_save,
         data_parser,
         visualizer,
+        extra_args="",
     ):
         # generate the command
         if data_parser == "":
@@ -364,7 +860,7 @@ class TrainerTab(WebUITrainer):
             return check
         if data_parser == "default":
             data_parser = ""
-        cmd = f"ns-train {method} {self.model_args_cmd} --vis {visualizer} --max-num-iterations {max_num_iterations} --steps-per-save {steps_per_save} --data {data_path} {data_parser} {self.dataparser_args_cmd}"
+        cmd = f"ns-train {method} {self.model_args_cmd} --vis {visualizer} --max-num-iterations {max_num_iterations} --steps-per-save {steps_per_save} {extra_args + ' ' if extra_args else ''}--data {data_path} {data_parser} {self.dataparser_args_cmd}"
         return cmd
 
     def check(self, data_path, method, data_parser, visualizer):
@@ -383,10 +879,13 @@ class TrainerTab(WebUITrainer):
         temp_args = {}
         args = list(args)
         cmd = ""
-        values = args[self.model_arg_idx[method][0] : self.model_arg_idx[method][1]]
-        names = self.model_arg_names[
-            self.model_arg_idx[method][0] : self.model_arg_idx[method][1]
-        ]
+        if self.lazy_ui:
+            names, values = rendered_args(args[0], f"model/{method}")
+        else:
+            values = args[self.model_arg_idx[method][0] : self.model_arg_idx[method][1]]
+            names = self.model_arg_names[
+                self.model_arg_idx[method][0] : self.model_arg_idx[method][1]
+            ]
         for key, value in zip(names, values):
             cmd += f"--pipeline.model.{key} {value} "
             temp_args[key] = value
@@ -403,16 +902,19 @@ class TrainerTab(WebUITrainer):
         temp_args = {}
         args = list(args)
         cmd = ""
-        names = self.dataparser_arg_names[
-            self.dataparser_arg_idx[dataparser][0] : self.dataparser_arg_idx[
-                dataparser
-            ][1]
-        ]
-        values = args[
-            self.dataparser_arg_idx[dataparser][0] : self.dataparser_arg_idx[
-                dataparser
-            ][1]
-        ]
+        if self.lazy_ui:
+            names, values = rendered_args(args[0], f"dataparser/{dataparser}")
+        else:
+            names = self.dataparser_arg_names[
+                self.dataparser_arg_idx[dataparser][0] : self.dataparser_arg_idx[
+                    dataparser
+                ][1]
+            ]
+            values = args[
+                self.dataparser_arg_idx[dataparser][0] : self.dataparser_arg_idx[
+                    dataparser
+                ][1]
+            ]
         for key, value in zip(names, values):
             # change key to --{key}
             cmd += f"--{key} {value} "
@@ -1,31 +1,40 @@
 import os
-import subprocess
 import webbrowser
 import argparse
 import gradio as gr
 
-
-from nerfstudio.viewer_legacy.server import viewer_utils
 from utils.utils import (
     run_cmd,
     browse_cfg,
+    run_picker,
 )
+from utils.output_stream import stream_output
+from utils.viewer_pool import VIEWER_COLUMNS, VIEWER_URL, ViewerPool
 
 
 class VisualizerTab:
     def __init__(self, args: argparse.Namespace):
         self.root_dir = args.root_dir  # root directory
         self.run_in_new_terminal = args.run_in_new_terminal # run in new terminal
+        self.streaming = args.streaming  # push viewer startup output from a generator
+        self.stream_max_fps = args.stream_max_fps  # max updates per second when streaming
 
-        self.p = None
+        self.viewer = None  # WarmViewer of the run opened last
         self.websocket_port = None
+        # warm viewers by run; a full pool cannot have more viewers than the "viewer" class runs at once
+        self.pool = ViewerPool(
+            min(args.viewer_pool_size, args.max_viewer_jobs),
+            args.viewer_idle_minutes * 60,
+            self._free_port,
+        )
 
     def setup_ui(self):
-        with gr.Tab(label="Visualize"):
+        with gr.Tab(label="Visualize") as tab:
             status = gr.Textbox(label="Status", lines=1, placeholder="Waiting")
             with gr.Row():
                 vis_button = gr.Button(value="Run Viser", variant="primary")
                 stop_button = gr.Button(value="Stop", variant="stop")
+                stop_all_button = gr.Button(value="Stop All Viewers", variant="stop")
                 vis_cmd_button = gr.Button(value="Show Command")
                 viser_button = gr.Button(value="Open Viser", variant="secondary")
                 viser_button.click(self.open_viser)
@@ -50,39 +59,86 @@ class VisualizerTab:
                         scale=5,
                     )
                     cfg_choose_button = gr.Button(value="Submit", scale=1)
+                    refresh_button = gr.Button(value="Refresh Runs", scale=1)
                 with gr.Row():
-                    cfg_file_explorer = gr.FileExplorer(
-                        label="Browse",
-                        scale=1,
-                        root_dir=self.root_dir,
-                        file_count="single",
-                        height=300,
-                        glob="*.yml",
-                    )
-                    cfg_file_explorer.change(
-                        lambda x: str(x), inputs=cfg_file_explorer, outputs=config_path
-                    )
+                    run_table, refresh_runs = run_picker(self.root_dir, config_path)
                     cfg_choose_button.click(
                         lambda x: str(x), inputs=config_path, outputs=config_path
                     )
+                # the run index is refreshed when the tab is opened, not when the page is built
+                tab.select(refresh_runs, inputs=None, outputs=run_table)
+                refresh_button.click(refresh_runs, inputs=None, outputs=run_table)
 
-            vis_button.click(self.run_vis, inputs=[config_path], outputs=status)
+            with gr.Accordion("Warm Viewers", open=False):
+                viewer_table = gr.Dataframe(headers=VIEWER_COLUMNS, interactive=False, max_height=200)
+
+            vis_button.click(
+                self.stream_vis if self.streaming else self.run_vis,
+                inputs=[config_path],
+                outputs=status,
+                concurrency_limit=None if self.streaming else "default",
+            ).then(self.pool.rows, inputs=None, outputs=viewer_table)
             vis_cmd_button.click(
                 self.generate_vis_cmd, inputs=[config_path], outputs=status
             )
-            stop_button.click(self.stop, inputs=None, outputs=status)
+            stop_button.click(self.stop, inputs=None, outputs=status).then(
+                self.pool.rows, inputs=None, outputs=viewer_table
+            )
+            stop_all_button.click(self.stop_all, inputs=None, outputs=status).then(
+                self.pool.rows, inputs=None, outputs=viewer_table
+            )
+            tab.select(self.pool.rows, inputs=None, outputs=viewer_table)
 
     def run_vis(self, config_path):
         cmd = self.generate_vis_cmd(config_path)
         # run the command
         if self.run_in_new_terminal:
             run_cmd(cmd)
-        else:
-            self.websocket_port = viewer_utils.get_free_port()
-            cmd = f"{cmd} --viewer.websocket-port {self.websocket_port}"
-            self.p = subprocess.Popen(cmd, shell=True)
+            return "Viewer started in a new terminal"
+        _, reused = self._open_viewer(config_path)
+        if reused:
+            return "Viewer is on url: http://localhost:{}/ (already running)".format(self.websocket_port)
         return "Viewer is on url: http://localhost:{}/".format(self.websocket_port)
 
+    def _open_viewer(self, config_path):
+        """The pooled viewer of ``config_path``, started if it has none. Returns (viewer, reused)."""
+        self.viewer, reused = self.pool.acquire(config_path)
+        self.websocket_port = self.viewer.port
+        return self.viewer, reused
+
+    def _free_port(self):
+        from nerfstudio.viewer_legacy.server import viewer_utils
+
+        return viewer_utils.get_free_port()
+
+    def stream_vis(self, config_path):
+        """
+        Generator handler for streaming mode: start the viewer (or reuse the
+        warm one of the run) and push its output until it prints its url (or
+        exits). The output keeps being drained in the background afterwards.
+        """
+        cmd = self.generate_vis_cmd(config_path)
+        if self.run_in_new_terminal:
+            run_cmd(cmd)
+            yield "Viewer started in a new terminal"
+            return
+
+        viewer, _ = self._open_viewer(config_path)
+        if viewer.ready.is_set():
+            yield "Viewer is on url: http://localhost:{}/ (already running)".format(viewer.port)
+            return
+        yield "Starting viewer..."
+
+        job = viewer.job
+        # from the start of the viewer's own output, so a URL printed already is seen
+        for lines, _ in stream_output(viewer.output, job.is_active, 0, self.stream_max_fps):
+            if any(VIEWER_URL.search(line) for line in lines):
+                yield "Viewer is on url: http://localhost:{}/".format(viewer.port)
+                return
+            if lines:
+                yield lines[-1]
+        yield "Viewer exited (code {})".format(job.returncode)
+
     def generate_vis_cmd(self, config_path):
         # generate the command
         if config_path == "":
@@ -107,9 +163,16 @@ class VisualizerTab:
             return None
 
     def stop(self):
-        self.p.terminate()
+        if self.viewer is not None:
+            self.pool.release(self.viewer.config_path)
+            self.viewer = None
         return "Viewer stopped"
 
+    def stop_all(self):
+        self.pool.clear()
+        self.viewer = None
+        return "All viewers stopped"
+
     def open_viser(self):
         # open url in a new tab, if a browser window is already open.
         if self.websocket_port is None:
@@ -1,3 +1,9 @@
+import os
+import time
+import zipfile
+
+import pytest
+
 from pathlib import Path
 THIS = Path(__file__)           
 WEBUI = THIS.parent.parent      
@@ -6,3 +12,71 @@ NERFROOT = WEBUI.parent / "nerfstudio"
 import sys
 sys.path.insert(0, str(WEBUI))
 sys.path.insert(0, str(NERFROOT))
+
+# a saved TrainerConfig, as nerfstudio writes it next to the checkpoints
+RUN_CONFIG = """!!python/object:nerfstudio.engine.trainer.TrainerConfig
+_target: !!python/name:nerfstudio.engine.trainer.Trainer ''
+data: &id001 !!python/object/apply:pathlib.PosixPath
+- {data}
+experiment_name: poster
+method_name: {method}
+max_num_iterations: 30000
+pipeline: !!python/object:nerfstudio.pipelines.base_pipeline.VanillaPipelineConfig
+  datamanager: !!python/object:nerfstudio.data.datamanagers.base_datamanager.VanillaDataManagerConfig
+    data: *id001
+  model: !!python/object:nerfstudio.models.nerfacto.NerfactoModelConfig
+    hidden_dim: {hidden_dim}
+    use_appearance_embedding: true
+relative_model_dir: !!python/object/apply:pathlib.PosixPath
+- {model_dir}
+timestamp: {timestamp}
+"""
+
+
+def _write_checkpoint(path, truncate=False, age=60.0):
+    # the layout torch.save writes: a zip archive with <name>/data.pkl and the tensor data
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("archive/data.pkl", b"\x80\x02}q\x00.")
+        archive.writestr("archive/data/0", os.urandom(4096))
+    if truncate:
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) // 2)
+    past = time.time() - age
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def write_checkpoint():
+    """``write_checkpoint(path, truncate=False, age=60.0)``: a checkpoint last written ``age`` seconds ago."""
+    return _write_checkpoint
+
+
+@pytest.fixture
+def make_run(tmp_path):
+    """
+    Factory of training runs in nerfstudio's layout under ``tmp_path / "root"``:
+    ``outputs/poster/<method>/<timestamp>`` with a config.yml and a checkpoint
+    per step in ``steps``, cut short for the steps in ``truncated``. Returns the run directory.
+    """
+
+    def _make_run(
+        timestamp="2024-01-01_000000",
+        method="nerfacto",
+        steps=(),
+        data="/data/poster",
+        hidden_dim=64,
+        model_dir="nerfstudio_models",
+        truncated=(),
+        age=60.0,
+    ):
+        run_dir = tmp_path / "root" / "outputs" / "poster" / method / timestamp
+        (run_dir / model_dir).mkdir(parents=True)
+        config = RUN_CONFIG.format(
+            data=data, method=method, hidden_dim=hidden_dim, model_dir=model_dir, timestamp=timestamp
+        )
+        (run_dir / "config.yml").write_text(config)
+        for step in steps:
+            _write_checkpoint(run_dir / model_dir / f"step-{step:09d}.ckpt", truncate=step in truncated, age=age)
+        return run_dir
+
+    return _make_run
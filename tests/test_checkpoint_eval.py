@@ -0,0 +1,71 @@
+# tests/test_checkpoint_eval.py
+import json
+import os
+import time
+
+from utils import checkpoint_eval
+from utils.checkpoint_eval import CheckpointEvaluator
+from utils.eval_store import EvalStore
+from utils.job_manager import JobManager
+from utils.run_index import RunIndex
+
+# stands in for utils/eval_worker.py: writes the results file it is asked for
+FAKE_WORKER = """
+import json, sys
+args = dict(zip(sys.argv[1::2], sys.argv[2::2]))
+with open(args["--output-path"], "w") as f:
+    json.dump({"step": int(args["--load-step"]), "results": {"psnr": 25.0, "ssim": 0.8, "lpips": 0.2}}, f)
+"""
+
+
+def make_evaluator(tmp_path, monkeypatch, **kwargs):
+    worker = tmp_path / "worker.py"
+    worker.write_text(FAKE_WORKER)
+    manager = JobManager()
+    monkeypatch.setattr(checkpoint_eval, "EVAL_WORKER", str(worker))
+    monkeypatch.setattr(checkpoint_eval, "get_job_manager", lambda: manager)
+    index = RunIndex(str(tmp_path / "root"), path=tmp_path / "index.json")
+    monkeypatch.setattr(checkpoint_eval, "get_run_index", lambda root: index)
+    store = EvalStore(tmp_path / "store.json")
+    return CheckpointEvaluator(str(tmp_path / "root"), store=store, results_dir=str(tmp_path / "eval"), **kwargs)
+
+
+def wait_idle(evaluator):
+    for _ in range(200):
+        if not evaluator.pending:
+            return
+        time.sleep(0.05)
+    raise AssertionError("evaluations did not finish")
+
+
+def test_new_checkpoint_is_evaluated_once(tmp_path, monkeypatch, make_run):
+    run_dir = make_run(steps=(2000,))
+    evaluator = make_evaluator(tmp_path, monkeypatch)
+
+    jobs = evaluator.scan()
+    assert len(jobs) == 1
+    assert jobs[0].resource == "eval"
+    assert jobs[0].yields_to == ("gpu",)
+    wait_idle(evaluator)
+
+    config = str(run_dir / "config.yml")
+    rows = evaluator.store.rows(config)
+    assert [row[:4] for row in rows] == [[2000, "25.0000", "0.8000", "0.2000"]]
+    # stored by hash, also across restarts
+    assert evaluator.scan() == []
+    assert EvalStore(tmp_path / "store.json").rows(config) == rows
+
+
+def test_old_and_unfinished_checkpoints_wait_for_manual_evaluation(tmp_path, monkeypatch, make_run):
+    run_dir = make_run(steps=(1000, 2000), age=3 * 24 * 3600)
+    models = run_dir / "nerfstudio_models"
+    (models / "step-000003000.ckpt").write_bytes(b"PK\x03\x04 still writing")
+    os.utime(models / "step-000003000.ckpt", (time.time() - 60, time.time() - 60))
+    evaluator = make_evaluator(tmp_path, monkeypatch)
+
+    assert evaluator.scan() == []
+    jobs = evaluator.evaluate_run(str(run_dir / "config.yml"))
+    assert len(jobs) == 2
+    wait_idle(evaluator)
+    assert [row[0] for row in evaluator.store.rows(str(run_dir / "config.yml"))] == [1000, 2000]
+    assert json.loads((tmp_path / "store.json").read_text())["results"]
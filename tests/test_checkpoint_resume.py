@@ -0,0 +1,68 @@
+# tests/test_checkpoint_resume.py
+import os
+
+from utils.checkpoint_resume import (
+    ResumePoint,
+    checkpoint_is_intact,
+    final_step,
+    find_resume_point,
+    resume_overrides,
+)
+from utils.run_index import RunIndex
+
+def records(root, tmp_path):
+    index = RunIndex(str(root), path=tmp_path / "index.json")
+    index.refresh(force=True)
+    return index.records()
+
+
+def test_checkpoint_is_intact(tmp_path, write_checkpoint):
+    write_checkpoint(tmp_path / "good.ckpt")
+    write_checkpoint(tmp_path / "cut.ckpt", truncate=True)
+    (tmp_path / "empty.ckpt").write_bytes(b"")
+    assert checkpoint_is_intact(str(tmp_path / "good.ckpt"))
+    assert not checkpoint_is_intact(str(tmp_path / "cut.ckpt"))
+    assert not checkpoint_is_intact(str(tmp_path / "empty.ckpt"))
+    assert not checkpoint_is_intact(str(tmp_path / "missing.ckpt"))
+
+
+def test_resume_skips_truncated_checkpoint(tmp_path, make_run):
+    root = tmp_path / "root"
+    data = tmp_path / "data"
+    run_dir = make_run("2024-01-01_000000", data=data, steps=(2000, 4000), truncated=(4000,))
+
+    point = find_resume_point(records(root, tmp_path), "nerfacto", str(data), {"pipeline.model.hidden_dim": 64}, 30000)
+    assert point.load_step == 2000
+    assert point.load_dir == str(run_dir / "nerfstudio_models")
+    assert point.timestamp == "2024-01-01_000000"
+    assert point.experiment_name == "poster"
+    assert point.output_dir == str(root / "outputs")
+
+
+def test_resume_needs_matching_config_dataset_and_unfinished_run(tmp_path, make_run):
+    root = tmp_path / "root"
+    data = tmp_path / "data"
+    make_run("2024-01-01_000000", data=data, steps=(2000,), hidden_dim=128)
+    make_run("2024-02-01_000000", data=tmp_path / "other", steps=(2000,))
+    make_run("2024-03-01_000000", data=data, steps=(2000, 29999))
+    runs = records(root, tmp_path)
+
+    expected = {"pipeline.model.hidden_dim": 64.0, "pipeline.model.use_appearance_embedding": True}
+    assert find_resume_point(runs, "nerfacto", str(data), expected, 30000) is None
+    assert find_resume_point(runs, "nerfacto", str(data), {"pipeline.model.missing": 1}, 30000) is None
+
+    point = find_resume_point(runs, "nerfacto", str(data), {"pipeline.model.hidden_dim": 128}, 30000)
+    assert point.timestamp == "2024-01-01_000000"
+    # the finished run resumes when asked to train longer
+    point = find_resume_point(runs, "nerfacto", str(data), expected, 40000)
+    assert (point.timestamp, point.load_step) == ("2024-03-01_000000", 29999)
+
+
+def test_resume_overrides_end_at_the_target_step():
+    root = os.path.join("/", "out")
+    run_dir = os.path.join(root, "poster", "nerfacto", "t")
+    point = ResumePoint(os.path.join(run_dir, "config.yml"), os.path.join(run_dir, "m"), 2000, root, "poster", "t")
+    overrides = resume_overrides(point, 30000)
+    assert overrides["load_step"] == 2000
+    assert overrides["timestamp"] == "t"
+    assert final_step(overrides["max_num_iterations"], overrides["load_dir"], overrides["load_step"]) == 30000
@@ -3,17 +3,22 @@ import time
 import pytest
 import gradio as gr
 from pathlib import Path
-from modules.data_processor_tab import DataProcessorTab, dataprocessor_configs
+from modules.data_processor_tab import (
+    DataProcessorTab,
+    batch_method,
+    expand_batch_inputs,
+    plan_batch,
+    get_dataprocessor_configs,
+)
+from utils.job_manager import Job
 
 class DummyArgs:
     root_dir = Path(".")
     run_in_new_terminal = False
-
-class DummyProcess:
-    def __init__(self, alive=True):
-        self._alive = alive
-    def is_alive(self):
-        return self._alive
+    lazy_ui = False
+    streaming = False
+    stream_max_fps = 4.0
+    processing_output_log_rate = 0.2
 
 @pytest.fixture
 def tab(tmp_path):
@@ -33,27 +38,60 @@ def test_run_dataprocessor_missing_inputs(tab):
     assert "select a data path" in msg
 
 def test_update_status_idle(tab):
-    # no process running
-    tab.process = None
-    # simulate no start_time
-    tab.start_time = None
-    status, timer_update = tab.update_status()
+    # no job submitted
+    tab.job = None
+    status, log, timer_update, seq = tab.update_status()
     assert status == "Idle"
     # timer stays off
     assert isinstance(timer_update, dict) and timer_update.get("active") is False
 
 def test_update_status_running(tab):
-    # simulate a live process with known start_time
-    tab.process = DummyProcess(alive=True)
-    tab.start_time = time.time() - 2
-    status, timer_update = tab.update_status()
-    assert status.startswith("In progress:")
+    # simulate a running job that printed several lines since the last tick
+    tab.job = Job(job_id="1", name="images", resource="cpu", state="running", started_at=time.time() - 2)
+    for i in range(3):
+        tab.output.append(f"line {i}")
+    status, log, timer_update, seq = tab.update_status(0)
+    assert status == "line 2"
+    assert log.splitlines() == ["line 0", "line 1", "line 2"]
+    assert seq == 3
+    assert timer_update.get("active") is True
+
+    # nothing new since the last sequence number
+    status, log, timer_update, seq = tab.update_status(seq)
+    assert seq == 3
     assert timer_update.get("active") is True
 
 def test_update_status_done(tab):
-    # simulate a finished process
-    tab.process = DummyProcess(alive=False)
-    tab.start_time = time.time() - 5
-    status, timer_update = tab.update_status()
+    # simulate a finished job
+    now = time.time()
+    tab.job = Job(
+        job_id="1", name="images", resource="cpu", state="done", returncode=0,
+        started_at=now - 5, finished_at=now,
+    )
+    status, log, timer_update, seq = tab.update_status()
     assert status.startswith("Done!")
     assert timer_update.get("active") is False
+    assert tab.job is None
+
+def test_expand_and_plan_batch(tmp_path):
+    for name in ["scene_a", "scene_b"]:
+        (tmp_path / name).mkdir()
+    (tmp_path / "walk.mp4").write_bytes(b"")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "walk.mov").write_bytes(b"")
+
+    # globs, a duplicate, an empty line and a missing path
+    text = f"{tmp_path}/scene_*\n{tmp_path}/scene_a\n\n{tmp_path}/*/walk.*\n{tmp_path}/missing\n{tmp_path}/walk.mp4"
+    inputs = expand_batch_inputs(text)
+    assert [p.name for p in inputs] == ["scene_a", "scene_b", "walk.mov", "walk.mp4"]
+
+    plan = plan_batch(inputs, "out")
+    assert [str(out) for _, out in plan] == ["out/scene_a", "out/scene_b", "out/walk", "out/walk_2"]
+    assert batch_method("ImagesToNerfstudioDataset", inputs[2]) == "VideoToNerfstudioDataset"
+    assert batch_method("VideoToNerfstudioDataset", inputs[0]) == "ImagesToNerfstudioDataset"
+    assert batch_method("ProcessPolycam", inputs[0]) == "ProcessPolycam"
+
+def test_run_batch_missing_inputs(tab, tmp_path):
+    status, _, _ = tab.run_batch("ImagesToNerfstudioDataset", f"{tmp_path}/nothing*", "out", 2)
+    assert "No existing inputs" in status
+    assert tab.batch == []
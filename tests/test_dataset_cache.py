@@ -0,0 +1,91 @@
+# tests/test_dataset_cache.py
+import os
+
+from utils.dataset_cache import DatasetCache, fingerprint_inputs, job_key, normalize_args
+
+
+def make_capture(root):
+    root.mkdir()
+    (root / "frame_0001.png").write_bytes(b"a" * 100)
+    (root / "sub").mkdir()
+    (root / "sub" / "frame_0002.png").write_bytes(b"b" * 100)
+    return root
+
+
+MIB = 2**20
+
+
+def make_output(root, size=MIB):
+    (root / "images").mkdir(parents=True)
+    (root / "images" / "frame_00001.png").write_bytes(b"x" * size)
+    (root / "colmap" / "sparse" / "0").mkdir(parents=True)
+    (root / "colmap" / "sparse" / "0" / "points3D.bin").write_bytes(b"p" * 16)
+    (root / "transforms.json").write_text('{"frames": []}')
+    return root
+
+
+def test_fingerprint_follows_content(tmp_path):
+    capture = make_capture(tmp_path / "capture")
+    digest = fingerprint_inputs(str(capture))
+    assert fingerprint_inputs(str(capture), workers=1) == digest
+
+    (capture / "sub" / "frame_0002.png").write_bytes(b"c" * 100)
+    assert fingerprint_inputs(str(capture)) != digest
+    # the fast mode only looks at names, sizes and mtimes
+    assert fingerprint_inputs(str(capture), fast=True) != fingerprint_inputs(str(capture))
+
+
+def test_normalize_args_drops_defaults_and_neutral_args():
+    specs = {
+        "num_downscales": {"default": 3},
+        "matching_method": {"default": "vocab_tree"},
+        "crop_factor": {"default": (0.0, 0.0)},
+    }
+    args = {"num_downscales": 3.0, "matching_method": "exhaustive", "verbose": True, "crop_factor": [0, 0.0]}
+    assert normalize_args(args, specs) == {"matching_method": "exhaustive"}
+    assert job_key("images", {"a": 1}, "h") != job_key("video", {"a": 1}, "h")
+
+
+def test_store_and_materialize(tmp_path):
+    cache = DatasetCache(tmp_path / "cache", max_bytes=10 * MIB)
+    output = make_output(tmp_path / "out")
+    assert cache.materialize("k1", str(tmp_path / "again")) is None
+
+    assert cache.store("k1", str(output), {"subcommand": "images"})
+    manifest = cache.materialize("k1", str(tmp_path / "again"))
+    assert manifest["files"] == 3 and manifest["subcommand"] == "images"
+
+    again = tmp_path / "again"
+    assert (again / "transforms.json").read_text() == '{"frames": []}'
+    # images are hardlinked, everything else copied
+    assert os.stat(again / "images" / "frame_00001.png").st_nlink == 3
+    assert os.stat(again / "transforms.json").st_nlink == 1
+    assert os.stat(again / "colmap" / "sparse" / "0" / "points3D.bin").st_nlink == 1
+
+
+def test_rewriting_an_output_in_place_keeps_the_entry(tmp_path):
+    cache = DatasetCache(tmp_path / "cache", max_bytes=10 * MIB)
+    output = make_output(tmp_path / "out")
+    cache.store("k1", str(output), {})
+    cache.materialize("k1", str(tmp_path / "again"))
+
+    # like COLMAP and nerfstudio in a later run into the same output directories
+    for root in (output, tmp_path / "again"):
+        with open(root / "colmap" / "sparse" / "0" / "points3D.bin", "r+b") as f:
+            f.write(b"changed")
+        with open(root / "transforms.json", "w") as f:
+            f.write("{}")
+
+    entry = tmp_path / "cache" / "k1" / "data"
+    assert (entry / "colmap" / "sparse" / "0" / "points3D.bin").read_bytes() == b"p" * 16
+    assert (entry / "transforms.json").read_text() == '{"frames": []}'
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = DatasetCache(tmp_path / "cache", max_bytes=int(2.5 * MIB))
+    for key in ("k1", "k2"):
+        cache.store(key, str(make_output(tmp_path / key)), {})
+    cache.materialize("k1", str(tmp_path / "reused"))
+
+    cache.store("k3", str(make_output(tmp_path / "k3")), {})
+    assert [m["key"] for m in cache.entries()] == ["k1", "k3"]
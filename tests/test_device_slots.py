@@ -0,0 +1,55 @@
+# tests/test_device_slots.py
+import os
+import sys
+
+import pytest
+
+from utils.device_slots import DeviceSlot, build_device_slots
+from utils.job_manager import JobManager
+
+# stand-in for a training run: reports the devices it was given
+STUB_TRAINER = "import os, time; print(os.environ['CUDA_VISIBLE_DEVICES'], flush=True); time.sleep(30)"
+
+
+def test_build_cuda_slots():
+    slots = build_device_slots("cuda", devices_per_run=2, devices=["0", "1", "2", "3", "4"])
+    assert [s.env["CUDA_VISIBLE_DEVICES"] for s in slots] == ["0,1", "2,3"]
+    assert len(build_device_slots("cuda", devices=["0", "1", "2"], num_slots=2)) == 2
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_getaffinity"), reason="needs CPU affinity")
+def test_build_cpu_slots_are_disjoint():
+    cores = len(os.sched_getaffinity(0))
+    slots = build_device_slots("cpu", num_slots=2)
+    assert len(slots) == min(2, cores)
+    if len(slots) == 2:
+        assert not slots[0].cpus & slots[1].cpus
+
+
+def test_runs_are_pinned_and_backfilled():
+    manager = JobManager()
+    manager.set_slots("gpu", [DeviceSlot("a", env={"CUDA_VISIBLE_DEVICES": "0"}), DeviceSlot("b", env={"CUDA_VISIBLE_DEVICES": "1"})])
+    jobs = [manager.submit(f"run {i}", "gpu", argv=[sys.executable, "-c", STUB_TRAINER]) for i in range(3)]
+
+    assert [job.state for job in jobs] == ["running", "running", "queued"]
+    for job in jobs[:2]:
+        assert job.output.wait(0, timeout=10)
+    assert sorted(job.output.tail(1)[0] for job in jobs[:2]) == ["0", "1"]
+
+    # finishing the first run hands its device to the queued one
+    manager.cancel(jobs[0].job_id)
+    assert jobs[2].output.wait(0, timeout=10)
+    assert jobs[2].output.tail(1) == jobs[0].output.tail(1)
+    assert jobs[2].slot is jobs[0].slot
+    for job in jobs[1:]:
+        manager.cancel(job.job_id)
+        assert job.wait(10)
+
+
+def test_current_job_from_runner_thread():
+    manager = JobManager()
+    seen = []
+    job = manager.submit("probe", "cpu", target=lambda: seen.append(manager.current_job()))
+    assert job.wait(5)
+    assert seen == [job]
+    assert manager.current_job() is None
@@ -0,0 +1,52 @@
+# tests/test_exporter_tab.py
+import argparse
+
+import gradio as gr
+
+from modules.exporter_tab import ExporterTab, _clean_line, parse_export_progress
+from utils.utils import _set_rendered_arg, track_rendered_args
+
+
+def make_tab():
+    args = argparse.Namespace(
+        root_dir="./", run_in_new_terminal=False, lazy_ui=True, streaming=False, stream_max_fps=4.0
+    )
+    return ExporterTab(args)
+
+
+def test_parse_export_progress():
+    progress = {}
+    assert parse_export_progress(_clean_line("\x1b[1mComputing Point Cloud\x1b[0m ━━━━ 50%"), progress)
+    assert progress == {"stage": "Computing point cloud"}
+    assert parse_export_progress("✅ Generated PointCloud with 1,000,000 points.", progress)
+    assert progress["points"] == 1000000
+    assert not parse_export_progress("Loading latest checkpoint", progress)
+
+
+def test_build_argv_and_idle_status():
+    tab = make_tab()
+    tab.exporter_args = {"num_points": 1000, "remove_outliers": True}
+    argv = tab._build_argv("ExportPoissonMesh", "outputs/config.yml", "exports")
+    assert argv[:6] == ["ns-export", "poisson", "--load-config", "outputs/config.yml", "--output-dir", "exports"]
+    assert argv[6:] == ["--num-points", "1000", "--remove-outliers", "True"]
+    assert tab.update_status(3)[0] == "Idle"
+
+
+def test_rendered_args_are_kept_per_session_and_config():
+    tab = make_tab()
+    with gr.Blocks():
+        state = gr.State({})
+        components = [gr.Number(value=1000), gr.Checkbox(value=False)]
+        track_rendered_args(components, ["num_points", "remove_outliers"], state, "exporter/ExportPointCloud")
+
+    # one session changed num_points, another one only rendered the defaults
+    changed = _set_rendered_arg("exporter/ExportPointCloud", 0, {}, 5000)
+    tab.get_exporter_args("ExportPointCloud", changed)
+    assert tab.exporter_args == {"num_points": 5000, "remove_outliers": False}
+    tab.get_exporter_args("ExportPointCloud", {})
+    assert tab.exporter_args == {"num_points": 1000, "remove_outliers": False}
+
+    # values changed for the previously selected exporter are not applied to this one
+    stale = _set_rendered_arg("exporter/ExportPoissonMesh", 0, {}, 7)
+    tab.get_exporter_args("ExportPointCloud", stale)
+    assert tab.exporter_args["num_points"] == 1000
@@ -0,0 +1,56 @@
+# tests/test_frame_culling.py
+import numpy as np
+from PIL import Image, ImageFilter
+
+from utils.frame_culling import (
+    difference_hash,
+    laplacian_variance,
+    list_frames,
+    score_frames,
+    select_frames,
+)
+
+
+def scene(seed, size=128):
+    """Random rectangles on a gradient, different for every seed."""
+    rng = np.random.default_rng(seed)
+    image = np.tile(np.linspace(0, 255, size, dtype=np.float32), (size, 1))
+    for _ in range(12):
+        x, y = rng.integers(0, size - 16, 2)
+        w, h = rng.integers(8, 40, 2)
+        image[y : y + h, x : x + w] = rng.integers(0, 256)
+    return Image.fromarray(image.astype(np.uint8))
+
+
+def test_blur_lowers_sharpness_and_keeps_the_hash():
+    sharp = scene(0)
+    blurred = sharp.filter(ImageFilter.GaussianBlur(3))
+    gray = np.asarray(sharp, dtype=np.float32)
+    blurred_gray = np.asarray(blurred, dtype=np.float32)
+    assert laplacian_variance(blurred_gray) < 0.2 * laplacian_variance(gray)
+
+    distance = bin(difference_hash(gray) ^ difference_hash(blurred_gray)).count("1")
+    other = bin(difference_hash(gray) ^ difference_hash(np.asarray(scene(1), dtype=np.float32))).count("1")
+    assert distance <= 4 < other
+
+
+def test_blurry_and_duplicate_frames_are_dropped(tmp_path):
+    frames = {
+        "frame_00001.png": scene(0),
+        "frame_00002.png": scene(0).filter(ImageFilter.GaussianBlur(0.6)),  # near-duplicate, less sharp
+        "frame_00003.png": scene(1),
+        "frame_00004.png": scene(2).filter(ImageFilter.GaussianBlur(4)),  # motion blur
+        "frame_00005.png": scene(3),
+    }
+    for name, image in frames.items():
+        image.save(tmp_path / name)
+    (tmp_path / "notes.txt").write_text("not a frame")
+
+    scores = score_frames(list_frames(tmp_path), workers=1)
+    kept, dropped = select_frames(scores)
+    assert [s.path.name for s in kept] == ["frame_00001.png", "frame_00003.png", "frame_00005.png"]
+    assert [s.path.name for s in dropped] == ["frame_00002.png", "frame_00004.png"]
+
+    # the sharper of two near-duplicates is kept even if it comes second
+    kept, _ = select_frames(list(reversed(scores[:2])))
+    assert [s.path.name for s in kept] == ["frame_00001.png"]
@@ -0,0 +1,115 @@
+# tests/test_incremental_processing.py
+import os
+import sqlite3
+
+from utils.incremental_processing import (
+    _unshare,
+    match_pairs,
+    plan_increment,
+    read_manifest,
+    record_full_run,
+    reuse_camera,
+)
+
+
+def make_capture(root, names):
+    root.mkdir(exist_ok=True)
+    for name in names:
+        (root / name).write_bytes(name.encode())
+    return root
+
+
+def make_processed(root, capture):
+    """Output of a full ns-process-data images run of ``capture``."""
+    (root / "images").mkdir(parents=True)
+    (root / "colmap" / "sparse" / "0").mkdir(parents=True)
+    (root / "colmap" / "database.db").write_bytes(b"")
+    for idx, path in enumerate(sorted(capture.iterdir())):
+        (root / "images" / f"frame_{idx + 1:05d}{path.suffix}").write_bytes(path.read_bytes())
+    return root
+
+
+def test_new_images_are_numbered_after_the_processed_ones(tmp_path):
+    capture = make_capture(tmp_path / "capture", ["b.jpg", "a.jpg", "notes.txt"])
+    output = make_processed(tmp_path / "out", capture)
+    assert not plan_increment(capture, output).possible
+
+    assert record_full_run(capture, output)
+    assert read_manifest(output)["frames"]["a.jpg"]["frame"] == "frame_00001.jpg"
+    assert plan_increment(capture, output).new == []
+
+    make_capture(capture, ["0.jpg", "c.png"])
+    increment = plan_increment(capture, output)
+    # sorting first does not renumber the processed frames
+    assert [(path.name, frame) for path, frame in increment.new] == [
+        ("0.jpg", "frame_00003.jpg"),
+        ("c.png", "frame_00004.png"),
+    ]
+
+
+def test_removed_or_changed_images_need_a_full_run(tmp_path):
+    capture = make_capture(tmp_path / "capture", ["a.jpg", "b.jpg"])
+    output = make_processed(tmp_path / "out", capture)
+    record_full_run(capture, output)
+
+    (capture / "a.jpg").write_bytes(b"retouched")
+    assert "a.jpg was changed" in plan_increment(capture, output).reason
+    (capture / "b.jpg").unlink()
+    assert not plan_increment(capture, output).possible
+
+
+def test_match_pairs_scale_with_the_new_images():
+    existing = [f"frame_{i:05d}.jpg" for i in range(1, 101)]
+    new = ["frame_00101.jpg", "frame_00102.jpg"]
+    pairs = match_pairs(existing, new, "exhaustive")
+    assert len(pairs) == 2 * 100 + 1
+    assert all(a in new or b in new for a, b in pairs)
+
+    sequential = match_pairs(existing, new, "sequential")
+    assert ("frame_00091.jpg", "frame_00101.jpg") in sequential
+    assert ("frame_00090.jpg", "frame_00101.jpg") not in sequential
+    # frame 102 has frames 92-101 before it
+    assert len(sequential) == 10 + 9 + 1
+
+
+def test_unshare_keeps_hardlinked_images(tmp_path):
+    output = tmp_path / "out"
+    (output / "images").mkdir(parents=True)
+    (output / "colmap").mkdir()
+    for path in (output / "images" / "frame_00001.jpg", output / "colmap" / "database.db"):
+        path.write_bytes(b"data")
+        os.link(path, tmp_path / path.name)
+
+    _unshare(output)
+    assert os.stat(output / "images" / "frame_00001.jpg").st_nlink == 2
+    assert os.stat(output / "colmap" / "database.db").st_nlink == 1
+    assert (output / "colmap" / "database.db").read_bytes() == b"data"
+
+
+def test_new_images_reuse_the_camera_of_the_model(tmp_path):
+    database = tmp_path / "database.db"
+    connection = sqlite3.connect(database)
+    # the columns of COLMAP's schema that matter here
+    connection.execute(
+        "CREATE TABLE cameras (camera_id INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL, model INTEGER NOT NULL, "
+        "width INTEGER NOT NULL, height INTEGER NOT NULL, params BLOB, prior_focal_length INTEGER NOT NULL)"
+    )
+    connection.execute(
+        "CREATE TABLE images (image_id INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL, name TEXT NOT NULL UNIQUE, "
+        "camera_id INTEGER NOT NULL)"
+    )
+    # feature_extractor of the incremental run added a second camera for the new frames
+    connection.executemany("INSERT INTO cameras VALUES (?, 4, 640, 480, NULL, 0)", [(1,), (2,)])
+    existing = [f"frame_{i:05d}.jpg" for i in range(1, 4)]
+    new = [f"frame_{i:05d}.jpg" for i in range(4, 6)]
+    connection.executemany(
+        "INSERT INTO images (name, camera_id) VALUES (?, ?)", [(n, 1) for n in existing] + [(n, 2) for n in new]
+    )
+    connection.commit()
+    connection.close()
+
+    assert reuse_camera(database, existing, new) == 1
+    connection = sqlite3.connect(database)
+    assert connection.execute("SELECT COUNT(*) FROM cameras").fetchone() == (1,)
+    assert connection.execute("SELECT DISTINCT camera_id FROM images").fetchall() == [(1,)]
+    connection.close()
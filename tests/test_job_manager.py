@@ -0,0 +1,131 @@
+# tests/test_job_manager.py
+import sys
+import threading
+
+import pytest
+
+from utils.job_manager import JobManager
+from utils.output_log import OutputLogPolicy
+
+
+def _blocker():
+    """A target that runs until the returned event is set."""
+    release = threading.Event()
+    return release, release.wait
+
+
+def test_limit_per_resource_and_priority_order():
+    manager = JobManager({"cpu": 1})
+    release, block = _blocker()
+    order = []
+
+    first = manager.submit("first", "cpu", target=block)
+    low = manager.submit("low", "cpu", target=lambda: order.append("low"))
+    high = manager.submit("high", "cpu", target=lambda: order.append("high"), priority=5)
+    assert first.state == "running"
+    assert low.state == "queued"
+    assert manager.queue_position(high) == 1
+    assert manager.queue_position(low) == 2
+
+    # other resource classes are not held back by the busy cpu slot
+    export = manager.submit("export", "export", target=lambda: None)
+    assert export.wait(5)
+
+    release.set()
+    assert low.wait(5)
+    assert order == ["high", "low"]
+    assert first.state == low.state == high.state == "done"
+
+
+def test_cancel_queued_job():
+    manager = JobManager({"cpu": 1})
+    release, block = _blocker()
+    manager.submit("running", "cpu", target=block)
+    queued = manager.submit("queued", "cpu", target=lambda: None)
+
+    assert manager.cancel(queued.job_id)
+    assert queued.state == "cancelled"
+    assert queued.finished.is_set()
+    release.set()
+
+
+def test_running_in_process_job_needs_a_cancel_hook():
+    manager = JobManager()
+    release, block = _blocker()
+    plain = manager.submit("plain", "cpu", target=block)
+    assert not manager.cancel(plain.job_id)
+    assert plain.state == "running"
+
+    hooked = manager.submit("hooked", "gpu", target=block, on_cancel=release.set)
+    assert manager.cancel(hooked.job_id)
+    assert hooked.wait(5) and plain.wait(5)
+    assert (plain.state, hooked.state) == ("done", "cancelled")
+
+
+def test_only_the_last_finished_jobs_are_kept():
+    manager = JobManager(max_finished=2)
+    release, block = _blocker()
+    running = manager.submit("running", "gpu", target=block)
+    jobs = [manager.submit(f"job {i}", "cpu", target=lambda: None) for i in range(4)]
+    assert all(job.wait(5) for job in jobs)
+    assert list(manager.jobs) == [running.job_id, jobs[2].job_id, jobs[3].job_id]
+    release.set()
+
+
+def test_argv_job_captures_output():
+    manager = JobManager()
+    job = manager.submit("echo", "cpu", argv=[sys.executable, "-c", "print('hello'); print('world')"])
+    assert job.wait(10)
+    assert job.state == "done"
+    assert job.output.tail(2) == ["hello", "world"]
+    assert manager.rows()[0][0] == job.job_id
+
+
+def test_before_hook_can_skip_the_job():
+    manager = JobManager()
+    argv = [sys.executable, "-c", "print('ran')"]
+    skipped = manager.submit("cached", "cpu", argv=argv, before=lambda job: job.output.append("cache hit") or 0)
+    ran = manager.submit("missed", "cpu", argv=argv, before=lambda job: None)
+    assert skipped.wait(10) and ran.wait(10)
+    assert skipped.state == ran.state == "done"
+    assert skipped.process is None and skipped.output.tail(1) == ["cache hit"]
+    assert ran.output.tail(1) == ["ran"]
+
+
+def test_unknown_resource_rejected():
+    with pytest.raises(ValueError):
+        JobManager().submit("x", "tpu", target=lambda: None)
+
+
+def test_cancel_kills_process_ignoring_sigterm(monkeypatch):
+    monkeypatch.setattr("utils.job_manager.CANCEL_GRACE_SECONDS", 0.2)
+    manager = JobManager()
+    code = "import signal, sys, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); print('ready', flush=True); time.sleep(30)"
+    job = manager.submit("stubborn", "export", argv=[sys.executable, "-c", code])
+    assert job.output.wait(0, timeout=10)
+
+    assert manager.cancel(job.job_id)
+    assert job.wait(5)
+    assert job.state == "cancelled"
+
+
+def test_background_job_yields_to_resource_class():
+    manager = JobManager({"gpu": 1})
+    release, block = _blocker()
+    training = manager.submit("train", "gpu", target=block)
+    background = manager.submit("eval", "eval", target=lambda: None, yields_to=("gpu",))
+    assert background.state == "queued"
+
+    release.set()
+    assert training.wait(5)
+    assert background.wait(5)
+    assert background.state == "done"
+
+
+def test_job_output_log_overrides_the_managers(tmp_path):
+    manager = JobManager(output_log=OutputLogPolicy(raw_dir=str(tmp_path / "default")))
+    policy = OutputLogPolicy(rate=0.2, raw_dir=str(tmp_path / "colmap"))
+    job = manager.submit("colmap", "cpu", argv=[sys.executable, "-c", "print('hello')"], output_log=policy)
+    assert job.wait(10)
+    assert (tmp_path / "colmap" / f"job-{job.job_id}.out.gz").exists()
+    assert not (tmp_path / "default").exists()
@@ -0,0 +1,83 @@
+# tests/test_logging.py
+import atexit
+import json
+import logging
+import threading
+from pathlib import Path
+
+from webui import JobContextFilter, JobLogHandler, JSONFormatter, setup_logging
+
+
+def make_logger(handler):
+    logger = logging.getLogger("test_logging")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def test_json_formatter_serializes_extras():
+    record = logging.LogRecord("x", logging.INFO, __file__, 1, "hello %s", ("world",), None)
+    record.path = Path("/tmp/data")
+    out = json.loads(JSONFormatter().format(record))
+    assert out["message"] == "hello world"
+    assert out["path"] == "/tmp/data"
+
+
+def test_job_log_handler_routes_by_thread(tmp_path):
+    handler = JobLogHandler(tmp_path, max_open=1)
+    handler.addFilter(JobContextFilter())
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = make_logger(handler)
+
+    def log_from_job(job_id):
+        logger.info("output of %s", job_id)
+
+    for job_id in ["1", "2", "1"]:
+        thread = threading.Thread(target=log_from_job, args=(job_id,), name=f"job-{job_id}-output")
+        thread.start()
+        thread.join()
+    logger.info("not a job")
+    logger.info("explicit", extra={"job_id": "3"})
+    handler.close()
+
+    assert (tmp_path / "job-1.log").read_text().splitlines() == ["output of 1", "output of 1"]
+    assert (tmp_path / "job-2.log").read_text().splitlines() == ["output of 2"]
+    assert (tmp_path / "job-3.log").read_text().splitlines() == ["explicit"]
+
+
+def test_async_logging_writes_through_listener(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    try:
+        listener = setup_logging(async_logging=True, log_format="json", job_log_dir="logs/jobs")
+        logging.getLogger("async").info("queued", extra={"job_id": "7"})
+        listener.stop()
+        atexit.unregister(listener.stop)
+    finally:
+        root.handlers, root.level = saved_handlers, saved_level
+
+    line = json.loads((tmp_path / "logs" / "jobs" / "job-7.log").read_text())
+    assert line["message"] == "queued"
+    assert json.loads((tmp_path / "logs" / "webui.log").read_text())["job_id"] == "7"
+
+
+def test_async_logging_keeps_exc_info(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    try:
+        listener = setup_logging(async_logging=True, log_format="json", job_log_dir="")
+        try:
+            raise ValueError("broken")
+        except ValueError:
+            logging.getLogger("async").exception("failed %s", "job")
+        listener.stop()
+        atexit.unregister(listener.stop)
+    finally:
+        root.handlers, root.level = saved_handlers, saved_level
+
+    line = json.loads((tmp_path / "logs" / "webui.log").read_text())
+    assert line["message"] == "failed job"
+    assert "ValueError: broken" in line["exc_info"]
@@ -0,0 +1,43 @@
+# tests/test_output_log.py
+import gzip
+import logging
+
+from utils.output_log import OutputLogPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_sampling_keeps_head_errors_and_last_line(tmp_path, caplog):
+    clock = FakeClock()
+    policy = OutputLogPolicy(head=2, rate=1.0, burst=1, raw_dir=str(tmp_path))
+    output_log = policy.open("5", clock=clock)
+
+    with caplog.at_level(logging.INFO, logger="JobOutput"):
+        for i in range(100):
+            output_log(f"line {i}")
+        output_log("ERROR: feature extraction failed")
+        clock.now = 1.0
+        output_log("line 101")  # one token refilled
+        output_log("line 102")
+        output_log("line 103")
+        output_log.close(0)
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert messages[:3] == ["Process output: line 0", "Process output: line 1", "Process output: line 2"]
+    assert "97 lines suppressed" in messages
+    assert "Process output: ERROR: feature extraction failed" in messages
+    assert "Process output: line 101" in messages
+    # the last line is kept, the line before it only counted
+    assert messages[-3:] == ["1 lines suppressed", "Process output: line 103", "Process output finished"]
+    assert all(r.job_id == "5" for r in caplog.records)
+
+    with gzip.open(tmp_path / "job-5.out.gz", "rt") as f:
+        raw = f.read().splitlines()
+    assert len(raw) == 104
+    assert raw[-1] == "line 103"
@@ -0,0 +1,60 @@
+# tests/test_output_stream.py
+import io
+
+from utils.output_stream import OutputBuffer, start_drain_thread, stream_changes, stream_output
+
+
+def test_read_since_returns_only_new_lines():
+    buffer = OutputBuffer()
+    for i in range(5):
+        buffer.append(str(i))
+    lines, seq = buffer.read_since(3)
+    assert lines == ["3", "4"]
+    assert seq == 5
+    assert buffer.read_since(seq) == ([], 5)
+
+
+def test_ring_buffer_drops_oldest():
+    buffer = OutputBuffer(maxlen=3)
+    for i in range(10):
+        buffer.append(str(i))
+    lines, seq = buffer.read_since(0)
+    assert lines == ["7", "8", "9"]
+    assert seq == 10
+    assert buffer.tail(2) == ["8", "9"]
+
+
+def test_drain_thread_reads_until_eof():
+    stream = io.StringIO("a\n\nb\nc\n")
+    buffer = OutputBuffer()
+    seen = []
+    thread = start_drain_thread(stream, buffer, on_line=seen.append)
+    thread.join(timeout=5)
+    assert buffer.read_since(0) == (["a", "b", "c"], 3)
+    assert seen == ["a", "b", "c"]
+
+
+def test_stream_output_coalesces_and_finishes():
+    import threading
+
+    buffer = OutputBuffer()
+    done = threading.Event()
+
+    def produce():
+        for i in range(100):
+            buffer.append(str(i))
+        done.set()
+
+    threading.Thread(target=produce).start()
+    batches = list(stream_output(buffer, lambda: not done.is_set(), max_fps=50))
+    lines = [line for batch, _ in batches for line in batch]
+    assert lines == [str(i) for i in range(100)]
+    assert batches[-1][1] == 100
+    assert len(batches) < 100
+
+
+def test_stream_changes_only_yields_new_values():
+    values = iter([1, 1, 2, 2, 3])
+    remaining = [True, True, True, True, False]
+    out = list(stream_changes(lambda: next(values), lambda: remaining.pop(0), max_fps=1000))
+    assert out == [1, 2, 3]
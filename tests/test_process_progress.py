@@ -0,0 +1,77 @@
+# tests/test_process_progress.py
+import itertools
+
+from utils.process_progress import ProcessProgress, progress_html, progress_text
+
+GLOG = "I0612 10:15:02.123456 140213 "
+
+
+def test_colmap_stages_and_counters():
+    clock = itertools.count(0.0, 1.0)
+    progress = {}
+    parser = ProcessProgress(progress, clock=lambda: next(clock))
+
+    assert not parser.feed("Feature extraction")
+    assert parser.feed(GLOG + "feature_extraction.cc:245] Processed file [1/40]")
+    assert parser.feed(GLOG + "feature_extraction.cc:245] Processed file [10/40]")
+    assert progress["stage"] == "Extracting features" and progress["images"] == 40
+    assert (progress["done"], progress["total"], progress["percent"]) == (10, 40, 25.0)
+    # a quarter done one tick after the stage started
+    assert progress["eta"] == 3.0
+
+    parser.feed(GLOG + "matching.cc:205] Matching block [2/3, 1/3] in 0.512s")
+    assert progress["stage"] == "Matching features"
+    assert (progress["done"], progress["total"]) == (4, 9)
+
+    parser.feed("Initializing with image pair #12 and #17")
+    assert progress["stage"] == "Reconstructing" and "percent" not in progress
+    parser.feed("Registering image #3 (20)")
+    assert progress["percent"] == 50.0
+    assert not parser.feed(GLOG + "incremental_mapper.cc:78] => Merged observations: 0")
+
+    parser.feed("Undistorting image [5/40]")
+    assert progress_text(progress).startswith("Undistorting images 12% (5/40)")
+
+
+# stdout of a non-verbose `ns-process-data images` (nerfstudio 1.1.5) piped to a job: the spinners are not
+# printed and the COLMAP output is captured, only rich's CONSOLE.log lines come through
+NON_VERBOSE_RUN = """\
+[10:10:21] 🎉 Done copying images with prefix 'frame_'.                                       process_data_utils.py:348
+[10:10:58] 🎉 Done extracting COLMAP features.                                                      colmap_utils.py:137
+[10:12:40] 🎉 Done matching COLMAP features.                                                        colmap_utils.py:151
+[10:19:03] 🎉 Done COLMAP bundle adjustment.                                                        colmap_utils.py:173
+[10:19:30] 🎉 Done refining intrinsics.                                                             colmap_utils.py:184
+           🎉 🎉 🎉 All DONE 🎉 🎉 🎉                                              images_to_nerfstudio_dataset.py:135
+           Starting with 120 images                                                images_to_nerfstudio_dataset.py:138
+           Colmap matched 118 images                                               images_to_nerfstudio_dataset.py:138
+           COLMAP only found poses for 98.33% of the images.                       images_to_nerfstudio_dataset.py:138
+           This isn't great, but may be ok.
+"""
+
+
+def test_non_verbose_nerfstudio_run():
+    progress = {}
+    parser = ProcessProgress(progress)
+    stages = []
+    for line in NON_VERBOSE_RUN.splitlines():
+        if parser.feed(line):
+            stages.append(progress["stage"])
+    assert stages == [
+        "Extracting features",
+        "Matching features",
+        "Reconstructing",
+        "Bundle adjustment",
+        "Writing transforms.json",
+        "Finished",
+    ]
+    assert progress == {"stage": "Finished"}
+    assert progress_text(progress) == "Finished"
+    assert "Finished" in progress_html(progress)
+    assert progress_html({}) == ""
+
+
+def test_verbose_image_copy_counts():
+    progress = {}
+    parser = ProcessProgress(progress)
+    parser.feed("[10:10:20] Copying image 30 of 120...                                       process_data_utils.py:274")
+    assert progress["stage"] == "Copying images" and progress["percent"] == 25.0
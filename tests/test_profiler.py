@@ -0,0 +1,40 @@
+# tests/test_profiler.py
+import json
+import sys
+
+from utils.profiler import StartupProfiler
+
+
+def test_track_imports_records_new_modules(tmp_path, monkeypatch):
+    (tmp_path / "profiler_probe.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "profiler_probe", raising=False)
+
+    profiler = StartupProfiler(prefixes=("profiler_probe",))
+    with profiler.track_imports():
+        import profiler_probe  # noqa: F401
+        import json as _json  # noqa: F401  (not profiled)
+
+    assert [r["module"] for r in profiler.imports] == ["profiler_probe"]
+
+
+def test_phase_and_report(tmp_path):
+    profiler = StartupProfiler(prefixes=(), trace_memory=True)
+    with profiler.phase("build"):
+        data = [0] * 10000
+
+    report = profiler.write(tmp_path / "profile.json")
+    assert report["phases"][0]["phase"] == "build"
+    assert report["phases"][0]["allocated_bytes"] > 0
+    assert json.loads((tmp_path / "profile.json").read_text())["phases"][0]["phase"] == "build"
+    assert "build" in profiler.format_table(report)
+    del data
+
+
+def test_memory_is_not_traced_by_default():
+    profiler = StartupProfiler(prefixes=())
+    with profiler.phase("build"):
+        pass
+
+    assert profiler.phases[0]["allocated_bytes"] is None
+    assert "-" in profiler.format_table().splitlines()[1]
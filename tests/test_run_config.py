@@ -0,0 +1,81 @@
+# tests/test_run_config.py
+from dataclasses import dataclass, field
+
+from utils import run_config
+from utils.run_config import apply_overlay, build_run_config
+
+
+@dataclass
+class Dataparser:
+    data: str = ""
+    scale: float = 1.0
+
+
+@dataclass
+class Datamanager:
+    dataparser: Dataparser = field(default_factory=Dataparser)
+    batch: int = 4096
+
+
+@dataclass
+class Model:
+    num_samples: int = 48
+    extras: list = field(default_factory=lambda: [1, 2, 3])
+
+
+@dataclass
+class Pipeline:
+    datamanager: Datamanager = field(default_factory=Datamanager)
+    model: Model = field(default_factory=Model)
+
+
+@dataclass
+class Viewer:
+    websocket_port: int = 7007
+
+
+@dataclass
+class Config:
+    pipeline: Pipeline = field(default_factory=Pipeline)
+    viewer: Viewer = field(default_factory=Viewer)
+    max_num_iterations: int = 30000
+
+
+def test_overlay_leaves_base_untouched_and_shares_the_rest():
+    base = Config()
+    registry_parser = Dataparser(data="registry")
+    config = apply_overlay(
+        base,
+        {
+            "max_num_iterations": 100,
+            "pipeline.model.num_samples": 64,
+            "pipeline.datamanager.dataparser": registry_parser,
+            "pipeline.datamanager.dataparser.scale": 0.5,
+        },
+    )
+    assert config.max_num_iterations == 100
+    assert config.pipeline.model.num_samples == 64
+    assert config.pipeline.datamanager.dataparser.scale == 0.5
+    assert config.pipeline.datamanager.dataparser.data == "registry"
+
+    # nothing shared was written to
+    assert base == Config()
+    assert registry_parser == Dataparser(data="registry")
+    assert config.pipeline.datamanager.dataparser is not registry_parser
+    # untouched leaves are shared, not copied
+    assert config.pipeline.model.extras is base.pipeline.model.extras
+
+    # subtrees nerfstudio writes to at launch belong to the run
+    config.viewer.websocket_port = 1
+    config.pipeline.datamanager.dataparser.data = "run"
+    assert base.viewer.websocket_port == 7007
+    assert base.pipeline.datamanager.dataparser.data == ""
+
+
+def test_build_run_config_memoizes_base(monkeypatch):
+    base = Config()
+    monkeypatch.setitem(run_config._base_configs, "dummy", base)
+    first = build_run_config("dummy", {"pipeline.model.num_samples": 1})
+    second = build_run_config("dummy", {"pipeline.model.num_samples": 2})
+    assert (first.pipeline.model.num_samples, second.pipeline.model.num_samples) == (1, 2)
+    assert base.pipeline.model.num_samples == 48
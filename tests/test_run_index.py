@@ -0,0 +1,69 @@
+# tests/test_run_index.py
+import os
+
+import pytest
+
+from utils.run_index import RunIndex, parse_run_config
+
+@pytest.fixture
+def index_path(tmp_path):
+    return tmp_path / "index.json"
+
+
+def test_parse_run_config_without_importing_nerfstudio(make_run):
+    info = parse_run_config((make_run() / "config.yml").read_text())
+    assert info["method"] == "nerfacto"
+    assert info["experiment"] == "poster"
+    assert info["timestamp"] == "2024-01-01_000000"
+    assert info["dataset"] == "/data/poster"
+    assert info["model_dir"] == "nerfstudio_models"
+
+
+def test_index_finds_runs_and_latest_checkpoint(tmp_path, index_path, make_run):
+    root = tmp_path / "root"
+    make_run("2024-01-01_000000", steps=(999, 1999))
+    make_run("2024-02-01_000000", method="splatfacto")
+    (root / "data" / "images").mkdir(parents=True)
+
+    index = RunIndex(str(root), path=index_path)
+    assert index.refresh(force=True)
+    rows = index.rows()
+    assert [row[1] for row in rows] == ["splatfacto", "nerfacto"]  # newest first
+    assert rows[1][3] == 1999
+    assert rows[0][3] == ""
+    assert rows[1][5].endswith(os.path.join("nerfacto", "2024-01-01_000000", "config.yml"))
+
+
+def test_refresh_lists_only_changed_directories(tmp_path, index_path, make_run):
+    root = tmp_path / "root"
+    run_dir = make_run("2024-01-01_000000", steps=(999,))
+    images = root / "data" / "images"
+    images.mkdir(parents=True)
+
+    index = RunIndex(str(root), path=index_path)
+    index.refresh(force=True)
+    listed = []
+    index._scan_dir = lambda path, mtime, scan=index._scan_dir: listed.append(path) or scan(path, mtime)
+
+    assert not index.refresh(force=True)
+    assert listed == []
+
+    (images / "0001.png").write_bytes(b"")
+    (run_dir / "nerfstudio_models" / "step-000001999.ckpt").write_bytes(b"")
+    assert index.refresh(force=True)
+    assert listed == [str(images)]
+    assert index.rows()[0][3] == 1999
+
+
+def test_index_persists_and_drops_removed_runs(tmp_path, index_path, make_run):
+    root = tmp_path / "root"
+    make_run("2024-01-01_000000")
+    run_dir = make_run("2024-02-01_000000", method="splatfacto")
+    RunIndex(str(root), path=index_path).refresh(force=True)
+
+    index = RunIndex(str(root), path=index_path)
+    assert len(index.rows()) == 2  # loaded from disk, before any refresh
+
+    (run_dir / "config.yml").unlink()
+    index.refresh(force=True)
+    assert [row[1] for row in index.rows()] == ["nerfacto"]
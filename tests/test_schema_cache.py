@@ -0,0 +1,86 @@
+# tests/test_schema_cache.py
+import os
+import sys
+import types
+from dataclasses import dataclass, field
+from typing import Literal, Tuple
+
+import pytest
+
+from utils.schema_cache import INSTANCE_SOURCES, SchemaCache, resolve_instance_specs, resolve_type_specs
+
+
+@dataclass
+class DummyConfig:
+    method: Literal["a", "b"] = "a"
+    verbose: bool = False
+    steps: int = 10
+    scale: float = 0.5
+    name: str = "x"
+    crop: Tuple[float, float] = (0.0, 1.0)
+    extra: dict = field(default_factory=dict)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "schema_cache.json"
+
+
+def test_resolve_type_specs_kinds():
+    specs = {s["name"]: s for s in resolve_type_specs(DummyConfig)}
+    assert specs["method"]["kind"] == "literal"
+    assert specs["method"]["choices"] == ["a", "b"]
+    assert specs["verbose"]["kind"] == "bool"
+    assert specs["steps"]["kind"] == "int"
+    assert specs["crop"]["kind"] == "sequence"
+    assert specs["crop"]["item_kind"] == "float"
+    assert specs["crop"]["default"] == [0.0, 1.0]
+    assert specs["extra"]["kind"] == "other"
+
+
+def test_resolve_instance_specs_skips_unsupported():
+    names = [s["name"] for s in resolve_instance_specs(DummyConfig(steps=3))]
+    assert names == ["method", "verbose", "steps", "scale", "name"]
+
+
+def test_cache_roundtrip(cache_path):
+    calls = []
+
+    def resolver(config):
+        calls.append(config)
+        return resolve_instance_specs(config)
+
+    cache = SchemaCache(cache_path, version="1.0")
+    first = cache.get("dummy", DummyConfig(), resolver)
+    cache.save()
+
+    reloaded = SchemaCache(cache_path, version="1.0")
+    assert reloaded.get("dummy", DummyConfig(), resolver) == first
+    assert len(calls) == 1
+    assert reloaded.hits == 1
+
+
+def test_cache_invalidated_on_version_change(cache_path):
+    cache = SchemaCache(cache_path, version="1.0")
+    cache.get("dummy", DummyConfig(), resolve_instance_specs)
+    cache.save()
+
+    upgraded = SchemaCache(cache_path, version="1.1")
+    assert upgraded.entries == {}
+
+
+def test_instance_entry_invalidated_when_its_registry_changes(cache_path, tmp_path, monkeypatch):
+    registry = tmp_path / "registry.py"
+    registry.write_text("")
+    monkeypatch.setitem(sys.modules, "dummy_registry", types.SimpleNamespace(__file__=str(registry)))
+    monkeypatch.setitem(INSTANCE_SOURCES, "model", ("dummy_registry",))
+
+    cache = SchemaCache(cache_path, version="1.0")
+    cache.get("model/dummy", DummyConfig(steps=3), resolve_instance_specs)
+    cache.get("model/dummy", DummyConfig(steps=3), resolve_instance_specs)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # the registry now builds the instance with other defaults
+    os.utime(registry, ns=(0, registry.stat().st_mtime_ns + 10**9))
+    specs = {s["name"]: s for s in cache.get("model/dummy", DummyConfig(steps=5), resolve_instance_specs)}
+    assert specs["steps"]["default"] == 5 and cache.misses == 2
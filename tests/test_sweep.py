@@ -0,0 +1,121 @@
+# tests/test_sweep.py
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from utils.sweep import MedianStoppingRule, Sweep, SweepRun, expand_runs, parse_sweep_spec
+from utils.telemetry import TelemetryBuffer
+
+SPECS = {
+    "num_samples": {"name": "num_samples", "kind": "int", "choices": None},
+    "lr_mult": {"name": "lr_mult", "kind": "float", "choices": None},
+    "use_appearance": {"name": "use_appearance", "kind": "bool", "choices": None},
+    "background": {"name": "background", "kind": "literal", "choices": ["random", "black"]},
+}
+
+
+def test_parse_and_expand_grid():
+    params = parse_sweep_spec(
+        "num_samples = grid(32, 64, 3)\n# comment\nuse_appearance: true, false\nbackground = random, black",
+        SPECS,
+    )
+    assert params[0].values == [32, 48, 64]
+    runs = expand_runs(params)
+    assert len(runs) == 3 * 2 * 2
+    assert runs[0] == {"num_samples": 32, "use_appearance": True, "background": "random"}
+
+
+def test_random_ranges_are_seeded():
+    params = parse_sweep_spec("lr_mult = loguniform(0.001, 0.1)\nnum_samples = 16, 32", SPECS)
+    runs = expand_runs(params, samples=3, seed=1)
+    assert len(runs) == 6
+    assert all(0.001 <= run["lr_mult"] <= 0.1 for run in runs)
+    assert runs == expand_runs(params, samples=3, seed=1)
+
+
+@pytest.mark.parametrize(
+    "spec",
+    ["unknown = 1, 2", "background = white", "use_appearance = uniform(0, 1)", "num_samples = grid(1, 2)", "num_samples"],
+)
+def test_bad_specs_are_rejected(spec):
+    with pytest.raises(ValueError):
+        parse_sweep_spec(spec, SPECS)
+
+
+def test_too_many_runs():
+    with pytest.raises(ValueError):
+        expand_runs(parse_sweep_spec("num_samples = grid(1, 1000, 1000)", SPECS))
+
+
+def test_median_rule():
+    rule = MedianStoppingRule(grace_steps=100, min_runs=3)
+    good = [(0, 1.0), (100, 0.2)]
+    bad = [(0, 1.0), (100, 0.9)]
+    assert rule.should_stop(bad, [good, good])
+    assert not rule.should_stop(good, [bad, good])
+    assert not rule.should_stop(bad, [good])  # not enough peers
+    assert not rule.should_stop([(50, 5.0)], [good, good])  # still in grace
+
+
+def test_median_rule_higher_is_better():
+    rule = MedianStoppingRule("psnr", grace_steps=100, min_runs=3, direction="max")
+    good = [(0, 10.0), (100, 25.0)]
+    bad = [(0, 10.0), (100, 15.0)]
+    assert rule.should_stop(bad, [good, good])
+    assert not rule.should_stop(good, [bad, good])
+    with pytest.raises(ValueError):
+        MedianStoppingRule(direction="up")
+
+
+def test_sweep_ranks_by_train_metric():
+    def run(index, psnrs):
+        telemetry = TelemetryBuffer()
+        for i, psnr in enumerate(psnrs):
+            telemetry.record(i * 100, {"rgb_loss": 1.0}, now=float(i + 1), metrics={"psnr": psnr})
+        supervisor = SimpleNamespace(telemetry=telemetry, status={"step": 100})
+        job = SimpleNamespace(state="running", is_active=lambda: True)
+        return SweepRun(index, {}, supervisor, job)
+
+    rule = MedianStoppingRule("psnr", grace_steps=100, direction="max")
+    sweep = Sweep("s", [run(0, [10, 20]), run(1, [10, 25]), run(2, [10, 12])], rule, "psnr", "max")
+    assert [r.index for r in sweep.poll()] == [2]
+    assert [row[0] for row in sweep.rows()] == [1, 0, 2]
+
+
+def test_sweep_poll_and_rows():
+    def run(index, losses):
+        telemetry = TelemetryBuffer()
+        for i, loss in enumerate(losses):
+            telemetry.record(i * 100, {"rgb_loss": loss}, now=float(i + 1))
+        supervisor = SimpleNamespace(telemetry=telemetry, status={"step": (len(losses) - 1) * 100})
+        job = SimpleNamespace(state="running", is_active=lambda: True)
+        return SweepRun(index, {"lr_mult": 0.1 * index}, supervisor, job)
+
+    sweep = Sweep("s", [run(0, [1, 0.5]), run(1, [1, 0.4]), run(2, [1, 0.9])], MedianStoppingRule(grace_steps=100))
+    assert [r.index for r in sweep.poll()] == [2]
+    assert sweep.poll() == []
+    rows = sweep.rows()
+    assert [row[0] for row in rows] == [1, 0, 2]
+    assert rows[-1][2] == "stopped early"
+
+
+def test_sweep_stops_runs_without_a_browser():
+    def run(index, losses):
+        telemetry = TelemetryBuffer()
+        for i, loss in enumerate(losses):
+            telemetry.record(i * 100, {"rgb_loss": loss}, now=float(i + 1))
+        supervisor = SimpleNamespace(telemetry=telemetry, status={}, stop=lambda: None)
+        job = SimpleNamespace(state="running", is_active=lambda: True)
+        return SweepRun(index, {}, supervisor, job)
+
+    runs = [run(0, [1, 0.5]), run(1, [1, 0.4]), run(2, [1, 0.9])]
+    sweep = Sweep("s", runs, MedianStoppingRule(grace_steps=100))
+    stopped = threading.Event()
+    runs[2].supervisor.stop = stopped.set
+    sweep.start(interval=0.01)
+    try:
+        assert stopped.wait(5)
+        assert runs[2].stopped_early and not runs[0].stopped_early
+    finally:
+        sweep.stop()
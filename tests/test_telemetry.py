@@ -0,0 +1,37 @@
+# tests/test_telemetry.py
+import math
+
+from utils.telemetry import TelemetryBuffer, lttb, process_rss, sampled_train_iteration
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    points = [(i, math.sin(i / 50)) for i in range(30000)]
+    points[12345] = (12345, 10.0)  # a spike averaging would hide
+    sampled = lttb(points, 300)
+    assert len(sampled) == 300
+    assert sampled[0] == points[0] and sampled[-1] == points[-1]
+    assert (12345, 10.0) in sampled
+    assert lttb(points[:10], 300) == points[:10]
+
+
+def test_buffer_rate_eta_and_ring():
+    telemetry = TelemetryBuffer(max_steps=1000, maxlen=3)
+    telemetry.record(0, {"rgb": 1.0}, now=100.0)
+    sample = telemetry.record(50, {"rgb": 0.5}, rss=2**30, now=110.0)
+    assert sample["steps_per_sec"] == 5.0
+    assert sample["eta"] == 190.0
+    for step in (100, 150):
+        telemetry.record(step, {"rgb": 0.1}, now=110.0 + step / 10)
+    assert len(telemetry.samples) == 3
+    assert telemetry.series("losses")["rgb"][0] == (50, 0.5)
+    assert "ETA" in telemetry.summary() and "rgb" in telemetry.summary()
+
+
+def test_sampled_train_iteration_records_losses():
+    telemetry = TelemetryBuffer()
+    metrics = {"psnr": 21.5, "num_samples": [48, 96]}
+    wrapped = sampled_train_iteration(lambda step: (0.5, {"rgb": 0.25}, metrics), telemetry, interval=0)
+    assert wrapped(7) == (0.5, {"rgb": 0.25}, metrics)
+    assert telemetry.latest()["losses"] == {"rgb": 0.25, "loss": 0.5}
+    assert telemetry.latest()["metrics"] == {"psnr": 21.5}
+    assert process_rss() > 0
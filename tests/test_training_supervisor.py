@@ -0,0 +1,22 @@
+# tests/test_training_supervisor.py
+from utils.training_supervisor import TrainingSupervisor
+
+
+class BrokenConfig:
+    """Picklable stand-in for a TrainerConfig whose training crashes right away."""
+
+    data = None
+    prompt = None
+    load_config = None
+    max_num_iterations = 100
+
+
+def test_crash_in_training_process_is_reported():
+    supervisor = TrainingSupervisor(BrokenConfig())
+    code = supervisor.run()
+
+    assert code != 0
+    assert supervisor.status["state"] == "failed"
+    assert "Traceback" in supervisor.status["error"]
+    # the process is gone, commands are refused instead of raising
+    assert not supervisor.send("pause")
@@ -0,0 +1,27 @@
+# tests/test_video_frames.py
+import pytest
+
+from utils.video_frames import Segment, plan_segments, segment_argv
+
+
+def test_segments_tile_the_video_and_share_the_frames():
+    segments = plan_segments(duration=100.0, num_frames=300, segments=8)
+    assert len(segments) == 8
+    assert sum(s.frames for s in segments) == 300
+    assert max(s.frames for s in segments) - min(s.frames for s in segments) <= 1
+    assert segments[0].start == 0
+    for a, b in zip(segments, segments[1:]):
+        assert a.start + a.length == pytest.approx(b.start)
+    assert segments[-1].start + segments[-1].length == pytest.approx(100.0)
+
+
+def test_no_more_segments_than_frames():
+    segments = plan_segments(duration=10.0, num_frames=3, segments=16)
+    assert [s.frames for s in segments] == [1, 1, 1]
+
+
+def test_segment_argv_seeks_before_decoding():
+    argv = segment_argv("in.mp4", Segment(2, 12.5, 6.25, 19), 3.0, "out_%05d.png", threads=2)
+    assert argv.index("-ss") < argv.index("-i")
+    assert argv[argv.index("-frames:v") + 1] == "19"
+    assert argv[-1] == "out_%05d.png"
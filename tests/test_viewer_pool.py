@@ -0,0 +1,74 @@
+# tests/test_viewer_pool.py
+import itertools
+import sys
+import time
+
+import pytest
+
+from utils import viewer_pool
+from utils.job_manager import JobManager
+from utils.viewer_pool import ViewerPool, latest_step
+
+# prints its url like ns-viewer, then serves until it is stopped
+FAKE_VIEWER = "import sys, time; print('http://localhost:' + sys.argv[1], flush=True); time.sleep(60)"
+
+
+class FakeViewerPool(ViewerPool):
+    def viewer_argv(self, config_path, port):
+        return [sys.executable, "-c", FAKE_VIEWER, str(port)]
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = JobManager({"viewer": 4})
+    monkeypatch.setattr(viewer_pool, "get_job_manager", lambda: manager)
+    yield manager
+    for job in manager.jobs.values():
+        manager.cancel(job.job_id)
+
+
+def wait_stopped(job):
+    assert job.wait(10)
+    assert job.state == "cancelled"
+
+
+def test_reuse_and_lru_eviction(manager, make_run):
+    ports = itertools.count(7100)
+    pool = FakeViewerPool(capacity=2, idle_timeout=0, port_factory=lambda: next(ports))
+    a, b, c = (str(make_run(name, steps=(1000,)) / "config.yml") for name in "abc")
+
+    viewer_a, reused = pool.acquire(a)
+    assert not reused
+    assert viewer_a.ready.wait(10)
+    viewer_b, _ = pool.acquire(b)
+
+    again, reused = pool.acquire(a)
+    assert reused and again is viewer_a and again.port == 7100
+
+    # b is the least recently used one now
+    viewer_c, _ = pool.acquire(c)
+    wait_stopped(viewer_b.job)
+    assert [row[0] for row in pool.rows()] == [viewer_c.config_path, viewer_a.config_path]
+
+
+def test_new_checkpoint_replaces_viewer_and_idle_viewers_stop(manager, make_run):
+    ports = itertools.count(7200)
+    pool = FakeViewerPool(capacity=2, idle_timeout=60, port_factory=lambda: next(ports))
+    run_dir = make_run(steps=(1000,))
+    config = str(run_dir / "config.yml")
+    old, _ = pool.acquire(config)
+
+    (run_dir / "nerfstudio_models" / "step-000002000.ckpt").write_bytes(b"")
+    new, reused = pool.acquire(config)
+    assert not reused and new.step == 2000
+    wait_stopped(old.job)
+
+    new.last_used = time.time() - 120
+    pool.sweep()
+    wait_stopped(new.job)
+    assert pool.rows() == []
+
+
+def test_latest_step_reads_the_model_dir_of_the_config(make_run):
+    assert latest_step(str(make_run("a", steps=(3000,), model_dir="ckpts") / "config.yml")) == 3000
+    assert latest_step(str(make_run("b", steps=(500,)) / "config.yml")) == 500
@@ -0,0 +1,205 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.checkpoint_resume import checkpoint_is_intact, checkpoint_path, checkpoint_steps
+from utils.eval_store import EvalStore, get_eval_store
+from utils.job_manager import get_job_manager
+from utils.run_index import get_run_index
+
+EVAL_WORKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "eval_worker.py")
+# seconds between two scans of the run index for new checkpoints
+SCAN_INTERVAL = 30.0
+# a checkpoint younger than this may still be written
+SETTLE_SECONDS = 10.0
+# niceness of the evaluation processes
+EVAL_NICE = 10
+
+
+@dataclass
+class PendingEval:
+    job: object  # Job
+    config: str
+    step: int
+
+
+class CheckpointEvaluator:
+    """
+    Evaluates saved checkpoints in the background and keeps the results in an EvalStore.
+
+    With ``start()`` a thread scans the runs below ``root_dir`` every
+    ``SCAN_INTERVAL`` seconds and queues an evaluation for each intact
+    checkpoint not older than ``max_age`` seconds whose hash has no result yet,
+    the newest first and one per run and scan. A newer checkpoint of a run
+    replaces a queued evaluation of an older one, which nerfstudio deletes
+    anyway unless it keeps every checkpoint. Evaluations run on the "eval"
+    resource class at low CPU priority and (unless ``alongside_training``) only
+    while no training is running or queued.
+    """
+
+    def __init__(
+        self,
+        root_dir: str,
+        store: Optional[EvalStore] = None,
+        max_age: float = 24 * 3600,
+        alongside_training: bool = False,
+        results_dir: Optional[str] = None,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.root_dir = root_dir
+        self.store = store or get_eval_store()
+        self.max_age = max_age
+        self.alongside_training = alongside_training
+        self.results_dir = Path(results_dir) if results_dir else self.store.path.parent / "eval"
+        self.pending: Dict[str, PendingEval] = {}  # checkpoint path → queued or running evaluation
+        self.failed: Dict[str, float] = {}  # checkpoint path → mtime of the version that failed
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="checkpoint-eval", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.scan()
+            except Exception:
+                self.logger.exception("Checkpoint scan failed")
+            self._stop.wait(SCAN_INTERVAL)
+
+    def scan(self) -> List[object]:
+        """Queue evaluations for new checkpoints of the indexed runs. Returns the queued jobs."""
+        index = get_run_index(self.root_dir)
+        index.refresh()
+        jobs = []
+        for run in index.records():
+            model_dir = os.path.join(os.path.dirname(run["config"]), run["model_dir"])
+            for step in checkpoint_steps(model_dir):
+                job = self._maybe_queue(run, step, checkpoint_path(model_dir, step), self.max_age, latest_only=True)
+                if job is not None:
+                    jobs.append(job)
+                    break
+        return jobs
+
+    def evaluate_run(self, config: str) -> List[object]:
+        """Queue evaluations for every checkpoint of the run of ``config`` that has no result, whatever its age."""
+        index = get_run_index(self.root_dir)
+        index.refresh(force=True)
+        jobs = []
+        for run in index.records():
+            if run["config"] != config:
+                continue
+            model_dir = os.path.join(os.path.dirname(run["config"]), run["model_dir"])
+            for step in checkpoint_steps(model_dir):
+                job = self._maybe_queue(run, step, checkpoint_path(model_dir, step), float("inf"))
+                if job is not None:
+                    jobs.append(job)
+        return jobs
+
+    def _maybe_queue(self, run: dict, step: int, path: str, max_age: float, latest_only: bool = False):
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        age = time.time() - mtime
+        if age > max_age or age < SETTLE_SECONDS or self.failed.get(path) == mtime:
+            return None
+        with self._lock:
+            if path in self.pending:
+                return None
+        if not checkpoint_is_intact(path):
+            return None
+        digest = self.store.hash_of(path)
+        if self.store.get(digest) is not None:
+            return None
+        return self._queue(run, step, path, digest, mtime, latest_only)
+
+    def _queue(self, run: dict, step: int, path: str, digest: str, mtime: float, latest_only: bool):
+        job_manager = get_job_manager()
+        with self._lock:
+            if latest_only:
+                for other in self.pending.values():
+                    if other.config == run["config"] and other.step < step and other.job.state == "queued":
+                        job_manager.cancel(other.job.job_id)
+            self.results_dir.mkdir(parents=True, exist_ok=True)
+            output = self.results_dir / f"{digest}.json"
+            job = job_manager.submit(
+                f"eval: {run['experiment'] or run['method']} step {step}",
+                "eval",
+                argv=[
+                    sys.executable,
+                    EVAL_WORKER,
+                    "--load-config",
+                    run["config"],
+                    "--load-step",
+                    str(step),
+                    "--output-path",
+                    str(output),
+                ],
+                priority=-1,
+                nice=EVAL_NICE,
+                yields_to=() if self.alongside_training else ("gpu",),
+            )
+            self.pending[path] = PendingEval(job, run["config"], step)
+        self.logger.info("Evaluation queued", extra={"job_id": job.job_id, "checkpoint": path, "step": step})
+        threading.Thread(
+            target=self._collect,
+            args=(job, run["config"], path, step, digest, output, mtime),
+            name=f"job-{job.job_id}-collect",
+            daemon=True,
+        ).start()
+        return job
+
+    def _collect(self, job, config: str, path: str, step: int, digest: str, output: Path, mtime: float):
+        job.wait()
+        try:
+            if job.state == "done":
+                result = json.loads(output.read_text())
+                self.store.put(digest, config, path, step, result["results"])
+                output.unlink()
+                self.logger.info("Checkpoint evaluated", extra={"checkpoint": path, **result["results"]})
+            elif job.state == "failed":
+                # not retried until the file changes
+                self.failed[path] = mtime
+                self.logger.warning("Evaluation failed", extra={"job_id": job.job_id, "checkpoint": path})
+        except (OSError, ValueError, KeyError):
+            self.failed[path] = mtime
+            self.logger.warning("Evaluation left no results", extra={"job_id": job.job_id, "checkpoint": path})
+        finally:
+            with self._lock:
+                self.pending.pop(path, None)
+
+    def pending_rows(self, config: str) -> List[list]:
+        """Queued and running evaluations of one run."""
+        with self._lock:
+            pending = sorted((p for p in self.pending.values() if p.config == config), key=lambda p: p.step)
+        return [[p.step, p.job.state, p.job.job_id] for p in pending]
+
+
+_evaluator: Optional[CheckpointEvaluator] = None
+
+
+def configure_checkpoint_evaluator(root_dir: str, **kwargs) -> CheckpointEvaluator:
+    """Create the process-wide evaluator; see CheckpointEvaluator for the arguments."""
+    global _evaluator
+    _evaluator = CheckpointEvaluator(root_dir, **kwargs)
+    return _evaluator
+
+
+def get_checkpoint_evaluator(root_dir: str = "./") -> CheckpointEvaluator:
+    global _evaluator
+    if _evaluator is None:
+        _evaluator = CheckpointEvaluator(root_dir)
+    return _evaluator
@@ -0,0 +1,167 @@
+import math
+import os
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import yaml
+
+from utils.run_index import CHECKPOINT_NAME, load_run_config
+
+
+@dataclass
+class ResumePoint:
+    """Where an interrupted run continues: its output location and the checkpoint to load."""
+
+    config_path: str
+    load_dir: str
+    load_step: int
+    output_dir: str
+    experiment_name: str
+    timestamp: str
+
+
+def final_step(max_num_iterations: int, load_dir=None, load_step: Optional[int] = None) -> int:
+    """
+    Step a run ends at. nerfstudio trains ``max_num_iterations`` steps after
+    the loaded one, so a resumed run counts from ``load_step + 1``.
+    """
+    if load_dir and load_step is not None:
+        return int(load_step) + 1 + int(max_num_iterations)
+    return int(max_num_iterations)
+
+
+def config_final_step(config) -> int:
+    """``final_step`` of a TrainerConfig."""
+    return final_step(config.max_num_iterations, getattr(config, "load_dir", None), getattr(config, "load_step", None))
+
+
+def checkpoint_steps(model_dir: str) -> List[int]:
+    """Steps of the ``step-*.ckpt`` files in ``model_dir``, latest first."""
+    try:
+        names = os.listdir(model_dir)
+    except OSError:
+        return []
+    return sorted((int(m.group(1)) for m in map(CHECKPOINT_NAME.match, names) if m), reverse=True)
+
+
+def checkpoint_path(model_dir: str, step: int) -> str:
+    return os.path.join(model_dir, f"step-{step:09d}.ckpt")
+
+
+def checkpoint_is_intact(path: str) -> bool:
+    """
+    Quick integrity check of a torch checkpoint without loading it.
+
+    ``torch.save`` writes a zip archive whose directory is at the end of the
+    file, so a checkpoint cut short by a crash or a full disk has no readable
+    directory. The archive must also hold the pickle and every member must lie
+    within the file. Member CRCs are not checked, that would read the whole file.
+    """
+    try:
+        size = os.path.getsize(path)
+        with zipfile.ZipFile(path) as archive:
+            members = archive.infolist()
+    except (OSError, zipfile.BadZipFile):
+        return False
+    if not any(m.filename.endswith("data.pkl") for m in members):
+        return False
+    return all(m.header_offset + m.compress_size <= size for m in members)
+
+
+def _lookup(config: dict, path: str):
+    node = config
+    for name in path.split("."):
+        if not isinstance(node, dict) or name not in node:
+            raise KeyError(path)
+        node = node[name]
+    return node
+
+
+def _same(a, b) -> bool:
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    if isinstance(a, bool) or isinstance(b, bool):
+        return a is b or str(a).lower() == str(b).lower()
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12)
+    return str(a) == str(b)
+
+
+def config_matches(saved: dict, expected: Dict[str, Any]) -> bool:
+    """Whether a saved config (see ``load_run_config``) has the ``expected`` dotted-path values."""
+    for path, value in expected.items():
+        try:
+            if not _same(_lookup(saved, path), value):
+                return False
+        except KeyError:
+            # a field the run does not have: trained with another version or method
+            return False
+    return True
+
+
+def _same_path(a: str, b: str) -> bool:
+    return bool(a) and bool(b) and os.path.realpath(a) == os.path.realpath(b)
+
+
+def resume_point_of(run: dict, target_step: int) -> Optional[ResumePoint]:
+    """
+    Latest intact checkpoint of an indexed run (see ``RunIndex.records``), or
+    None if it has none or already reached ``target_step``.
+    """
+    run_dir = os.path.dirname(run["config"])
+    model_dir = os.path.join(run_dir, run["model_dir"])
+    for step in checkpoint_steps(model_dir):
+        # nerfstudio saves the last step as target_step - 1
+        if step >= target_step - 1:
+            return None
+        if checkpoint_is_intact(checkpoint_path(model_dir, step)):
+            # <output_dir>/<experiment_name>/<method_name>/<timestamp>/config.yml
+            method_dir = os.path.dirname(run_dir)
+            experiment_dir = os.path.dirname(method_dir)
+            return ResumePoint(
+                config_path=run["config"],
+                load_dir=model_dir,
+                load_step=step,
+                output_dir=os.path.dirname(experiment_dir),
+                experiment_name=os.path.basename(experiment_dir),
+                timestamp=os.path.basename(run_dir),
+            )
+    return None
+
+
+def find_resume_point(
+    runs: Iterable[dict], method: str, data_path: str, expected: Dict[str, Any], target_step: int
+) -> Optional[ResumePoint]:
+    """
+    The resume point of the newest interrupted run of ``method`` on
+    ``data_path`` whose config has the ``expected`` values. ``runs`` are
+    run index records, newest first.
+    """
+    for run in runs:
+        if run["method"] != method or not _same_path(run["dataset"], data_path):
+            continue
+        try:
+            with open(run["config"]) as f:
+                saved = load_run_config(f.read())
+        except (OSError, yaml.YAMLError):
+            continue
+        if not config_matches(saved, expected):
+            continue
+        point = resume_point_of(run, target_step)
+        if point is not None:
+            return point
+    return None
+
+
+def resume_overrides(point: ResumePoint, target_step: int) -> Dict[str, Any]:
+    """Config overrides that continue ``point`` in its own run directory up to ``target_step``."""
+    return {
+        "output_dir": Path(point.output_dir),
+        "experiment_name": point.experiment_name,
+        "timestamp": point.timestamp,
+        "load_dir": Path(point.load_dir),
+        "load_step": point.load_step,
+        "max_num_iterations": max(target_step - point.load_step - 1, 0),
+    }
@@ -0,0 +1,306 @@
+import importlib.metadata
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.hashing import file_hash, new_digest
+from utils.job_manager import available_cores
+
+DATASET_CACHE_DIR = Path(
+    os.getenv("WEBUI_DATASET_CACHE", Path.home() / ".cache" / "nerfstudio-webui" / "datasets")
+)
+MANIFEST_NAME = "manifest.json"
+# processor args that do not change the processed dataset
+OUTPUT_NEUTRAL_ARGS = {"verbose"}
+# only the image folders are hardlinked between outputs and entries: ns-process-data deletes them before
+# writing them again, while COLMAP models, sparse_pc.ply and transforms.json are rewritten in place,
+# which would change every link
+LINKED_DIR_PREFIX = "images"
+
+def _list_files(path: Path) -> List[Tuple[str, Path]]:
+    """(relative path, path) of the regular files of ``path``, a file or a directory, sorted."""
+    if path.is_file():
+        return [(path.name, path)]
+    files = []
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        for name in filenames:
+            file = Path(dirpath) / name
+            if file.is_file():
+                files.append((file.relative_to(path).as_posix(), file))
+    return sorted(files)
+
+
+def fingerprint_inputs(data_path: str, fast: bool = False, workers: Optional[int] = None) -> str:
+    """
+    Hash of the files of ``data_path`` (a capture folder or a video).
+
+    The files are hashed in parallel (xxh3-128 when xxhash is installed). With
+    ``fast`` only their names, sizes and mtimes are hashed.
+    """
+    files = _list_files(Path(data_path))
+    if fast:
+        parts = [f"{name}\0{file.stat().st_size}\0{file.stat().st_mtime_ns}" for name, file in files]
+    else:
+        workers = workers or min(32, available_cores() * 2)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dataset-hash") as pool:
+            hashes = pool.map(file_hash, [file for _, file in files])
+            parts = [f"{name}\0{digest}" for (name, _), digest in zip(files, hashes)]
+    digest = new_digest()
+    digest.update(("fast\n" if fast else "content\n").encode())
+    for part in parts:
+        digest.update(part.encode() + b"\n")
+    return digest.hexdigest()
+
+
+def normalize_args(args: Dict[str, object], specs: Dict[str, dict]) -> Dict[str, object]:
+    """
+    Processor args reduced to what changes the output: args at their default
+    and output-neutral ones are dropped, numbers and sequences get one form.
+    """
+    normalized = {}
+    for name, value in args.items():
+        if name in OUTPUT_NEUTRAL_ARGS:
+            continue
+        spec = specs.get(name, {})
+        if isinstance(value, (list, tuple)):
+            value = [_normalize_value(v) for v in value]
+        else:
+            value = _normalize_value(value)
+        default = spec.get("default")
+        if isinstance(default, (list, tuple)):
+            default = [_normalize_value(v) for v in default]
+        elif default is not None:
+            default = _normalize_value(default)
+        if value == default:
+            continue
+        normalized[name] = value
+    return dict(sorted(normalized.items()))
+
+
+def _normalize_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, Path):
+        return str(value)
+    return value
+
+
+def job_key(subcommand: str, args: Dict[str, object], input_hash: str, version: str = "") -> str:
+    """Cache key of one ns-process-data job."""
+    payload = json.dumps(
+        {"subcommand": subcommand, "args": args, "inputs": input_hash, "version": version},
+        sort_keys=True,
+        default=str,
+    )
+    digest = new_digest()
+    digest.update(payload.encode())
+    return digest.hexdigest()
+
+
+def processor_version() -> str:
+    """Installed nerfstudio version, part of the key so an upgrade does not reuse old outputs."""
+    try:
+        return importlib.metadata.version("nerfstudio")
+    except importlib.metadata.PackageNotFoundError:
+        return ""
+
+
+def _linkable(name: str) -> bool:
+    """Whether the output file ``name`` (relative, posix) may be shared by a hardlink."""
+    return "/" in name and name.split("/", 1)[0].startswith(LINKED_DIR_PREFIX)
+
+
+def _materialize_file(src: Path, dst: Path, link: bool):
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+    if link:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:  # other file system, or no hardlinks there
+            pass
+    _copy_file(src, dst)
+
+
+def _copy_file(src: Path, dst: Path):
+    """Copy ``src``, with copy_file_range where possible (reflinks on btrfs / XFS)."""
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+class DatasetCache:
+    """
+    Content-addressed cache of processed datasets.
+
+    Every entry is a directory named after the job key (see ``job_key``) with
+    the processed dataset in ``data/`` and a ``manifest.json`` describing the
+    job. Entries are added once a job has finished and materialized into an
+    output directory by hardlinking the image folders and copying the rest
+    (a reflink where the file system supports it), so rewriting the output
+    in place never changes an entry. The
+    least recently used entries are removed while the cache is larger than
+    ``max_bytes``. With ``fast`` inputs are fingerprinted by file size and
+    mtime instead of content.
+    """
+
+    def __init__(self, path: Path = DATASET_CACHE_DIR, max_bytes: int = 20 * 2**30, fast: bool = False):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.fast = fast
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def key_of(self, subcommand: str, data_path: str, args: Dict[str, object]) -> str:
+        """Key of processing ``data_path`` with ``subcommand`` and the normalized ``args``."""
+        start = time.perf_counter()
+        input_hash = fingerprint_inputs(data_path, fast=self.fast)
+        self.logger.debug(
+            "Inputs fingerprinted",
+            extra={"data_path": data_path, "fast": self.fast, "seconds": round(time.perf_counter() - start, 3)},
+        )
+        return job_key(subcommand, args, input_hash, processor_version())
+
+    def _entry(self, key: str) -> Path:
+        return self.path / key
+
+    def manifest(self, key: str) -> Optional[dict]:
+        try:
+            return json.loads((self._entry(key) / MANIFEST_NAME).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, entry: Path, manifest: dict):
+        tmp = entry / f"{MANIFEST_NAME}.tmp"
+        tmp.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp, entry / MANIFEST_NAME)
+
+    def materialize(self, key: str, output_dir: str) -> Optional[dict]:
+        """Fill ``output_dir`` from the entry of ``key``. Returns its manifest, None on a miss."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            manifest = self.manifest(key)
+            if manifest is None:
+                return None
+            manifest["last_used"] = time.time()
+            self._write_manifest(self._entry(key), manifest)
+        data = self._entry(key) / "data"
+        output = Path(output_dir)
+        try:
+            for name, file in _list_files(data):
+                _materialize_file(file, output / name, link=_linkable(name))
+        except OSError:
+            # an entry evicted or damaged meanwhile is a miss, the job runs as usual
+            self.logger.warning("Could not materialize cached dataset", extra={"key": key, "output": output_dir})
+            return None
+        self.logger.info("Cached dataset reused", extra={"key": key, "output": output_dir, "files": manifest["files"]})
+        return manifest
+
+    def store(self, key: str, output_dir: str, manifest: dict) -> bool:
+        """Add the processed dataset in ``output_dir`` as the entry of ``key``."""
+        if not self.enabled or self.manifest(key) is not None:
+            return False
+        files = _list_files(Path(output_dir))
+        if not files:
+            return False
+        tmp = self.path / f".{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            for name, file in files:
+                _materialize_file(file, tmp / "data" / name, link=_linkable(name))
+            now = time.time()
+            manifest = dict(
+                manifest,
+                key=key,
+                files=len(files),
+                size=sum(file.stat().st_size for _, file in files),
+                created=now,
+                last_used=now,
+            )
+            self._write_manifest(tmp, manifest)
+            with self._lock:
+                os.rename(tmp, self._entry(key))
+        except OSError:
+            # another job stored the same key first, or the disk is full
+            shutil.rmtree(tmp, ignore_errors=True)
+            return False
+        self.logger.info("Dataset cached", extra={"key": key, "files": manifest["files"], "bytes": manifest["size"]})
+        self.evict()
+        return True
+
+    def store_when_done(self, job, key: str, output_dir: str, manifest: dict):
+        """Store the output of ``job`` once it has finished successfully, from a background thread."""
+
+        def _wait_and_store():
+            job.wait()
+            if job.state == "done":
+                self.store(key, output_dir, manifest)
+
+        threading.Thread(target=_wait_and_store, name=f"job-{job.job_id}-cache", daemon=True).start()
+
+    def entries(self) -> List[dict]:
+        """Manifests of every entry, least recently used first."""
+        manifests = []
+        if self.path.is_dir():
+            for entry in self.path.iterdir():
+                if entry.name.startswith("."):
+                    continue
+                manifest = self.manifest(entry.name)
+                if manifest is not None:
+                    manifests.append(manifest)
+        return sorted(manifests, key=lambda m: m["last_used"])
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in ``max_bytes``."""
+        with self._lock:
+            entries = self.entries()
+            total = sum(m["size"] for m in entries)
+            for manifest in entries:
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(self._entry(manifest["key"]), ignore_errors=True)
+                total -= manifest["size"]
+                self.logger.info("Cached dataset evicted", extra={"key": manifest["key"], "bytes": manifest["size"]})
+
+
+_dataset_cache: Optional[DatasetCache] = None
+
+
+def configure_dataset_cache(
+    path: Optional[str] = None, max_bytes: int = 20 * 2**30, fast: bool = False
+) -> DatasetCache:
+    """Create the process-wide dataset cache; ``max_bytes`` 0 disables it."""
+    global _dataset_cache
+    _dataset_cache = DatasetCache(Path(path) if path else DATASET_CACHE_DIR, max_bytes, fast)
+    return _dataset_cache
+
+
+def get_dataset_cache() -> DatasetCache:
+    global _dataset_cache
+    if _dataset_cache is None:
+        _dataset_cache = DatasetCache()
+    return _dataset_cache
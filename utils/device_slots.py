@@ -0,0 +1,76 @@
+import os
+import subprocess
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional
+
+
+@dataclass(frozen=True)
+class DeviceSlot:
+    """
+    The devices one job may use: environment variables for its process
+    (e.g. ``CUDA_VISIBLE_DEVICES``) and/or the CPU cores it is pinned to.
+    """
+
+    name: str
+    env: Dict[str, str] = field(default_factory=dict, hash=False)
+    cpus: Optional[FrozenSet[int]] = None
+
+    def apply(self):
+        """Pin the calling process to this slot. Call it in the child, before CUDA is initialised."""
+        os.environ.update(self.env)
+        if self.cpus and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, self.cpus)
+
+
+def detect_cuda_devices() -> List[str]:
+    """CUDA device IDs visible to the WebUI, without importing torch."""
+    visible = os.environ.get("CUDA_VISIBLE_DEVICES")
+    if visible is not None:
+        return [d.strip() for d in visible.split(",") if d.strip()]
+    try:
+        out = subprocess.run(["nvidia-smi", "-L"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return []
+    return [str(i) for i, line in enumerate(out.splitlines()) if line.startswith("GPU ")]
+
+
+def build_device_slots(
+    device_type: str,
+    devices_per_run: int = 1,
+    devices: Optional[List[str]] = None,
+    num_slots: int = 0,
+) -> List[DeviceSlot]:
+    """
+    Split the node into slots for concurrent training runs.
+
+    For ``cuda`` every slot gets ``devices_per_run`` of ``devices`` (detected
+    when not given) through ``CUDA_VISIBLE_DEVICES``; leftover devices are not
+    used. For other device types the available cores are split into
+    ``num_slots`` (default 1) disjoint affinity sets.
+    """
+    if device_type == "cuda":
+        devices = detect_cuda_devices() if devices is None else devices
+        devices_per_run = max(1, devices_per_run)
+        count = len(devices) // devices_per_run
+        if num_slots:
+            count = min(count, num_slots)
+        slots = []
+        for i in range(count):
+            ids = ",".join(devices[i * devices_per_run : (i + 1) * devices_per_run])
+            slots.append(DeviceSlot(name=f"cuda:{ids}", env={"CUDA_VISIBLE_DEVICES": ids}))
+        # no GPU found: still allow one run, nerfstudio reports the problem
+        return slots or [DeviceSlot(name="cuda")]
+
+    try:
+        cores = sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return [DeviceSlot(name=device_type)] * max(1, num_slots)
+    num_slots = max(1, min(num_slots or 1, len(cores)))
+    size = len(cores) // num_slots
+    return [
+        DeviceSlot(
+            name=f"{device_type}:{cores[i * size]}-{cores[(i + 1) * size - 1]}",
+            cpus=frozenset(cores[i * size : (i + 1) * size]),
+        )
+        for i in range(num_slots)
+    ]
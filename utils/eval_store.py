@@ -0,0 +1,110 @@
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.hashing import file_hash
+
+EVAL_STORE_PATH = Path(
+    os.getenv("WEBUI_EVAL_STORE", Path.home() / ".cache" / "nerfstudio-webui" / "eval_results.json")
+)
+EVAL_METRICS = ("psnr", "ssim", "lpips")
+EVAL_COLUMNS = ["Step", "PSNR", "SSIM", "LPIPS", "FPS", "Evaluated", "Checkpoint"]
+
+
+class EvalStore:
+    """
+    On-disk store of checkpoint evaluation results, keyed by checkpoint content hash.
+
+    A checkpoint that was evaluated once is never evaluated again, even if it
+    was copied or its run moved. The hashes of checkpoint files are memoized by
+    path, size and mtime, so only new or changed files are read.
+    """
+
+    def __init__(self, path: Path = EVAL_STORE_PATH):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.path = Path(path)
+        self.results: Dict[str, dict] = {}  # checkpoint hash → result
+        self.hashes: Dict[str, dict] = {}  # checkpoint path → {"size", "mtime", "hash"}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        self.results = data.get("results", {})
+        self.hashes = data.get("hashes", {})
+
+    def save(self):
+        with self._lock:
+            payload = json.dumps({"results": self.results, "hashes": self.hashes})
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(payload)
+            os.replace(tmp, self.path)
+        except OSError:
+            self.logger.warning("Could not write evaluation results", extra={"path": str(self.path)})
+
+    def hash_of(self, path: str) -> str:
+        st = os.stat(path)
+        with self._lock:
+            memo = self.hashes.get(path)
+            if memo is not None and memo["size"] == st.st_size and memo["mtime"] == st.st_mtime_ns:
+                return memo["hash"]
+        digest = file_hash(path)
+        with self._lock:
+            self.hashes[path] = {"size": st.st_size, "mtime": st.st_mtime_ns, "hash": digest}
+        return digest
+
+    def get(self, digest: str) -> Optional[dict]:
+        with self._lock:
+            return self.results.get(digest)
+
+    def put(self, digest: str, config: str, checkpoint: str, step: int, metrics: dict):
+        with self._lock:
+            self.results[digest] = {
+                "config": config,
+                "checkpoint": checkpoint,
+                "step": step,
+                "metrics": metrics,
+                "evaluated_at": time.time(),
+            }
+        self.save()
+
+    def rows(self, config: str) -> List[list]:
+        """The results of one run (by its config path) in EVAL_COLUMNS order, by step."""
+        with self._lock:
+            results = sorted((r for r in self.results.values() if r["config"] == config), key=lambda r: r["step"])
+        rows = []
+        for result in results:
+            metrics = result["metrics"]
+            rows.append(
+                [result["step"]]
+                + [_round(metrics.get(name)) for name in EVAL_METRICS]
+                + [
+                    _round(metrics.get("fps")),
+                    time.strftime("%Y-%m-%d %H:%M", time.localtime(result["evaluated_at"])),
+                    os.path.basename(result["checkpoint"]),
+                ]
+            )
+        return rows
+
+
+def _round(value) -> str:
+    return "" if value is None else f"{value:.4f}"
+
+
+_eval_store: Optional[EvalStore] = None
+
+
+def get_eval_store() -> EvalStore:
+    global _eval_store
+    if _eval_store is None:
+        _eval_store = EvalStore()
+    return _eval_store
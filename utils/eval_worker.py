@@ -0,0 +1,53 @@
+"""
+Evaluate one checkpoint of a run, like ns-eval but for a given step:
+
+    python utils/eval_worker.py --load-config outputs/.../config.yml --load-step 29999 --output-path out.json
+
+Started by the CheckpointEvaluator as a low-priority background job.
+"""
+import argparse
+import json
+from pathlib import Path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate one checkpoint of a nerfstudio run")
+    parser.add_argument("--load-config", type=Path, required=True)
+    parser.add_argument("--load-step", type=int, required=True)
+    parser.add_argument("--output-path", type=Path, required=True)
+    args = parser.parse_args()
+
+    from nerfstudio.utils.eval_utils import eval_setup
+
+    # <output_dir>/<experiment_name>/<method_name>/<timestamp>/config.yml
+    run_dir = args.load_config.resolve().parent
+
+    def update_config(config):
+        # find the checkpoints next to the config, wherever the run was trained from
+        config.output_dir = run_dir.parents[2]
+        config.experiment_name = run_dir.parents[1].name
+        config.timestamp = run_dir.name
+        config.load_step = args.load_step
+        return config
+
+    config, pipeline, checkpoint_path, step = eval_setup(args.load_config, update_config_callback=update_config)
+    print(f"Evaluating {checkpoint_path}")
+    metrics = pipeline.get_average_eval_image_metrics(output_path=None, get_std=True)
+    args.output_path.parent.mkdir(parents=True, exist_ok=True)
+    args.output_path.write_text(
+        json.dumps(
+            {
+                "experiment_name": config.experiment_name,
+                "method_name": config.method_name,
+                "checkpoint": str(checkpoint_path),
+                "step": step,
+                "results": metrics,
+            },
+            indent=2,
+        )
+    )
+    print(f"Saved results to {args.output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Drop blurry and near-duplicate frames of a capture before COLMAP sees them,
+then run a command on the kept frames:
+
+    python utils/frame_culling.py --data captures/garden --staging data/garden/culled_frames \
+        -- ns-process-data images --data data/garden/culled_frames --output_dir data/garden
+
+Every frame is scored in a process pool: the variance of the Laplacian of a
+downscaled grayscale copy (sharpness) and a 64-bit difference hash. Frames
+much less sharp than the median are dropped; of frames whose hashes differ in
+at most ``--max-distance`` bits only the sharpest is kept. Kept frames are
+hardlinked into the staging folder, or without ``--staging`` the dropped ones
+are deleted in place (for extracted video frames). Needs NumPy and Pillow.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from utils.incremental_processing import IMAGE_EXTENSIONS
+except ImportError:  # run as a script, with utils/ as the first entry of sys.path
+    from incremental_processing import IMAGE_EXTENSIONS
+
+# longer side of the grayscale copy that is scored
+SCORE_SIZE = 512
+# frames sharper than this fraction of the median sharpness are kept
+BLUR_RATIO = 0.3
+# hashes differing in at most this many of 64 bits are near-duplicates
+MAX_HASH_DISTANCE = 4
+
+
+@dataclass
+class FrameScore:
+    path: Path
+    sharpness: float
+    phash: int
+
+
+def load_gray(path: Path, size: int = SCORE_SIZE) -> np.ndarray:
+    from PIL import Image
+
+    with Image.open(path) as img:
+        # JPEGs are decoded at a reduced scale directly
+        img.draft("L", (size, size))
+        img = img.convert("L")
+        img.thumbnail((size, size))
+        return np.asarray(img, dtype=np.float32)
+
+
+def laplacian_variance(gray: np.ndarray) -> float:
+    """Variance of the 4-neighbour Laplacian: low for blurry images."""
+    lap = (
+        gray[:-2, 1:-1] + gray[2:, 1:-1] + gray[1:-1, :-2] + gray[1:-1, 2:] - 4.0 * gray[1:-1, 1:-1]
+    )
+    return float(lap.var())
+
+
+def difference_hash(gray: np.ndarray) -> int:
+    """64-bit dHash: whether each pixel of a 9x8 thumbnail is brighter than its right neighbour."""
+    h, w = gray.shape
+    rows = (np.arange(8) * h) // 8
+    cols = (np.arange(9) * w) // 9
+    # mean over the cells of an 8x9 grid, cheaper than a second resize
+    cells = np.add.reduceat(np.add.reduceat(gray, rows, axis=0), cols, axis=1)
+    cells /= np.outer(np.diff(np.append(rows, h)), np.diff(np.append(cols, w)))
+    bits = (cells[:, 1:] > cells[:, :-1]).flatten()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def score_frame(path: Path) -> FrameScore:
+    gray = load_gray(path)
+    return FrameScore(path, laplacian_variance(gray), difference_hash(gray))
+
+
+def score_frames(paths: List[Path], workers: Optional[int] = None) -> List[FrameScore]:
+    if workers == 1:
+        return [score_frame(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(score_frame, paths, chunksize=8))
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    return np.unpackbits(values.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+def select_frames(
+    scores: List[FrameScore], blur_ratio: float = BLUR_RATIO, max_distance: int = MAX_HASH_DISTANCE
+) -> Tuple[List[FrameScore], List[FrameScore]]:
+    """(kept, dropped) frames, both in input order."""
+    if not scores:
+        return [], []
+    threshold = blur_ratio * float(np.median([s.sharpness for s in scores]))
+    kept: List[FrameScore] = []
+    hashes = np.zeros(len(scores), dtype=np.uint64)
+    dropped = []
+    for score in scores:
+        if score.sharpness < threshold:
+            dropped.append(score)
+            continue
+        if kept and max_distance >= 0:
+            distances = _popcount(hashes[: len(kept)] ^ np.uint64(score.phash))
+            match = int(distances.argmin())
+            if distances[match] <= max_distance:
+                # keep the sharper one of the two near-duplicates
+                if score.sharpness > kept[match].sharpness:
+                    dropped.append(kept[match])
+                    kept[match] = score
+                    hashes[match] = score.phash
+                else:
+                    dropped.append(score)
+                continue
+        hashes[len(kept)] = score.phash
+        kept.append(score)
+    order = {score.path: i for i, score in enumerate(scores)}
+    kept.sort(key=lambda s: order[s.path])
+    dropped.sort(key=lambda s: order[s.path])
+    return kept, dropped
+
+
+def list_frames(data: Path) -> List[Path]:
+    return sorted(p for p in data.glob("[!.]*") if p.suffix.lower() in IMAGE_EXTENSIONS)
+
+
+def _link_or_copy(src: Path, dst: Path):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drop blurry and near-duplicate frames, then run a command on the rest")
+    parser.add_argument("--data", type=Path, required=True, help="folder of frames")
+    parser.add_argument("--staging", type=Path, default=None, help="folder the kept frames are linked into")
+    parser.add_argument("--blur-ratio", type=float, default=BLUR_RATIO)
+    parser.add_argument("--max-distance", type=int, default=MAX_HASH_DISTANCE)
+    parser.add_argument("--workers", type=int, default=0, help="scoring processes (default: cores)")
+    parser.add_argument("--cleanup", action="store_true", help="remove the staging folder after the command succeeded")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="command run on the kept frames, after --")
+    args = parser.parse_args()
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+
+    start = time.time()
+    frames = list_frames(args.data)
+    kept, dropped = select_frames(score_frames(frames, args.workers or None), args.blur_ratio, args.max_distance)
+    if args.staging is not None:
+        if args.staging.exists():
+            shutil.rmtree(args.staging)
+        args.staging.mkdir(parents=True)
+        for score in kept:
+            _link_or_copy(score.path, args.staging / score.path.name)
+    else:
+        for score in dropped:
+            score.path.unlink()
+    print(
+        f"Kept {len(kept)} of {len(frames)} frames, dropped {len(dropped)} blurry or near-duplicate "
+        f"ones in {time.time() - start:.1f}s",
+        flush=True,
+    )
+    if not command:
+        return
+    returncode = subprocess.run(command).returncode
+    if returncode == 0 and args.cleanup and args.staging is not None:
+        shutil.rmtree(args.staging, ignore_errors=True)
+    sys.exit(returncode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import hashlib
+
+try:
+    import xxhash
+except ImportError:  # optional, hashing falls back to blake2b
+    xxhash = None
+
+_CHUNK = 8 * 2**20
+
+
+def new_digest():
+    """A 128 bit hash object: xxh3-128 when xxhash is installed, blake2b otherwise."""
+    return xxhash.xxh3_128() if xxhash is not None else hashlib.blake2b(digest_size=16)
+
+
+def file_hash(path) -> str:
+    """Content hash of the file at ``path``, see ``new_digest``."""
+    digest = new_digest()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
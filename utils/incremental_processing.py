@@ -0,0 +1,273 @@
+"""
+Add the new images of a capture to a dataset processed by ns-process-data images:
+
+    python utils/incremental_processing.py --data captures/garden --output-dir data/garden
+
+Only the new images are copied, feature-extracted, matched (against the
+images of the model) and registered into the existing COLMAP model with
+the model's camera, then transforms.json is rewritten from it. Which inputs
+are new is read from the manifest written next to transforms.json after
+every processing run of the WebUI. Needs COLMAP, Pillow and nerfstudio.
+"""
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+MANIFEST_NAME = "webui_inputs.json"
+# ALLOWED_IMAGE_EXTS of nerfstudio.process_data.process_data_utils
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".tif", ".tiff"}
+# camera_type of ns-process-data → COLMAP camera model
+COLMAP_CAMERA_MODELS = {"perspective": "OPENCV", "fisheye": "OPENCV_FISHEYE"}
+# frames before and after a new frame it is matched with in sequential mode
+SEQUENTIAL_OVERLAP = 10
+
+
+def list_inputs(data: Path) -> List[Path]:
+    """The images ns-process-data takes from ``data``, in the order it numbers them."""
+    return sorted(p for p in data.glob("[!.]*") if p.suffix.lower() in IMAGE_EXTENSIONS)
+
+
+def _stat(path: Path) -> dict:
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def read_manifest(output_dir: Path) -> Optional[dict]:
+    try:
+        return json.loads((output_dir / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def write_manifest(data: Path, output_dir: Path, frames: Dict[str, dict]):
+    tmp = output_dir / f"{MANIFEST_NAME}.tmp"
+    tmp.write_text(json.dumps({"data": str(data), "frames": frames}, indent=2))
+    os.replace(tmp, output_dir / MANIFEST_NAME)
+
+
+def record_full_run(data: Path, output_dir: Path) -> bool:
+    """
+    Write the manifest of a full ns-process-data images run, which numbers the
+    sorted inputs frame_00001, frame_00002, ... Returns False if the output
+    does not look like that (e.g. a run with other options).
+    """
+    frames = {}
+    for idx, path in enumerate(list_inputs(data)):
+        frame = f"frame_{idx + 1:05d}{path.suffix}"
+        if not (output_dir / "images" / frame).exists():
+            return False
+        frames[path.name] = dict(_stat(path), frame=frame)
+    if not frames:
+        return False
+    write_manifest(data, output_dir, frames)
+    return True
+
+
+def record_when_done(job, data: str, output_dir: str):
+    """Write the manifest once ``job`` (a full run) has finished successfully, from a background thread."""
+
+    def _wait_and_record():
+        job.wait()
+        if job.state == "done":
+            record_full_run(Path(data), Path(output_dir))
+
+    threading.Thread(target=_wait_and_record, name=f"job-{job.job_id}-manifest", daemon=True).start()
+
+
+@dataclass
+class Increment:
+    """Inputs to add to a processed dataset, or why a full run is needed instead."""
+
+    new: List[Tuple[Path, str]] = field(default_factory=list)  # (input, frame name)
+    reason: str = ""  # set when the dataset cannot be updated incrementally
+
+    @property
+    def possible(self) -> bool:
+        return not self.reason
+
+
+def plan_increment(data: Path, output_dir: Path) -> Increment:
+    manifest = read_manifest(output_dir)
+    if manifest is None:
+        return Increment(reason="the output was not processed by the WebUI before")
+    if not (output_dir / "colmap" / "sparse" / "0").is_dir() or not (output_dir / "colmap" / "database.db").exists():
+        return Increment(reason="the output has no COLMAP model")
+    frames = manifest["frames"]
+    inputs = {path.name: path for path in list_inputs(data)}
+    for name, frame in frames.items():
+        if name not in inputs:
+            return Increment(reason=f"{name} was removed from the capture")
+        if _stat(inputs[name]) != {"size": frame["size"], "mtime_ns": frame["mtime_ns"]}:
+            return Increment(reason=f"{name} was changed")
+    next_idx = 1 + max((int(Path(f["frame"]).stem.split("_")[-1]) for f in frames.values()), default=0)
+    new = []
+    for name in sorted(set(inputs) - set(frames)):
+        new.append((inputs[name], f"frame_{next_idx:05d}{inputs[name].suffix}"))
+        next_idx += 1
+    return Increment(new=new)
+
+
+def match_pairs(existing: List[str], new: List[str], matching_method: str) -> List[Tuple[str, str]]:
+    """
+    Image pairs to match for the new frames: every new frame with every
+    other frame, or in sequential mode with its SEQUENTIAL_OVERLAP neighbours
+    in frame order. The number of pairs grows with the new frames only.
+    """
+    new_set = set(new)
+    pairs = set()
+    if matching_method == "sequential":
+        ordered = sorted(existing + new)
+        for i, name in enumerate(ordered):
+            if name not in new_set:
+                continue
+            for other in ordered[max(0, i - SEQUENTIAL_OVERLAP) : i + SEQUENTIAL_OVERLAP + 1]:
+                if other != name:
+                    pairs.add(tuple(sorted((name, other))))
+    else:
+        for name in new:
+            for other in existing + new:
+                if other != name:
+                    pairs.add(tuple(sorted((name, other))))
+    return sorted(pairs)
+
+
+def _downscale(image: Path, output_dir: Path):
+    """Add ``image`` to the images_<factor> folders of the dataset, like ns-process-data."""
+    from PIL import Image
+
+    for folder in sorted(output_dir.glob("images_*")):
+        factor = int(folder.name.split("_")[1]) if folder.name.split("_")[1].isdigit() else 0
+        if factor < 2:
+            continue
+        with Image.open(image) as img:
+            img.resize((img.width // factor, img.height // factor), Image.LANCZOS).save(folder / image.name)
+
+
+def _unshare(output_dir: Path):
+    """
+    Give the files that are rewritten below (COLMAP database and model,
+    transforms.json, point cloud) their own copy if they are hardlinked, e.g.
+    from the dataset cache, so the other links keep their content.
+    """
+    for path in output_dir.rglob("*"):
+        if path.relative_to(output_dir).parts[0].startswith("images") or not path.is_file():
+            continue
+        if path.stat().st_nlink > 1:
+            tmp = path.with_name(path.name + ".unshare")
+            shutil.copy2(path, tmp)
+            os.replace(tmp, path)
+
+
+def reuse_camera(database: Path, existing: List[str], new: List[str]) -> int:
+    """
+    Point the ``new`` images of a COLMAP database at the camera of the
+    ``existing`` ones and drop the camera feature_extractor created for them,
+    so they are registered with the intrinsics of the model. Returns the camera ID.
+    """
+    connection = sqlite3.connect(database)
+    try:
+        with connection:
+            row = connection.execute("SELECT camera_id FROM images WHERE name = ?", (existing[0],)).fetchone()
+            if row is None:
+                raise ValueError(f"{existing[0]} is not in {database}")
+            camera_id = row[0]
+            connection.executemany(
+                "UPDATE images SET camera_id = ? WHERE name = ?", [(camera_id, name) for name in new]
+            )
+            connection.execute("DELETE FROM cameras WHERE camera_id NOT IN (SELECT camera_id FROM images)")
+    finally:
+        connection.close()
+    return camera_id
+
+
+def _colmap(colmap_cmd: str, *args: str):
+    argv = [colmap_cmd, *args]
+    print(f"Running {' '.join(argv)}", flush=True)
+    subprocess.run(argv, check=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add new images to a dataset processed by ns-process-data images")
+    parser.add_argument("--data", type=Path, required=True)
+    parser.add_argument("--output-dir", type=Path, required=True)
+    parser.add_argument("--camera-type", default="perspective", choices=sorted(COLMAP_CAMERA_MODELS))
+    parser.add_argument("--matching-method", default="vocab_tree")
+    parser.add_argument("--colmap-cmd", default="colmap")
+    parser.add_argument("--no-gpu", dest="gpu", action="store_false")
+    args = parser.parse_args()
+
+    start = time.time()
+    increment = plan_increment(args.data, args.output_dir)
+    if not increment.possible:
+        sys.exit(f"Cannot add images incrementally: {increment.reason}")
+    if not increment.new:
+        print("No new images, nothing to do")
+        return
+    manifest = read_manifest(args.output_dir)
+    existing = [frame["frame"] for frame in manifest["frames"].values()]
+    new = [frame for _, frame in increment.new]
+    print(f"Adding {len(new)} new images to {len(existing)} processed ones", flush=True)
+
+    _unshare(args.output_dir)
+    images = args.output_dir / "images"
+    for path, frame in increment.new:
+        shutil.copy2(path, images / frame)
+        _downscale(images / frame, args.output_dir)
+
+    colmap_dir = args.output_dir / "colmap"
+    database = str(colmap_dir / "database.db")
+    model = str(colmap_dir / "sparse" / "0")
+    gpu = "1" if args.gpu else "0"
+    image_list = colmap_dir / "new_images.txt"
+    image_list.write_text("\n".join(new) + "\n")
+    pair_list = colmap_dir / "new_pairs.txt"
+    pairs = match_pairs(existing, new, args.matching_method)
+    pair_list.write_text("".join(f"{a} {b}\n" for a, b in pairs))
+    print(f"Matching {len(pairs)} image pairs", flush=True)
+
+    _colmap(
+        args.colmap_cmd, "feature_extractor",
+        "--database_path", database,
+        "--image_path", str(images),
+        "--image_list_path", str(image_list),
+        "--ImageReader.single_camera", "1",
+        "--ImageReader.camera_model", COLMAP_CAMERA_MODELS[args.camera_type],
+        "--SiftExtraction.use_gpu", gpu,
+    )
+    # feature_extractor gives the new images a camera of their own, even with single_camera
+    reuse_camera(Path(database), existing, new)
+    _colmap(
+        args.colmap_cmd, "matches_importer",
+        "--database_path", database,
+        "--match_list_path", str(pair_list),
+        "--match_type", "pairs",
+        "--SiftMatching.use_gpu", gpu,
+    )
+    _colmap(args.colmap_cmd, "image_registrator", "--database_path", database, "--input_path", model, "--output_path", model)
+    _colmap(args.colmap_cmd, "bundle_adjuster", "--input_path", model, "--output_path", model)
+    image_list.unlink()
+    pair_list.unlink()
+
+    from nerfstudio.process_data.colmap_utils import colmap_to_json
+
+    num_registered = colmap_to_json(recon_dir=Path(model), output_dir=args.output_dir)
+    print(f"Registered {num_registered} of {len(existing) + len(new)} images, rewrote transforms.json", flush=True)
+
+    frames = dict(manifest["frames"])
+    for path, frame in increment.new:
+        frames[path.name] = dict(_stat(path), frame=frame)
+    write_manifest(args.data, args.output_dir, frames)
+    print(f"Done in {time.time() - start:.0f}s", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+import itertools
+import logging
+import multiprocessing
+import os
+import re
+import subprocess
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.device_slots import DeviceSlot
+from utils.output_log import OutputLogPolicy
+from utils.output_stream import OutputBuffer, start_drain_thread
+
+# cores a batch processing job is expected to keep busy (COLMAP and ffmpeg are multi-threaded)
+BATCH_THREADS_PER_JOB = 4
+
+
+def available_cores() -> int:
+    """Cores this process may run on (respects CPU affinity / container limits where the OS reports them)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# resource class → default number of jobs allowed to run at the same time
+DEFAULT_LIMITS = {
+    "cpu": 1,     # ns-process-data / COLMAP
+    "batch": max(1, available_cores() // BATCH_THREADS_PER_JOB),  # batch ns-process-data
+    "gpu": 1,     # training
+    "export": 1,  # ns-export
+    "viewer": 4,  # ns-viewer
+    "eval": 1,    # background evaluation of saved checkpoints
+}
+
+ACTIVE_STATES = ("queued", "running")
+
+# threads working for a job are named "job-<id>..." so log records can be traced back to it
+JOB_THREAD_NAME = re.compile(r"^job-(\d+)")
+
+# seconds a cancelled process gets to exit after SIGTERM before it is killed
+CANCEL_GRACE_SECONDS = 5.0
+
+# finished jobs kept in JobManager.jobs (and the Jobs tab), the oldest are dropped first
+MAX_FINISHED_JOBS = 200
+
+
+@dataclass
+class Job:
+    """
+    A unit of work queued on the JobManager.
+
+    A job either runs ``argv`` as a subprocess (its output captured in
+    ``output``), or calls ``target``: on the runner thread when ``in_process``,
+    otherwise in a child ``multiprocessing.Process``. Subprocesses and child
+    processes are pinned to the job's device ``slot``, if its resource class has slots.
+
+    Background work sets ``nice`` for its subprocess and ``yields_to``: it is
+    not started while jobs of those resource classes are running or queued.
+    ``output_log`` replaces the manager's output logging policy for the job.
+    ``before`` is called with the job on its runner thread before it runs; an
+    exit code it returns finishes the job without running it (e.g. a cache hit).
+    """
+
+    job_id: str
+    name: str
+    resource: str
+    argv: Optional[List[str]] = None
+    target: Optional[Callable[[], None]] = None
+    in_process: bool = True
+    env: Optional[Dict[str, str]] = None
+    priority: int = 0
+    nice: int = 0  # niceness of the subprocess (argv jobs)
+    yields_to: Tuple[str, ...] = ()
+    output: OutputBuffer = field(default_factory=OutputBuffer, repr=False)
+    on_line: Optional[Callable[[str], None]] = field(default=None, repr=False)
+    on_cancel: Optional[Callable[[], None]] = field(default=None, repr=False)
+    before: Optional[Callable[["Job"], Optional[int]]] = field(default=None, repr=False)
+    clean: Callable[[str], str] = field(default=str.rstrip, repr=False)
+    progress: dict = field(default_factory=dict)  # free-form progress parsed from the output
+    output_log: Optional[OutputLogPolicy] = field(default=None, repr=False)  # None for the manager's policy
+    slot: Optional[DeviceSlot] = None  # assigned when the job starts
+
+    state: str = "queued"  # queued, running, done, failed, cancelled
+    returncode: Optional[int] = None
+    error: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    process: Optional[object] = field(default=None, repr=False)  # subprocess.Popen or multiprocessing.Process
+    finished: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def is_active(self) -> bool:
+        return self.state in ACTIVE_STATES
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job has finished (or was cancelled while queued)."""
+        return self.finished.wait(timeout)
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+
+class JobManager:
+    """
+    Runs jobs from every tab through one priority queue.
+
+    Jobs are started in order of (priority, submission) as soon as their
+    resource class has a free slot; a job blocked on a busy class does not hold
+    back jobs of other classes. Each running job gets its own runner thread.
+    Only the last ``max_finished`` finished jobs are kept.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, int]] = None,
+        output_log: Optional[OutputLogPolicy] = None,
+        max_finished: int = MAX_FINISHED_JOBS,
+    ):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.output_log = output_log  # how subprocess output reaches the application log, None for not at all
+        self.max_finished = max_finished
+        self.jobs: Dict[str, Job] = {}  # insertion ordered, the last max_finished finished jobs included
+        self._finished: List[str] = []  # IDs of the finished jobs in self.jobs, oldest first
+        self._queue: List[Job] = []
+        self._running = Counter()
+        self._slots: Dict[str, List[DeviceSlot]] = {}  # resource → all its device slots
+        self._free_slots: Dict[str, List[DeviceSlot]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, resource: str, **kwargs) -> Job:
+        if resource not in self.limits:
+            raise ValueError(f"Unknown resource class: {resource}")
+        with self._lock:
+            job = Job(job_id=str(next(self._ids)), name=name, resource=resource, **kwargs)
+            self.jobs[job.job_id] = job
+            self._queue.append(job)
+            self.logger.info(
+                "Job queued", extra={"job_id": job.job_id, "job_name": name, "resource": resource}
+            )
+            self._schedule()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def queue_position(self, job: Job) -> int:
+        """1-based position of a queued job among the queued jobs of its resource class."""
+        with self._lock:
+            same_class = [j for j in self._ordered_queue() if j.resource == job.resource]
+            return same_class.index(job) + 1 if job in same_class else 0
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job. Returns False if it is not active, or
+        if it is an in-process target without an ``on_cancel`` hook, which
+        cannot be interrupted.
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or not job.is_active():
+                return False
+            if job.state == "queued":
+                self._queue.remove(job)
+                job.state = "cancelled"
+                job.finished_at = time.time()
+                self._mark_finished(job)
+                job.finished.set()
+                self.logger.info("Queued job cancelled", extra={"job_id": job_id})
+                return True
+            if job.on_cancel is None and job.argv is None and job.in_process:
+                self.logger.warning("Running job cannot be cancelled", extra={"job_id": job_id})
+                return False
+            job.state = "cancelled"
+
+        self.logger.info("Cancelling running job", extra={"job_id": job_id})
+        if job.on_cancel is not None:
+            job.on_cancel()
+        elif job.process is not None:
+            self._terminate(job)
+        return True
+
+    def _terminate(self, job: Job):
+        """Ask the job's process to exit, and kill it if it is still alive after the grace period."""
+        job.process.terminate()
+
+        def _kill_if_alive():
+            if not job.finished.wait(CANCEL_GRACE_SECONDS) and job.process is not None:
+                self.logger.warning("Killing job that ignored SIGTERM", extra={"job_id": job.job_id})
+                job.process.kill()
+
+        threading.Thread(target=_kill_if_alive, name=f"job-{job.job_id}-kill", daemon=True).start()
+
+    def set_limit(self, resource: str, limit: int):
+        with self._lock:
+            self.limits[resource] = limit
+            self._schedule()
+
+    def set_slots(self, resource: str, slots: List[DeviceSlot]):
+        """
+        Give every job of ``resource`` one of ``slots`` while it runs. The
+        class then runs as many jobs at once as there are slots, and a
+        finished job's slot goes to the next queued one.
+        """
+        with self._lock:
+            self._slots[resource] = list(slots)
+            busy = [job.slot for job in self.jobs.values() if job.state == "running" and job.slot is not None]
+            self._free_slots[resource] = [slot for slot in slots if slot not in busy]
+            self.limits[resource] = len(slots)
+            self._schedule()
+
+    def current_job(self) -> Optional[Job]:
+        """The job whose runner thread is calling, e.g. from an in-process target."""
+        job_id = job_id_of_thread(threading.current_thread().name)
+        return self.jobs.get(job_id) if job_id is not None else None
+
+    def rows(self) -> List[list]:
+        """Jobs table for the UI, newest first."""
+        rows = []
+        for job in reversed(list(self.jobs.values())):
+            rows.append(
+                [
+                    job.job_id,
+                    job.name,
+                    job.resource,
+                    job.priority,
+                    job.state,
+                    "" if job.returncode is None else job.returncode,
+                    job.slot.name if job.slot is not None else "",
+                    f"{job.elapsed:.0f}s",
+                ]
+            )
+        return rows
+
+    def _mark_finished(self, job: Job):
+        # called with self._lock held; drops the oldest finished jobs beyond max_finished
+        self._finished.append(job.job_id)
+        while len(self._finished) > self.max_finished:
+            self.jobs.pop(self._finished.pop(0), None)
+
+    def _ordered_queue(self) -> List[Job]:
+        return sorted(self._queue, key=lambda j: (-j.priority, int(j.job_id)))
+
+    def _schedule(self):
+        # called with self._lock held
+        for job in self._ordered_queue():
+            if self._running[job.resource] >= self.limits[job.resource]:
+                continue
+            if any(self._running[r] or any(q.resource == r for q in self._queue) for r in job.yields_to):
+                continue
+            if job.resource in self._free_slots:
+                if not self._free_slots[job.resource]:
+                    continue
+                job.slot = self._free_slots[job.resource].pop(0)
+            self._queue.remove(job)
+            self._running[job.resource] += 1
+            job.state = "running"
+            job.started_at = time.time()
+            threading.Thread(target=self._run, args=(job,), name=f"job-{job.job_id}", daemon=True).start()
+
+    def _run(self, job: Job):
+        self.logger.info("Job started", extra={"job_id": job.job_id, "job_name": job.name})
+        try:
+            job.returncode = self._execute(job)
+        except Exception as e:
+            self.logger.exception("Job raised", extra={"job_id": job.job_id})
+            job.error = str(e)
+            job.returncode = -1
+        finally:
+            with self._lock:
+                if job.state == "running":
+                    job.state = "done" if job.returncode == 0 else "failed"
+                job.finished_at = time.time()
+                self._mark_finished(job)
+                self._running[job.resource] -= 1
+                if job.slot is not None and job.slot in self._slots.get(job.resource, ()):
+                    self._free_slots[job.resource].append(job.slot)
+                self._schedule()
+            job.finished.set()
+            self.logger.info(
+                "Job finished",
+                extra={"job_id": job.job_id, "state": job.state, "returncode": job.returncode},
+            )
+
+    def _execute(self, job: Job) -> int:
+        if job.before is not None:
+            code = job.before(job)
+            if code is not None:
+                return code
+        slot = job.slot
+        if job.argv is not None:
+            env = None
+            if job.env or (slot is not None and slot.env):
+                env = dict(os.environ, **(job.env or {}), **(slot.env if slot is not None else {}))
+            job.process = subprocess.Popen(
+                job.argv,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                shell=False,
+                env=env,
+            )
+            if slot is not None and slot.cpus and hasattr(os, "sched_setaffinity"):
+                # threads the child starts from now on inherit the mask
+                os.sched_setaffinity(job.process.pid, slot.cpus)
+            if job.nice and hasattr(os, "setpriority"):
+                try:
+                    os.setpriority(os.PRIO_PROCESS, job.process.pid, job.nice)
+                except OSError:
+                    pass
+            policy = job.output_log if job.output_log is not None else self.output_log
+            output_log = policy.open(job.job_id) if policy is not None else None
+            reader = start_drain_thread(
+                job.process.stdout,
+                job.output,
+                clean=job.clean,
+                on_line=_chain(output_log, job.on_line),
+                name=f"job-{job.job_id}-output",
+            )
+            if job.state == "cancelled":
+                # cancelled between being scheduled and spawned
+                self._terminate(job)
+            code = job.process.wait()
+            reader.join()
+            if output_log is not None:
+                output_log.close(code)
+            return code
+
+        if job.in_process:
+            # in-process targets may return an exit code (e.g. of a process they supervise)
+            code = job.target()
+            return code if type(code) is int else 0  # not bools, e.g. from Event.wait
+
+        job.process = multiprocessing.Process(target=_run_pinned, args=(slot, job.target))
+        job.process.start()
+        if job.state == "cancelled":
+            self._terminate(job)
+        job.process.join()
+        return job.process.exitcode
+
+
+def _run_pinned(slot: Optional[DeviceSlot], target: Callable[[], None]):
+    if slot is not None:
+        slot.apply()
+    target()
+
+
+def _chain(*callbacks):
+    """One on_line callback calling every given (non-None) callback in turn."""
+    callbacks = [cb for cb in callbacks if cb is not None]
+    if not callbacks:
+        return None
+    if len(callbacks) == 1:
+        return callbacks[0]
+
+    def _on_line(line):
+        for cb in callbacks:
+            cb(line)
+
+    return _on_line
+
+
+def job_id_of_thread(thread_name: str) -> Optional[str]:
+    """ID of the job a runner/output thread works for, or None for other threads."""
+    match = JOB_THREAD_NAME.match(thread_name or "")
+    return match.group(1) if match else None
+
+
+_job_manager: Optional[JobManager] = None
+
+
+def configure_job_manager(
+    limits: Optional[Dict[str, int]] = None,
+    output_log: Optional[OutputLogPolicy] = None,
+    max_finished: int = MAX_FINISHED_JOBS,
+) -> JobManager:
+    """Create the process-wide JobManager with the given per-resource limits and output logging."""
+    global _job_manager
+    _job_manager = JobManager(limits, output_log, max_finished)
+    return _job_manager
+
+
+def get_job_manager() -> JobManager:
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager()
+    return _job_manager
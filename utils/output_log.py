@@ -0,0 +1,108 @@
+import gzip
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+# output lines that are always logged, whatever the rate limit
+DEFAULT_ERROR_PATTERN = r"\b(error|exception|traceback|failed|fatal|killed)\b"
+
+
+@dataclass
+class OutputLogPolicy:
+    """
+    How much of a job's output goes to the application log.
+
+    The first ``head`` lines are logged, then at most ``rate`` lines per second
+    (bursts of up to ``burst``). Lines matching ``error_pattern`` are always
+    logged. Skipped lines are summarized as "N lines suppressed", and the last
+    line is logged when the job ends. With ``raw_dir`` set, every line is also
+    written to ``<raw_dir>/job-<id>.out.gz``.
+    """
+
+    head: int = 10
+    rate: float = 1.0
+    burst: int = 10
+    error_pattern: str = DEFAULT_ERROR_PATTERN
+    raw_dir: Optional[str] = "logs/jobs"
+
+    def open(self, job_id: str, clock: Callable[[], float] = time.monotonic) -> "OutputLog":
+        return OutputLog(self, job_id, clock)
+
+
+class OutputLog:
+    """Sampled application logging plus a compressed raw copy of one job's output."""
+
+    def __init__(self, policy: OutputLogPolicy, job_id: str, clock: Callable[[], float] = time.monotonic):
+        self.logger = logging.getLogger("JobOutput")
+        self.policy = policy
+        self.job_id = job_id
+        self.errors = re.compile(policy.error_pattern, re.I) if policy.error_pattern else None
+        self.clock = clock
+
+        self.lines = 0        # lines seen
+        self.logged = 0       # lines written to the application log
+        self.suppressed = 0   # lines skipped since the last logged one
+        self.last_skipped = None
+        self._tokens = float(policy.burst)
+        self._refilled_at = clock()
+
+        self.raw_path = None
+        self._raw = None
+        if policy.raw_dir:
+            os.makedirs(policy.raw_dir, exist_ok=True)
+            self.raw_path = os.path.join(policy.raw_dir, f"job-{job_id}.out.gz")
+            self._raw = gzip.open(self.raw_path, "wt", encoding="utf-8")
+
+    def __call__(self, line: str):
+        self.lines += 1
+        if self._raw is not None:
+            self._raw.write(line + "\n")
+
+        if self.errors is not None and self.errors.search(line):
+            self._emit(logging.WARNING, line)
+        elif self.lines <= self.policy.head or self._take_token():
+            self._emit(logging.INFO, line)
+        else:
+            self.suppressed += 1
+            self.last_skipped = line
+
+    def _take_token(self) -> bool:
+        now = self.clock()
+        self._tokens = min(self.policy.burst, self._tokens + (now - self._refilled_at) * self.policy.rate)
+        self._refilled_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def _emit(self, level: int, line: str):
+        self._flush_suppressed()
+        self.logged += 1
+        self.logger.log(level, "Process output: %s", line, extra={"job_id": self.job_id})
+
+    def _flush_suppressed(self):
+        if self.suppressed:
+            self.logger.info("%d lines suppressed", self.suppressed, extra={"job_id": self.job_id})
+            self.suppressed = 0
+
+    def close(self, returncode: Optional[int] = None):
+        if self.last_skipped is not None and self.suppressed:
+            # always keep the last line, it usually says how the job ended
+            self.suppressed -= 1
+            self._emit(logging.INFO, self.last_skipped)
+        self._flush_suppressed()
+        if self._raw is not None:
+            self._raw.close()
+        self.logger.info(
+            "Process output finished",
+            extra={
+                "job_id": self.job_id,
+                "returncode": returncode,
+                "lines": self.lines,
+                "logged": self.logged,
+                "raw_output": self.raw_path,
+            },
+        )
@@ -0,0 +1,130 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class OutputBuffer:
+    """
+    Bounded ring buffer of output lines.
+
+    Every line gets a sequence number that keeps increasing for the lifetime
+    of the buffer, so a reader only needs to remember the next sequence number
+    it expects. When the buffer is full the oldest lines are dropped.
+    """
+
+    def __init__(self, maxlen: int = 5000):
+        self._lines = deque(maxlen=maxlen)
+        self._next_seq = 0
+        self._cond = threading.Condition()
+
+    @property
+    def next_seq(self) -> int:
+        return self._next_seq
+
+    def append(self, line: str):
+        with self._cond:
+            self._lines.append((self._next_seq, line))
+            self._next_seq += 1
+            self._cond.notify_all()
+
+    def read_since(self, seq: int) -> Tuple[List[str], int]:
+        """Lines with a sequence number >= ``seq`` still in the buffer, and the next sequence number."""
+        with self._cond:
+            new = []
+            for line_seq, line in reversed(self._lines):
+                if line_seq < seq:
+                    break
+                new.append(line)
+            new.reverse()
+            return new, self._next_seq
+
+    def tail(self, n: int) -> List[str]:
+        with self._cond:
+            start = max(len(self._lines) - n, 0)
+            return [line for _, line in list(self._lines)[start:]]
+
+    def wait(self, seq: int, timeout: Optional[float] = None) -> bool:
+        """Block until a line with sequence number >= ``seq`` exists. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._next_seq > seq, timeout)
+
+
+def start_drain_thread(
+    stream,
+    buffer: OutputBuffer,
+    clean: Callable[[str], str] = str.rstrip,
+    on_line: Optional[Callable[[str], None]] = None,
+    name: str = "output-drain",
+) -> threading.Thread:
+    """
+    Continuously read ``stream`` line by line into ``buffer`` on a daemon thread.
+
+    The pipe is emptied as fast as the child writes, so it never blocks on a
+    full pipe buffer regardless of how often the UI polls. Empty lines (after
+    ``clean``) are skipped. The thread exits at EOF.
+    """
+
+    def _drain():
+        try:
+            for raw in iter(stream.readline, ""):
+                line = clean(raw)
+                if not line:
+                    continue
+                buffer.append(line)
+                if on_line is not None:
+                    on_line(line)
+        except ValueError:
+            # stream closed underneath us
+            pass
+
+    thread = threading.Thread(target=_drain, name=name, daemon=True)
+    thread.start()
+    return thread
+
+
+def stream_output(
+    buffer: OutputBuffer,
+    is_running: Callable[[], bool],
+    seq: int = 0,
+    max_fps: float = 4.0,
+):
+    """
+    Yield ``(new_lines, next_seq)`` batches from ``buffer`` as output arrives.
+
+    Lines arriving within ``1 / max_fps`` seconds of each other are coalesced
+    into one batch, so a chatty process costs at most ``max_fps`` updates per
+    second. Nothing is yielded while the producer is quiet. The generator ends
+    with a final (possibly empty) batch once ``is_running()`` returns False.
+    """
+    interval = 1.0 / max_fps
+    while True:
+        running = is_running()
+        if running:
+            buffer.wait(seq, timeout=1.0)
+        lines, seq = buffer.read_since(seq)
+        if lines or not running:
+            yield lines, seq
+        if not running:
+            return
+        time.sleep(interval)
+
+
+def stream_changes(poll: Callable[[], Any], is_running: Callable[[], bool], max_fps: float = 4.0):
+    """
+    Yield ``poll()`` whenever its value changes, at most ``max_fps`` times per second.
+
+    For state without an output stream (e.g. a trainer's step counter). The
+    last value is always yielded once ``is_running()`` returns False.
+    """
+    interval = 1.0 / max_fps
+    last = None
+    while True:
+        running = is_running()
+        value = poll()
+        if value != last or not running:
+            last = value
+            yield value
+        if not running:
+            return
+        time.sleep(interval)
@@ -0,0 +1,138 @@
+import html
+import re
+import time
+from typing import Callable, Dict, Optional
+
+# (rule, stage, pattern): every pattern is a named group of one compiled alternation, so a line costs one
+# regex search however many rules there are. Counters are named <rule>_<counter>.
+PROGRESS_RULES = [
+    # COLMAP
+    ("extract", "Extracting features", r"Processed file \[(?P<extract_i>\d+)/(?P<extract_n>\d+)\]"),
+    (
+        "match_block",
+        "Matching features",
+        r"Matching block \[(?P<match_block_i>\d+)/(?P<match_block_n>\d+), (?P<match_block_j>\d+)/\d+\]",
+    ),
+    ("match_image", "Matching features", r"Matching image \[(?P<match_image_i>\d+)/(?P<match_image_n>\d+)\]"),
+    ("init_pair", "Reconstructing", r"Initializing with image pair"),
+    ("register", "Reconstructing", r"Registering image #\d+ \((?P<register_i>\d+)\)"),
+    # not "Global bundle adjustment", which the mapper also prints between registrations
+    ("bundle", "Bundle adjustment", r"Running colmap bundle_adjuster"),
+    ("undistort", "Undistorting images", r"Undistorting image \[(?P<undistort_i>\d+)/(?P<undistort_n>\d+)\]"),
+    # ns-process-data hides its steps behind spinners that never reach a pipe and hides the COLMAP output
+    # without --verbose; what it logs is a "Done ..." line after every step, so those start the next stage
+    ("copy", "Copying images", r"Copying image (?P<copy_i>\d+) of (?P<copy_n>\d+)"),
+    ("copied", "Extracting features", r"Done copying images|Done converting video to images|Done downscaling images"),
+    ("extracted", "Matching features", r"Done extracting COLMAP features"),
+    ("matched", "Reconstructing", r"Done matching COLMAP features"),
+    ("mapped", "Bundle adjustment", r"Done COLMAP bundle adjustment"),
+    ("refined", "Writing transforms.json", r"Done refining intrinsics"),
+    ("finished", "Finished", r"All DONE"),
+    # the WebUI pre-stages and incremental runs
+    ("video", "Extracting video frames", r"Extracted \d+ frames"),
+    ("cull", "Culling frames", r"Kept \d+ of \d+ frames"),
+    ("transforms", "Writing transforms.json", r"rewrote transforms\.json"),
+]
+# the lookahead on the first letters of the rules lets the search skip most positions of a line without
+# trying every alternative there, ~6x faster on lines that match nothing
+_FIRST_CHARS = sorted({alternative[0] for _, _, pattern in PROGRESS_RULES for alternative in pattern.split("|")})
+PROGRESS_PATTERN = re.compile(
+    f"(?=[{re.escape(''.join(_FIRST_CHARS))}])(?:"
+    + "|".join(f"(?P<{rule}>{pattern})" for rule, _, pattern in PROGRESS_RULES)
+    + ")"
+)
+RULE_STAGES = {rule: stage for rule, stage, _ in PROGRESS_RULES}
+
+
+class ProcessProgress:
+    """
+    Turns ns-process-data / COLMAP output into a progress dict: ``stage``,
+    ``done`` / ``total`` and ``percent`` of the stage when it reports counts,
+    ``eta`` in seconds (from the rate since the stage started) and
+    ``images``, the number of images the feature extraction reported.
+
+    Used as the ``on_line`` callback of a job, with the job's ``progress``.
+    """
+
+    def __init__(self, progress: Optional[dict] = None, clock: Callable[[], float] = time.monotonic):
+        self.progress = progress if progress is not None else {}
+        self.clock = clock
+        self._stage_started = clock()
+
+    def __call__(self, line: str) -> bool:
+        return self.feed(line)
+
+    def feed(self, line: str) -> bool:
+        """Update the progress from one output line. Returns True if it changed."""
+        match = PROGRESS_PATTERN.search(line)
+        if match is None:
+            return False
+        rule = match.lastgroup
+        groups = match.groupdict()
+        done = total = None
+        if rule == "match_block":
+            # exhaustive matching goes through N x N blocks
+            blocks = int(groups["match_block_n"])
+            done = (int(groups["match_block_i"]) - 1) * blocks + int(groups["match_block_j"])
+            total = blocks * blocks
+        elif rule == "register":
+            done, total = int(groups["register_i"]), self.progress.get("images")
+        elif f"{rule}_i" in groups:
+            done, total = int(groups[f"{rule}_i"]), int(groups[f"{rule}_n"])
+            if rule == "extract":
+                self.progress["images"] = total
+        self._update(RULE_STAGES[rule], done, total)
+        return True
+
+    def _update(self, stage: str, done: Optional[int], total: Optional[int]):
+        now = self.clock()
+        progress = self.progress
+        if progress.get("stage") != stage:
+            progress["stage"] = stage
+            self._stage_started = now
+            for key in ("done", "total", "percent", "eta"):
+                progress.pop(key, None)
+        if done is None or not total:
+            return
+        progress["done"], progress["total"] = done, total
+        fraction = min(done / total, 1.0)
+        progress["percent"] = round(100 * fraction, 1)
+        elapsed = now - self._stage_started
+        progress["eta"] = elapsed * (1 - fraction) / fraction if fraction > 0 and elapsed > 0 else None
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return ""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+def progress_text(progress: Dict[str, object]) -> str:
+    """One-line status, e.g. ``Matching features 45% (12/27), ETA 1m 05s``."""
+    text = str(progress.get("stage", ""))
+    if "percent" in progress:
+        text += f" {progress['percent']:.0f}% ({progress['done']}/{progress['total']})"
+        if progress.get("eta") is not None:
+            text += f", ETA {format_eta(progress['eta'])}"
+    return text
+
+
+def progress_html(progress: Dict[str, object]) -> str:
+    """A progress bar for a gr.HTML component, empty without a stage."""
+    if not progress.get("stage"):
+        return ""
+    percent = progress.get("percent")
+    width = 100 if percent is None else percent
+    # a stage without counts shows a full, dimmed bar
+    opacity = 0.35 if percent is None else 1.0
+    return (
+        '<div style="border:1px solid var(--border-color-primary);border-radius:4px;height:20px;position:relative">'
+        f'<div style="width:{width}%;height:100%;background:var(--color-accent);opacity:{opacity}"></div>'
+        '<span style="position:absolute;inset:0;text-align:center;font-size:12px;line-height:20px">'
+        f"{html.escape(progress_text(progress))}</span></div>"
+    )
@@ -0,0 +1,178 @@
+"""
+Startup profiler of the WebUI.
+
+Run through ``python webui.py --profile_startup``, which restarts as
+``python -m utils.profiler <args>``: the import hook is installed before
+webui.py itself is imported, so gradio and the tab modules are measured too.
+This module only imports the standard library for the same reason.
+"""
+import builtins
+import importlib.util
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional
+
+PROFILED_PREFIXES = ("webui", "gradio", "modules", "utils", "nerfstudio")
+
+
+def _count_blocks(blocks):
+    """Number of (components, event listeners) registered on a gr.Blocks."""
+    if blocks is None:
+        return 0, 0
+    return len(blocks.blocks), len(blocks.fns)
+
+
+class StartupProfiler:
+    """
+    Records where WebUI startup time and memory go.
+
+    ``track_imports`` times the first import of every module under
+    ``prefixes``; ``phase`` times a block of code and records its allocations
+    and, given the gr.Blocks being built, the components and listeners it added.
+    Import times are inclusive: a module's time contains the imports it triggers.
+
+    Allocations are only recorded with ``trace_memory``; tracemalloc slows every
+    allocation down, so the times of a profile with memory tracing are inflated.
+    """
+
+    def __init__(self, prefixes=PROFILED_PREFIXES, trace_memory: bool = False):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.prefixes = tuple(prefixes)
+        self.trace_memory = trace_memory
+        self.imports: List[dict] = []
+        self.phases: List[dict] = []
+        self._depth = 0
+        self._start = time.perf_counter()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _wants(self, name: str) -> bool:
+        return name.split(".")[0] in self.prefixes and name not in sys.modules
+
+    @contextmanager
+    def track_imports(self):
+        original_import = builtins.__import__
+
+        def _import(name, globals=None, locals=None, fromlist=(), level=0):
+            try:
+                absolute = importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__")) if level else name
+            except (ImportError, ValueError):
+                absolute = name
+            # `from package import submodule` loads the submodule without another __import__ call
+            candidates = [absolute] + [f"{absolute}.{item}" for item in fromlist or () if item != "*"]
+            new = [c for c in candidates if self._wants(c)]
+            if not new:
+                return original_import(name, globals, locals, fromlist, level)
+
+            self._depth += 1
+            start = time.perf_counter()
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                self._depth -= 1
+                # fromlist entries may be plain attributes rather than submodules
+                loaded = [c for c in new if c in sys.modules]
+                if loaded:
+                    self.imports.append(
+                        {
+                            "module": loaded[0],
+                            "seconds": time.perf_counter() - start,
+                            "depth": self._depth,
+                        }
+                    )
+
+        builtins.__import__ = _import
+        try:
+            yield self
+        finally:
+            builtins.__import__ = original_import
+
+    @contextmanager
+    def phase(self, name: str, blocks=None):
+        components, listeners = _count_blocks(blocks)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            mem_before, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            allocated = peak = None
+            if self.trace_memory:
+                mem_after, mem_peak = tracemalloc.get_traced_memory()
+                allocated, peak = mem_after - mem_before, mem_peak - mem_before
+            components_after, listeners_after = _count_blocks(blocks)
+            self.phases.append(
+                {
+                    "phase": name,
+                    "seconds": seconds,
+                    "allocated_bytes": allocated,
+                    "peak_bytes": peak,
+                    "components": components_after - components,
+                    "listeners": listeners_after - listeners,
+                }
+            )
+
+    def report(self) -> dict:
+        from utils.schema_cache import nerfstudio_version
+
+        gradio = sys.modules.get("gradio")
+        gradio_version = getattr(gradio, "__version__", "unknown")
+        return {
+            "python": platform.python_version(),
+            "gradio": gradio_version,
+            "nerfstudio": nerfstudio_version(),
+            "total_seconds": time.perf_counter() - self._start,
+            "phases": self.phases,
+            "imports": sorted(self.imports, key=lambda r: r["seconds"], reverse=True),
+        }
+
+    def format_table(self, report: Optional[dict] = None, top_imports: int = 15) -> str:
+        report = report or self.report()
+        lines = [
+            f"{'phase':<34} {'time [s]':>9} {'alloc [MB]':>11} {'peak [MB]':>10} {'comps':>6} {'events':>7}",
+        ]
+        for p in report["phases"]:
+            alloc, peak = (
+                ("-", "-")
+                if p["allocated_bytes"] is None
+                else (f"{p['allocated_bytes'] / 2**20:.1f}", f"{p['peak_bytes'] / 2**20:.1f}")
+            )
+            lines.append(
+                f"{p['phase']:<34} {p['seconds']:>9.3f} {alloc:>11} {peak:>10} {p['components']:>6} {p['listeners']:>7}"
+            )
+        lines.append("")
+        lines.append(f"{'import (inclusive)':<56} {'time [s]':>9}")
+        for r in report["imports"][:top_imports]:
+            lines.append(f"{'  ' * r['depth'] + r['module']:<56} {r['seconds']:>9.3f}")
+        lines.append("")
+        lines.append(f"total {report['total_seconds']:.3f}s (gradio {report['gradio']}, nerfstudio {report['nerfstudio']})")
+        return "\n".join(lines)
+
+    def write(self, path) -> dict:
+        report = self.report()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2))
+        self.logger.info("Startup profile written", extra={"path": str(path)})
+        return report
+
+
+def main():
+    """Run ``webui.py`` with the arguments of this command, tracking imports from before webui.py is imported."""
+    profiler = StartupProfiler(trace_memory="--profile_memory" in sys.argv)
+    with profiler.track_imports():
+        import webui
+
+        webui.main(profiler=profiler)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import copy
+import threading
+from typing import Any, Dict, Iterable
+
+# subtrees nerfstudio writes to while launching and setting up a run
+# (data alias, viewer.quit_on_train_completion, dataparser.data, ...)
+ALWAYS_COPIED = (
+    "pipeline.datamanager.dataparser",
+    "viewer",
+    "machine",
+)
+
+_base_configs: Dict[str, Any] = {}
+_base_lock = threading.Lock()
+
+
+def get_base_config(method: str):
+    """
+    Pristine config of ``method``, copied once from the nerfstudio registry.
+
+    The base is shared by every run of the method and must be treated as
+    read-only; runs get their own config from ``build_run_config``.
+    """
+    with _base_lock:
+        if method not in _base_configs:
+            from nerfstudio.configs import method_configs as mc
+
+            _base_configs[method] = copy.deepcopy(mc.all_methods[method])
+        return _base_configs[method]
+
+
+def apply_overlay(base, overrides: Dict[str, Any], copy_paths: Iterable[str] = ALWAYS_COPIED):
+    """
+    A config equal to ``base`` with ``overrides`` (dotted path → value) applied.
+
+    Copy-on-write: only the objects on the paths to the overridden fields and
+    the ``copy_paths`` subtrees are shallow-copied; everything else is shared
+    with ``base``, which is never modified. Shorter paths are applied first, so
+    ``{"a.b": obj, "a.b.c": 1}`` replaces ``a.b`` and then sets ``c`` on a copy of ``obj``.
+    """
+    root = copy.copy(base)
+    copied = {"": root}  # dotted path → object owned by this run
+
+    def owned(path: str):
+        if path in copied:
+            return copied[path]
+        parent_path, _, name = path.rpartition(".")
+        parent = owned(parent_path)
+        node = copy.copy(getattr(parent, name))
+        setattr(parent, name, node)
+        copied[path] = node
+        return node
+
+    for path in sorted(overrides, key=lambda p: p.count(".")):
+        parent_path, _, name = path.rpartition(".")
+        setattr(owned(parent_path), name, overrides[path])
+        # a replaced subtree is not ours: copy it before anything is set inside it
+        for stale in [p for p in copied if p == path or p.startswith(path + ".")]:
+            del copied[stale]
+    # after the overrides, so a replaced subtree (e.g. a registry dataparser) is copied too
+    for path in copy_paths:
+        try:
+            owned(path)
+        except AttributeError:
+            # not every config has every subtree
+            pass
+    return root
+
+
+def build_run_config(method: str, overrides: Dict[str, Any]):
+    """The config of one run: ``overrides`` layered over the memoized base of ``method``."""
+    return apply_overlay(get_base_config(method), overrides)
@@ -0,0 +1,248 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+RUN_INDEX_DIR = Path(os.getenv("WEBUI_RUN_INDEX_DIR", Path.home() / ".cache" / "nerfstudio-webui"))
+RUN_CONFIG_NAME = "config.yml"
+# directories that never hold runs
+SKIPPED_DIRS = {"__pycache__", "node_modules", "nerfstudio_models", "wandb"}
+# a burst of tab opens from several clients walks the tree once
+MIN_REFRESH_INTERVAL = 2.0
+CHECKPOINT_NAME = re.compile(r"^step-(\d+)\.ckpt$")
+
+RUN_COLUMNS = ["Timestamp", "Method", "Experiment", "Step", "Dataset", "Config"]
+
+
+class _ConfigLoader(getattr(yaml, "CSafeLoader", yaml.SafeLoader)):
+    """
+    Safe (C when available) loader for nerfstudio config.yml files. The python
+    object tags are loaded as plain mappings/lists, so nothing is imported or
+    instantiated; ``pathlib`` paths become strings.
+    """
+
+
+def _construct_python(loader, suffix, node):
+    if isinstance(node, yaml.MappingNode):
+        return loader.construct_mapping(node, deep=True)
+    if isinstance(node, yaml.SequenceNode):
+        value = loader.construct_sequence(node, deep=True)
+        if suffix.startswith("object/apply:pathlib."):
+            return os.path.join(*map(str, value)) if value else ""
+        return value
+    return loader.construct_scalar(node)
+
+
+_ConfigLoader.add_multi_constructor("tag:yaml.org,2002:python/", _construct_python)
+
+
+def load_run_config(text: str) -> dict:
+    """A nerfstudio config.yml as plain nested dicts."""
+    return yaml.load(text, Loader=_ConfigLoader) or {}
+
+
+def parse_run_config(text: str) -> dict:
+    """Method, experiment, timestamp and dataset of a nerfstudio config.yml."""
+    config = load_run_config(text)
+    datamanager = (config.get("pipeline") or {}).get("datamanager") or {}
+    dataset = config.get("data") or datamanager.get("data") or (datamanager.get("dataparser") or {}).get("data")
+    return {
+        "method": config.get("method_name") or "",
+        "experiment": config.get("experiment_name") or "",
+        "timestamp": str(config.get("timestamp") or ""),
+        "dataset": str(dataset or ""),
+        "model_dir": str(config.get("relative_model_dir") or "nerfstudio_models"),
+    }
+
+
+def latest_checkpoint_step(model_dir: str) -> Optional[int]:
+    try:
+        names = os.listdir(model_dir)
+    except OSError:
+        return None
+    steps = [int(m.group(1)) for m in map(CHECKPOINT_NAME.match, names) if m]
+    return max(steps) if steps else None
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class RunIndex:
+    """
+    Persistent index of the training runs (directories with a config.yml) below ``root_dir``.
+
+    The index keeps the mtime and subdirectories of every directory it walked.
+    A refresh only stats the known directories and lists the ones whose mtime
+    changed, so directories full of images are listed once, not on every
+    refresh. Run directories are not descended into. A run's config is parsed
+    again when the file changes, its checkpoint step when its model directory does.
+    """
+
+    def __init__(self, root_dir: str, path: Optional[Path] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.root_dir = os.path.abspath(root_dir)
+        if path is None:
+            digest = hashlib.sha1(self.root_dir.encode()).hexdigest()[:12]
+            path = RUN_INDEX_DIR / f"run_index-{digest}.json"
+        self.path = Path(path)
+        self.dirs: Dict[str, dict] = {}  # path → {"mtime", "subdirs", "run"}
+        self.runs: Dict[str, dict] = {}  # config path → run record
+        self.last_refresh = 0.0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if data.get("root_dir") != self.root_dir:
+            return
+        self.dirs = data.get("dirs", {})
+        self.runs = data.get("runs", {})
+
+    def save(self):
+        payload = json.dumps({"root_dir": self.root_dir, "dirs": self.dirs, "runs": self.runs})
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(payload)
+            os.replace(tmp, self.path)
+        except OSError:
+            self.logger.warning("Could not write run index", extra={"path": str(self.path)})
+
+    def _scan_dir(self, path: str, mtime: int) -> dict:
+        subdirs, run = [], False
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.name == RUN_CONFIG_NAME:
+                        run = True
+                    elif (
+                        not entry.name.startswith(".")
+                        and entry.name not in SKIPPED_DIRS
+                        and entry.is_dir(follow_symlinks=False)
+                    ):
+                        subdirs.append(entry.path)
+        except OSError:
+            pass
+        # runs are not nested: outputs/<experiment>/<method>/<timestamp>/config.yml
+        return {"mtime": mtime, "subdirs": [] if run else subdirs, "run": run}
+
+    def _update_run(self, config_path: str) -> bool:
+        run = self.runs.get(config_path)
+        config_mtime = _mtime(config_path)
+        if run is None or run["config_mtime"] != config_mtime:
+            try:
+                with open(config_path) as f:
+                    info = parse_run_config(f.read())
+            except (OSError, yaml.YAMLError, AttributeError):
+                self.logger.warning("Cannot read run config", extra={"path": config_path}, exc_info=True)
+                info = {"method": "", "experiment": "", "timestamp": "", "dataset": "", "model_dir": "nerfstudio_models"}
+            if not info["timestamp"]:
+                info["timestamp"] = os.path.basename(os.path.dirname(config_path))
+            run = {**info, "config": config_path, "config_mtime": config_mtime, "ckpt_mtime": None, "step": None}
+            self.runs[config_path] = run
+            changed = True
+        else:
+            changed = False
+        model_dir = os.path.join(os.path.dirname(config_path), run["model_dir"])
+        ckpt_mtime = _mtime(model_dir)
+        if ckpt_mtime != run["ckpt_mtime"]:
+            run["ckpt_mtime"] = ckpt_mtime
+            run["step"] = latest_checkpoint_step(model_dir)
+            changed = True
+        return changed
+
+    def refresh(self, force: bool = False) -> bool:
+        """Bring the index up to date with the disk. Returns whether anything changed."""
+        with self._lock:
+            if not force and time.monotonic() - self.last_refresh < MIN_REFRESH_INTERVAL:
+                return False
+            start = time.perf_counter()
+            dirs, configs, listed = {}, [], 0
+            stack = [self.root_dir]
+            while stack:
+                path = stack.pop()
+                mtime = _mtime(path)
+                if mtime is None:
+                    continue
+                entry = self.dirs.get(path)
+                if entry is None or entry["mtime"] != mtime:
+                    entry = self._scan_dir(path, mtime)
+                    listed += 1
+                dirs[path] = entry
+                if entry["run"]:
+                    configs.append(os.path.join(path, RUN_CONFIG_NAME))
+                stack.extend(entry["subdirs"])
+
+            changed = listed > 0 or len(dirs) != len(self.dirs)
+            self.dirs = dirs
+            for config_path in set(self.runs) - set(configs):
+                del self.runs[config_path]
+                changed = True
+            for config_path in configs:
+                changed = self._update_run(config_path) or changed
+            self.last_refresh = time.monotonic()
+            if changed:
+                self.save()
+            self.logger.debug(
+                "Run index refreshed",
+                extra={
+                    "dirs": len(dirs),
+                    "listed": listed,
+                    "runs": len(self.runs),
+                    "seconds": round(time.perf_counter() - start, 4),
+                },
+            )
+            return changed
+
+    def records(self) -> List[dict]:
+        """The indexed runs, newest first."""
+        with self._lock:
+            return sorted(self.runs.values(), key=lambda run: run["timestamp"], reverse=True)
+
+    def rows(self) -> List[list]:
+        """One row per run in RUN_COLUMNS order, newest first."""
+        return [
+            [
+                run["timestamp"],
+                run["method"],
+                run["experiment"],
+                "" if run["step"] is None else run["step"],
+                run["dataset"],
+                run["config"],
+            ]
+            for run in self.records()
+        ]
+
+
+_run_indexes: Dict[str, RunIndex] = {}
+_run_indexes_lock = threading.Lock()
+
+
+def get_run_index(root_dir: str) -> RunIndex:
+    """Process-wide run index of ``root_dir``, shared by the tabs."""
+    key = os.path.abspath(root_dir)
+    with _run_indexes_lock:
+        if key not in _run_indexes:
+            _run_indexes[key] = RunIndex(key)
+        return _run_indexes[key]
+
+
+def run_rows(root_dir: str) -> List[list]:
+    """Refresh the index of ``root_dir`` and return its rows."""
+    index = get_run_index(root_dir)
+    index.refresh()
+    return index.rows()
@@ -0,0 +1,228 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+from dataclasses import fields, is_dataclass
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Literal, Optional, Sequence, get_args, get_origin, get_type_hints
+
+from typing_extensions import TypedDict
+
+SCHEMA_CACHE_PATH = Path(
+    os.getenv("WEBUI_SCHEMA_CACHE", Path.home() / ".cache" / "nerfstudio-webui" / "schema_cache.json")
+)
+
+# modules whose instances are cached by key prefix: the defaults of e.g. ``model/nerfacto`` are set where
+# the registry builds the instance, not in the config class
+INSTANCE_SOURCES = {
+    "model": ("nerfstudio.configs.method_configs",),
+    "dataparser": ("nerfstudio.configs.dataparser_configs",),
+}
+
+LITERAL_PATTERN = re.compile(r"(?:typing_extensions\.Literal|typing\.Literal|Literal)\[(.*?)\]")
+
+
+class FieldSpec(TypedDict, total=False):
+    name: str
+    kind: str  # "literal", "bool", "int", "float", "str", "sequence" or "other"
+    choices: Optional[List[Any]]
+    default: Any
+    item_kind: str  # kind of the elements of a "sequence"
+    item_choices: Optional[List[Any]]
+    length: int
+
+
+def _jsonable(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return str(value)
+
+
+def _kind_of_type(type_: Any) -> str:
+    if get_origin(type_) is Literal:
+        return "literal"
+    for kind in (bool, int, float, str):
+        if type_ is kind:
+            return kind.__name__
+    return "other"
+
+
+def resolve_instance_specs(config: Any) -> List[FieldSpec]:
+    """
+    Field specs of a config instance, as used by generate_args.
+
+    The kind is taken from the current value of each field, the Literal choices
+    from the annotation. Fields that cannot be shown as a single component are left out.
+    """
+    specs = []
+    for f in fields(config):
+        value = getattr(config, f.name)
+        matches = LITERAL_PATTERN.findall(str(f.type))
+        if matches:
+            if not isinstance(value, str):
+                continue
+            choices = [v.strip("'\"()") for v in matches[0].split(", ")]
+            specs.append({"name": f.name, "kind": "literal", "choices": choices, "default": value})
+        elif isinstance(value, (float, bool, int, str)):
+            # bool before int: bool is a subclass of int
+            kind = next(k for k in (float, bool, int, str) if isinstance(value, k)).__name__
+            specs.append({"name": f.name, "kind": kind, "choices": None, "default": value})
+    return specs
+
+
+def resolve_type_specs(dataclass_type: Any) -> List[FieldSpec]:
+    """
+    Field specs of a dataclass type, resolved from the annotations and class defaults.
+    """
+    if not is_dataclass(dataclass_type):
+        raise ValueError("Provided type is not a dataclass")
+    try:
+        hints = get_type_hints(dataclass_type)
+    except Exception:
+        hints = {}
+
+    specs = []
+    for f in fields(dataclass_type):
+        type_ = hints.get(f.name, f.type)
+        try:
+            default = f.default if f.default is not f.default_factory else None
+        except AttributeError:
+            default = None
+
+        spec: FieldSpec = {"name": f.name, "kind": _kind_of_type(type_), "choices": None, "default": _jsonable(default)}
+        if spec["kind"] == "literal":
+            spec["choices"] = list(get_args(type_))
+        elif get_origin(type_) in (list, tuple) and get_args(type_):
+            item_type = get_args(type_)[0]
+            spec["kind"] = "sequence"
+            spec["item_kind"] = _kind_of_type(item_type)
+            spec["item_choices"] = list(get_args(item_type)) if spec["item_kind"] == "literal" else None
+            spec["length"] = len(default) if isinstance(default, (list, tuple)) else len(get_args(type_))
+        specs.append(spec)
+    return specs
+
+
+def nerfstudio_version() -> str:
+    try:
+        return metadata.version("nerfstudio")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _module_mtime(module_name: str) -> int:
+    module_file = getattr(sys.modules.get(module_name), "__file__", None)
+    try:
+        return os.stat(module_file).st_mtime_ns if module_file else 0
+    except OSError:
+        return 0
+
+
+def fingerprint(config: Any, sources: Sequence[str] = ()) -> str:
+    """
+    Cheap hash of a config class: its import path, field names and the mtime of
+    its module, plus the mtimes of the ``sources`` modules the instance was built in.
+
+    No annotation is evaluated, so checking an entry costs one stat() per module.
+    """
+    cls = config if isinstance(config, type) else type(config)
+    parts = [cls.__module__, cls.__qualname__, str(_module_mtime(cls.__module__))]
+    parts += getattr(cls, "__dataclass_fields__", {})
+    parts += [f"{source}:{_module_mtime(source)}" for source in sources]
+    return hashlib.sha1("\0".join(parts).encode()).hexdigest()
+
+
+class SchemaCache:
+    """
+    On-disk cache of resolved field specs.
+
+    The file holds one entry per key (e.g. ``model/nerfacto``) together with the
+    fingerprint of the class it was resolved from. The whole file is discarded
+    when the nerfstudio version changes, single entries when their class or the
+    module that built the instance changes.
+    """
+
+    def __init__(self, path: Path = SCHEMA_CACHE_PATH, version: Optional[str] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.path = Path(path)
+        self.version = version or nerfstudio_version()
+        self.entries: Dict[str, dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if data.get("version") != self.version:
+            self.logger.info(
+                "Schema cache is stale, rebuilding",
+                extra={"cached_version": data.get("version"), "version": self.version},
+            )
+            return
+        self.entries = data.get("entries", {})
+
+    def get(
+        self,
+        key: str,
+        config: Any,
+        resolver: Callable[[Any], List[FieldSpec]],
+        sources: Optional[Sequence[str]] = None,
+    ) -> List[FieldSpec]:
+        """
+        Specs of ``config`` under ``key``, resolved again when it changed. The
+        ``sources`` of an instance default to the INSTANCE_SOURCES of the key prefix.
+        """
+        if sources is None:
+            sources = () if isinstance(config, type) else INSTANCE_SOURCES.get(key.split("/", 1)[0], ())
+        fp = fingerprint(config, sources)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry["fingerprint"] == fp:
+                self.hits += 1
+                return entry["specs"]
+
+        specs = resolver(config)
+        with self._lock:
+            self.entries[key] = {"fingerprint": fp, "specs": specs}
+            self.misses += 1
+            self._dirty = True
+        return specs
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps({"version": self.version, "entries": self.entries})
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(payload)
+            os.replace(tmp, self.path)
+        except OSError:
+            self.logger.warning("Could not write schema cache", extra={"path": str(self.path)})
+            return
+        self.logger.info("Schema cache saved", extra={"hits": self.hits, "misses": self.misses})
+
+
+_schema_cache: Optional[SchemaCache] = None
+
+
+def get_schema_cache() -> SchemaCache:
+    """Process-wide schema cache, written back on exit."""
+    global _schema_cache
+    if _schema_cache is None:
+        _schema_cache = SchemaCache()
+        atexit.register(_schema_cache.save)
+    return _schema_cache
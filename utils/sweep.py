@@ -0,0 +1,288 @@
+import itertools
+import logging
+import math
+import random
+import re
+import statistics
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# a sweep larger than this is almost certainly a typo in the spec
+MAX_RUNS = 256
+
+RANDOM_DISTRIBUTIONS = ("uniform", "loguniform", "randint")
+GRID_FUNCTIONS = ("grid", "loggrid")
+SPEC_LINE = re.compile(r"^\s*([\w.]+)\s*[=:]\s*(.+?)\s*$")
+CALL = re.compile(r"^(\w+)\((.*)\)$")
+# seconds between two applications of the stopping rule
+POLL_INTERVAL = 5.0
+# whether lower ("min", losses) or higher ("max", e.g. psnr) values of the metric are better
+DIRECTIONS = ("min", "max")
+
+
+@dataclass
+class SweepParam:
+    """
+    One swept field. Either a fixed list of ``values`` (from a list or a
+    grid) or a ``distribution`` between ``low`` and ``high`` sampled per run.
+    """
+
+    name: str
+    kind: str  # field kind from the schema: int, float, bool, literal, str
+    values: Optional[List[Any]] = None
+    distribution: Optional[str] = None
+    low: float = 0.0
+    high: float = 0.0
+
+    def sample(self, rng: random.Random):
+        if self.distribution == "randint":
+            return rng.randint(int(self.low), int(self.high))
+        if self.distribution == "loguniform":
+            value = math.exp(rng.uniform(math.log(self.low), math.log(self.high)))
+        else:
+            value = rng.uniform(self.low, self.high)
+        return round(value) if self.kind == "int" else value
+
+
+def _coerce(raw: str, spec: dict):
+    raw = raw.strip().strip("'\"")
+    kind = spec["kind"]
+    if kind == "bool":
+        if raw.lower() not in ("true", "false", "1", "0"):
+            raise ValueError(f"{spec['name']}: {raw!r} is not a bool")
+        return raw.lower() in ("true", "1")
+    if kind == "int":
+        return int(float(raw))
+    if kind == "float":
+        return float(raw)
+    if kind == "literal" and raw not in spec["choices"]:
+        raise ValueError(f"{spec['name']}: {raw!r} is not one of {spec['choices']}")
+    return raw
+
+
+def parse_sweep_spec(text: str, specs: Dict[str, dict]) -> List[SweepParam]:
+    """
+    Parse one ``field = values`` line per swept field. ``values`` is one of
+
+    - a list: ``0.01, 0.02, 0.05``
+    - a grid: ``grid(low, high, n)`` or ``loggrid(low, high, n)``
+    - a random range: ``uniform(low, high)``, ``loguniform(low, high)``, ``randint(low, high)``
+
+    ``specs`` are the field specs of the model config by name; values are
+    checked and converted against them. Raises ValueError on a bad spec.
+    """
+    params = []
+    for line in text.splitlines():
+        if not line.strip() or line.strip().startswith("#"):
+            continue
+        match = SPEC_LINE.match(line)
+        if match is None:
+            raise ValueError(f"Cannot parse sweep line: {line!r}")
+        name, values = match.groups()
+        if name not in specs:
+            raise ValueError(f"{name} is not a sweepable field of this model")
+        spec = specs[name]
+        kind = spec["kind"]
+
+        call = CALL.match(values)
+        if call is None:
+            params.append(SweepParam(name, kind, values=[_coerce(v, spec) for v in values.split(",")]))
+            continue
+
+        func, args = call.group(1), [float(a) for a in call.group(2).split(",")]
+        if kind not in ("int", "float"):
+            raise ValueError(f"{name}: {func}() needs a numeric field")
+        if func in GRID_FUNCTIONS:
+            if len(args) != 3 or args[2] < 2:
+                raise ValueError(f"{name}: {func}(low, high, n) needs n >= 2")
+            low, high, n = args[0], args[1], int(args[2])
+            if func == "loggrid":
+                low, high = math.log(low), math.log(high)
+            grid = [low + (high - low) * i / (n - 1) for i in range(n)]
+            if func == "loggrid":
+                grid = [math.exp(v) for v in grid]
+            if kind == "int":
+                grid = sorted(set(round(v) for v in grid))
+            params.append(SweepParam(name, kind, values=grid))
+        elif func in RANDOM_DISTRIBUTIONS:
+            if len(args) != 2:
+                raise ValueError(f"{name}: {func}(low, high) takes two arguments")
+            if func == "loguniform" and min(args) <= 0:
+                raise ValueError(f"{name}: loguniform needs positive bounds")
+            params.append(SweepParam(name, kind, distribution=func, low=args[0], high=args[1]))
+        else:
+            raise ValueError(f"{name}: unknown function {func}()")
+    return params
+
+
+def expand_runs(params: List[SweepParam], samples: int = 1, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    The run matrix: the cartesian product of all list/grid parameters, each
+    combination repeated ``samples`` times with fresh draws of the random
+    parameters (once if there are none).
+    """
+    fixed = [p for p in params if p.values is not None]
+    randoms = [p for p in params if p.values is None]
+    repeats = max(1, samples) if randoms else 1
+    total = math.prod(len(p.values) for p in fixed) * repeats
+    if total > MAX_RUNS:
+        raise ValueError(f"The sweep expands to {total} runs, more than {MAX_RUNS}")
+
+    rng = random.Random(seed)
+    runs = []
+    for combo in itertools.product(*[p.values for p in fixed]):
+        for _ in range(repeats):
+            run = dict(zip([p.name for p in fixed], combo))
+            for p in randoms:
+                run[p.name] = p.sample(rng)
+            runs.append(run)
+    return runs
+
+
+def best_value(values, direction: str = "min") -> Optional[float]:
+    """Best of ``values`` for a metric of the given direction, None if there are none."""
+    return (max if direction == "max" else min)(values, default=None)
+
+
+def best_so_far(series: List[Tuple[int, float]], step: int, direction: str = "min") -> Optional[float]:
+    """Best value reported up to ``step``."""
+    return best_value((value for s, value in series if s <= step), direction)
+
+
+@dataclass
+class MedianStoppingRule:
+    """
+    Stop a run whose best ``metric`` so far is worse than the median best of
+    the other runs at the same step; ``direction`` is "min" if lower values
+    are better, "max" if higher ones are. Runs are left alone for their first
+    ``grace_steps`` steps and until ``min_runs`` runs reached that step.
+    """
+
+    metric: str = "rgb_loss"
+    grace_steps: int = 1000
+    min_runs: int = 3
+    direction: str = "min"
+
+    def __post_init__(self):
+        if self.direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {DIRECTIONS}, not {self.direction!r}")
+
+    def should_stop(self, series: List[Tuple[int, float]], others: List[List[Tuple[int, float]]]) -> bool:
+        if not series:
+            return False
+        step = series[-1][0]
+        if step < self.grace_steps:
+            return False
+        # only runs that got at least as far are comparable
+        peers = [best_so_far(other, step, self.direction) for other in others if other and other[-1][0] >= step]
+        peers = [p for p in peers if p is not None]
+        if len(peers) + 1 < self.min_runs:
+            return False
+        best, median = best_so_far(series, step, self.direction), statistics.median(peers)
+        return best < median if self.direction == "max" else best > median
+
+
+def metric_series(telemetry, metric: str) -> List[Tuple[int, float]]:
+    """``(step, value)`` of one loss or train metric from a TelemetryBuffer, at full resolution."""
+    series = []
+    for sample in list(telemetry.samples):
+        values = {**sample.get("metrics", {}), **sample["losses"]}
+        if metric in values:
+            series.append((sample["step"], values[metric]))
+    return series
+
+
+@dataclass
+class SweepRun:
+    index: int
+    params: Dict[str, Any]
+    supervisor: Any  # TrainingSupervisor
+    job: Any  # Job
+    stopped_early: bool = False
+
+
+@dataclass
+class Sweep:
+    """
+    Bookkeeping of a launched sweep: early termination and the results table.
+
+    ``start`` applies the stopping rule from a background thread while runs are
+    active, so runs are stopped whether or not a browser shows the sweep.
+    """
+
+    sweep_id: str
+    runs: List[SweepRun] = field(default_factory=list)
+    stopping_rule: Optional[MedianStoppingRule] = None
+    metric: str = "rgb_loss"
+    direction: str = "min"
+    _stop: threading.Event = field(default_factory=threading.Event, repr=False)
+    _thread: Optional[threading.Thread] = field(default=None, repr=False)
+
+    def is_active(self) -> bool:
+        return any(run.job.is_active() for run in self.runs)
+
+    def start(self, interval: float = POLL_INTERVAL):
+        if self.stopping_rule is None or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._loop, args=(interval,), name=f"sweep-{self.sweep_id}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self, interval: float):
+        logger = logging.getLogger(self.__class__.__name__)
+        while not self._stop.wait(interval) and self.is_active():
+            try:
+                for run in self.poll():
+                    logger.info("Stopping underperforming run", extra={"sweep_id": self.sweep_id, "run": run.index})
+                    # stop() waits for the checkpoint to be written
+                    threading.Thread(
+                        target=run.supervisor.stop, name=f"sweep-{self.sweep_id}-stop", daemon=True
+                    ).start()
+            except Exception:
+                logger.exception("Sweep poll failed", extra={"sweep_id": self.sweep_id})
+
+    def poll(self) -> List[SweepRun]:
+        """Apply the stopping rule. Returns the runs that should be stopped now."""
+        if self.stopping_rule is None:
+            return []
+        series = {run.index: metric_series(run.supervisor.telemetry, self.metric) for run in self.runs}
+        to_stop = []
+        for run in self.runs:
+            if run.stopped_early or run.job.state != "running":
+                continue
+            others = [s for index, s in series.items() if index != run.index]
+            if self.stopping_rule.should_stop(series[run.index], others):
+                run.stopped_early = True
+                to_stop.append(run)
+        return to_stop
+
+    def rows(self) -> List[list]:
+        """One row per run, best runs first."""
+        rows = []
+        for run in self.runs:
+            series = metric_series(run.supervisor.telemetry, self.metric)
+            best = best_value((value for _, value in series), self.direction)
+            latest = run.supervisor.telemetry.latest()
+            state = "stopped early" if run.stopped_early else run.job.state
+            rows.append(
+                [
+                    run.index,
+                    ", ".join(f"{k}={_format_value(v)}" for k, v in run.params.items()),
+                    state,
+                    run.supervisor.status.get("step", 0),
+                    "" if best is None else round(best, 6),
+                    "" if latest is None else round(latest["steps_per_sec"], 2),
+                ]
+            )
+        sign = -1 if self.direction == "max" else 1
+        rows.sort(key=lambda row: (row[4] == "", sign * row[4] if row[4] != "" else 0))
+        return rows
+
+
+def _format_value(value) -> str:
+    return f"{value:.4g}" if isinstance(value, float) else str(value)
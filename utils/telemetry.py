@@ -0,0 +1,189 @@
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# seconds between two samples; sampling reads the losses back from the GPU, so not every step
+SAMPLE_INTERVAL = 1.0
+# points per series sent to the browser
+PLOT_POINTS = 300
+
+
+def process_rss(pid: Optional[int] = None) -> Optional[int]:
+    """Resident set size of a process in bytes, or None where it cannot be read."""
+    pid = pid or os.getpid()
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if pid != os.getpid():
+        return None
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # peak rather than current RSS; kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def lttb(points: Sequence[Tuple[float, float]], threshold: int) -> List[Tuple[float, float]]:
+    """
+    Downsample ``points`` (sorted by x) to ``threshold`` points with
+    Largest-Triangle-Three-Buckets, which keeps the visual shape (peaks and
+    dips) of the series instead of averaging it away.
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0  # index of the previously selected point
+    for i in range(threshold - 2):
+        # average of the next bucket is the third triangle vertex
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        count = next_end - next_start
+        avg_x = sum(p[0] for p in points[next_start:next_end]) / count
+        avg_y = sum(p[1] for p in points[next_start:next_end]) / count
+
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = points[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        a = best
+    sampled.append(points[-1])
+    return sampled
+
+
+class TelemetryBuffer:
+    """
+    Fixed-size ring buffer of training samples.
+
+    Each sample holds ``time``, ``step``, ``steps_per_sec``, ``eta`` (seconds
+    to ``max_steps``), ``rss`` (bytes), ``losses`` and ``metrics`` (name → float).
+    """
+
+    def __init__(self, max_steps: Optional[int] = None, maxlen: int = 4096):
+        self.max_steps = max_steps
+        self.samples = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        step: int,
+        losses: Dict[str, float],
+        rss: Optional[int] = None,
+        now: Optional[float] = None,
+        metrics: Optional[Dict[str, float]] = None,
+    ) -> dict:
+        now = time.time() if now is None else now
+        with self._lock:
+            steps_per_sec = 0.0
+            if self.samples:
+                last = self.samples[-1]
+                if now > last["time"] and step >= last["step"]:
+                    steps_per_sec = (step - last["step"]) / (now - last["time"])
+            eta = None
+            if self.max_steps and steps_per_sec > 0:
+                eta = max(self.max_steps - step, 0) / steps_per_sec
+            sample = {
+                "time": now,
+                "step": step,
+                "steps_per_sec": steps_per_sec,
+                "eta": eta,
+                "rss": rss,
+                "losses": dict(losses),
+                "metrics": dict(metrics or {}),
+            }
+            self.samples.append(sample)
+        return sample
+
+    def add(self, sample: dict):
+        """Append a sample recorded elsewhere (e.g. received from a training process)."""
+        with self._lock:
+            if not self.samples or sample["time"] > self.samples[-1]["time"]:
+                self.samples.append(sample)
+
+    def latest(self) -> Optional[dict]:
+        with self._lock:
+            return self.samples[-1] if self.samples else None
+
+    def series(self, key: str, points: int = PLOT_POINTS) -> Dict[str, List[Tuple[float, float]]]:
+        """
+        Downsampled ``(step, value)`` series. ``key`` is ``"losses"`` for one
+        series per loss, or a scalar sample field such as ``"steps_per_sec"``.
+        """
+        with self._lock:
+            samples = list(self.samples)
+        raw: Dict[str, List[Tuple[float, float]]] = {}
+        for sample in samples:
+            values = sample["losses"] if key == "losses" else {key: sample[key]}
+            for name, value in values.items():
+                if value is not None:
+                    raw.setdefault(name, []).append((sample["step"], value))
+        return {name: lttb(values, points) for name, values in raw.items()}
+
+    def summary(self) -> str:
+        sample = self.latest()
+        if sample is None:
+            return "No telemetry yet"
+        parts = [f"step {sample['step']}", f"{sample['steps_per_sec']:.2f} it/s"]
+        if sample["eta"] is not None:
+            parts.append(f"ETA {_format_seconds(sample['eta'])}")
+        if sample["rss"] is not None:
+            parts.append(f"RSS {sample['rss'] / 2**30:.2f} GiB")
+        losses = ", ".join(f"{name} {value:.4g}" for name, value in sorted(sample["losses"].items()))
+        return " | ".join(parts) + (f"\n{losses}" if losses else "")
+
+
+def _format_seconds(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+def _scalars(values: Dict) -> Dict[str, float]:
+    """The entries of a metrics dict that are single numbers."""
+    scalars = {}
+    for name, value in values.items():
+        try:
+            scalars[name] = float(value)
+        except (TypeError, ValueError, RuntimeError):  # tensors with more than one element
+            continue
+    return scalars
+
+
+def sampled_train_iteration(train_iteration, telemetry: TelemetryBuffer, interval: float = SAMPLE_INTERVAL):
+    """
+    Wrap a nerfstudio ``Trainer.train_iteration`` so that every ``interval``
+    seconds its loss dict and scalar train metrics (e.g. ``psnr``) are recorded
+    into ``telemetry``. Between samples the wrapper only reads the clock.
+    """
+    next_sample = 0.0
+
+    def _train_iteration(step):
+        nonlocal next_sample
+        loss, loss_dict, metrics_dict = train_iteration(step)
+        now = time.monotonic()
+        if now >= next_sample:
+            next_sample = now + interval
+            losses = {name: float(value) for name, value in loss_dict.items()}
+            losses["loss"] = float(loss)
+            telemetry.record(step, losses, process_rss(), metrics=_scalars(metrics_dict))
+        return loss, loss_dict, metrics_dict
+
+    return _train_iteration
@@ -1,26 +1,34 @@
 import random
+from typing import TYPE_CHECKING
 
-import numpy as np
 import yaml
-from torch import manual_seed
 
-from nerfstudio.engine.trainer import TrainerConfig
-from nerfstudio.scripts import train
-from nerfstudio.utils.rich_utils import CONSOLE
+from utils.checkpoint_resume import config_final_step
+from utils.telemetry import TelemetryBuffer, sampled_train_iteration
+
+# torch and nerfstudio are imported when training starts, not when the WebUI
+# imports the Trainer tab, so the server can bind before they are loaded.
+if TYPE_CHECKING:
+    from nerfstudio.engine.trainer import TrainerConfig
 
 
 class WebUITrainer:
     def __init__(self):
         self.trainer = None
         self.config = None
+        self.telemetry = TelemetryBuffer()
+        self.stop_requested = False
 
     def train_loop(
         self,
         local_rank: int,
         world_size: int,
-        config: TrainerConfig,
+        config: "TrainerConfig",
         global_rank: int = 0,
     ):
+        import numpy as np
+        from torch import manual_seed
+
         def _set_random_seed(seed) -> None:
             """Set randomness seed in torch and numpy"""
             random.seed(seed)
@@ -30,9 +38,23 @@ class WebUITrainer:
         _set_random_seed(config.machine.seed + global_rank)
         self.trainer = config.setup(local_rank=local_rank, world_size=world_size)
         self.trainer.setup()
+        if self.stop_requested:
+            # cancelled while setting up; train() would reset stop_training
+            return
+        self.telemetry = TelemetryBuffer(max_steps=config_final_step(config))
+        self.trainer.train_iteration = sampled_train_iteration(self.trainer.train_iteration, self.telemetry)
         self.trainer.train()
 
+    def request_stop(self):
+        """Stop the in-process training after the current iteration (on_cancel of its job)."""
+        self.stop_requested = True
+        if self.trainer is not None:
+            self.trainer.shutdown()
+
     def main(self):
+        from nerfstudio.scripts import train
+        from nerfstudio.utils.rich_utils import CONSOLE
+
         assert self.config is not None, "Config is not set"
         if self.config.data:
             CONSOLE.log("Using --data alias for --data.pipeline.datamanager.data")
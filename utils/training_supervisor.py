@@ -0,0 +1,180 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+from typing import TYPE_CHECKING, Optional
+
+from utils.device_slots import DeviceSlot
+from utils.checkpoint_resume import config_final_step
+from utils.telemetry import TelemetryBuffer
+from utils.trainer import WebUITrainer
+
+if TYPE_CHECKING:
+    from nerfstudio.engine.trainer import TrainerConfig
+
+# seconds between two status messages from the training process
+REPORT_INTERVAL = 0.5
+# seconds a stopped training gets to save and exit before it is terminated
+STOP_TIMEOUT = 30.0
+
+COMMANDS = ("pause", "resume", "stop")
+
+
+class TrainingSupervisor:
+    """
+    Runs ``WebUITrainer.main`` for one config in a child process.
+
+    The child reports ``step``, ``state``, ``steps_per_sec``, its output
+    directories and its latest telemetry sample over a pipe every
+    ``REPORT_INTERVAL`` seconds and takes pause / resume / stop commands back.
+    The samples are collected into ``telemetry`` on this side. A crash or OOM of the training only
+    ends the child; the WebUI keeps serving and sees a non-zero exit code.
+    """
+
+    def __init__(self, config: "TrainerConfig"):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.config = config
+        self.status = {"state": "starting", "step": 0, "steps_per_sec": 0.0}
+        self.telemetry = TelemetryBuffer(max_steps=config_final_step(config))
+        self.process = None
+        self._conn = None
+        self._send_lock = threading.Lock()
+        self._stopping = False
+
+    def run(self, slot: Optional[DeviceSlot] = None) -> int:
+        """
+        Start the training process, pinned to ``slot`` if given, and block
+        until it exits. Returns its exit code.
+        """
+        # CUDA cannot be re-initialised in a forked child
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        self._conn = parent_conn
+        self.process = ctx.Process(
+            target=_supervised_main, args=(self.config, child_conn, slot), name="training", daemon=False
+        )
+        self.process.start()
+        child_conn.close()
+        self.logger.info(
+            "Training process started",
+            extra={"pid": self.process.pid, "slot": slot.name if slot is not None else None},
+        )
+
+        while True:
+            try:
+                message = parent_conn.recv()
+            except (EOFError, OSError):
+                break
+            self.status = message
+            if message.get("telemetry"):
+                self.telemetry.add(message["telemetry"])
+
+        self.process.join()
+        code = self.process.exitcode
+        if self.status.get("state") not in ("completed", "stopped", "failed"):
+            # exited without a final report: killed, OOM, segfault...
+            self.status = dict(self.status, state="failed" if code else "stopped")
+        self.logger.info("Training process exited", extra={"exitcode": code, "state": self.status["state"]})
+        # a requested stop is a normal end, even if the process had to be terminated
+        return 0 if self._stopping else code
+
+    def send(self, command: str) -> bool:
+        """Send a command to the training process. Returns False if it is not running."""
+        assert command in COMMANDS, f"Unknown command: {command}"
+        if self._conn is None or self.process is None or not self.process.is_alive():
+            return False
+        with self._send_lock:
+            try:
+                self._conn.send(command)
+            except (BrokenPipeError, OSError):
+                return False
+        return True
+
+    def stop(self, timeout: float = STOP_TIMEOUT):
+        """Ask the training to save and exit; terminate it if it does not within ``timeout`` seconds."""
+        self._stopping = True
+        if not self.send("stop"):
+            return
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.logger.warning("Training did not stop in time, terminating", extra={"pid": self.process.pid})
+            self.process.terminate()
+
+
+def _supervised_main(config: "TrainerConfig", conn, slot: Optional[DeviceSlot] = None):
+    """Entry point of the training process."""
+    if slot is not None:
+        # the spawned child is a fresh interpreter; unpickling ``config`` has already imported torch,
+        # but CUDA_VISIBLE_DEVICES is only read when CUDA is initialised, which WebUITrainer does later
+        slot.apply()
+    trainer = WebUITrainer()
+    trainer.config = config
+    send_lock = threading.Lock()
+    finished = threading.Event()
+
+    def send(message, final=False):
+        with send_lock:
+            # nothing may overwrite the final report
+            if finished.is_set():
+                return
+            if final:
+                finished.set()
+            try:
+                conn.send(message)
+            except (BrokenPipeError, OSError):
+                pass
+
+    def status(state=None):
+        current = trainer.trainer
+        message = {"state": state or "starting", "step": 0, "steps_per_sec": 0.0}
+        if current is not None:
+            message.update(
+                state=state or current.training_state,
+                step=current.step,
+                checkpoint_dir=str(current.checkpoint_dir),
+                base_dir=str(trainer.config.get_base_dir()),
+                telemetry=trainer.telemetry.latest(),
+            )
+        return message
+
+    def report():
+        last_step, last_time = 0, time.monotonic()
+        while True:
+            time.sleep(REPORT_INTERVAL)
+            message = status()
+            now = time.monotonic()
+            if message["step"] > last_step:
+                message["steps_per_sec"] = (message["step"] - last_step) / (now - last_time)
+            last_step, last_time = message["step"], now
+            send(message)
+
+    def listen():
+        while True:
+            try:
+                command = conn.recv()
+            except (EOFError, OSError):
+                # the WebUI went away, do not keep training headless
+                command = "stop"
+            current = trainer.trainer
+            if command == "stop":
+                if current is None:
+                    os._exit(0)
+                current.shutdown()
+                return
+            if current is not None:
+                current.training_state = "paused" if command == "pause" else "training"
+
+    threading.Thread(target=report, name="training-report", daemon=True).start()
+    threading.Thread(target=listen, name="training-commands", daemon=True).start()
+    try:
+        trainer.main()
+    except BaseException:
+        send(dict(status("failed"), error=traceback.format_exc()), final=True)
+        raise
+    final = status()
+    if final["state"] != "completed":
+        final["state"] = "stopped"
+    send(final, final=True)
+    conn.close()
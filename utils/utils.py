@@ -1,16 +1,16 @@
 import os
 import subprocess
 # import tkinter as tk
-from dataclasses import asdict, fields, is_dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple, Type
-from typing_extensions import TypedDict
+from typing import Dict, Tuple
 # from tkinter import filedialog
-import re
-from typing import get_origin, get_args, Literal
+from functools import partial
 
 import gradio as gr
 
+from utils.run_index import RUN_COLUMNS, run_rows
+from utils.schema_cache import get_schema_cache, resolve_instance_specs
+
 
 def run_cmd(cmd):
     if os.name == "nt":  # Windows
@@ -56,80 +56,45 @@ def run_cmd(cmd):
                 "No suitable terminal emulator found. Please install one of the supported terminals or update the script."
             )
 
-class FieldConstraint(TypedDict):
-    type: Any
-    valid_values: Optional[Tuple[Any, ...]]
-    default: Any
 
-def extract_field_info(dataclass_type: Type[Any]) -> Dict[str, FieldConstraint]:
+def config_specs(config, key=None):
+    """
+    Field specs of a config instance, read from the schema cache when a ``key`` is given.
     """
-    Extracts type, default, and literal options from all fields of a dataclass.
+    if key is None:
+        return resolve_instance_specs(config)
+    return get_schema_cache().get(key, config, resolve_instance_specs)
 
-    Args:
-        dataclass_type: A class object decorated with @dataclass.
 
-    Returns:
-        A dict mapping field names to a dict with keys:
-          - "type": the annotated type of the field
-          - "valid_values": a tuple of valid Literal values, or None
-          - "default": the default value, or None if none is set
+def generate_args(config, visible=True, key=None):
+    """
+    Build one Gradio component per supported field of ``config``.
+
+    ``key`` names the config in the schema cache (e.g. ``model/nerfacto``);
+    without it the specs are resolved every time.
     """
-    if not is_dataclass(dataclass_type):
-        raise ValueError("Provided type is not a dataclass")
-
-    result = {}
-    for f in fields(dataclass_type):
-        type_ = f.type
-        origin = get_origin(type_)
-        valid_values = get_args(type_) if origin is Literal else None
-
-        try:
-            default = f.default if f.default is not f.default_factory else None
-        except AttributeError:
-            default = None
-
-        result[f.name] = {
-            "type": type_,
-            "valid_values": valid_values,
-            "default": default
-        }
-
-    return result
-
-def generate_args(config, visible=True):
-    # config_dict = asdict(config)
-    # config_fields = fields(config)
-    # print(config_fields)
     config_inputs = []
     config_labels = []
-    for field in fields(config):
-        config_labels.append(field.name)
-        value = getattr(config, field.name)
-        type = field.type  # string
-        # print(field.name, value, type)
-        # special case for Literal
-        pattern = r"(?:typing_extensions\.Literal|typing\.Literal|Literal)\[(.*?)\]"
-        matches = re.findall(pattern, str(type))
-        if matches:
-            # print("matches", matches)
-            if isinstance(value, str):
-                values = matches[0].split(", ")
-                values = [value.strip("'\"()") for value in values]
-                # create a radio button
-                config_inputs.append(
-                    gr.Radio(
-                        choices=values,
-                        label=field.name,
-                        visible=visible,
-                        interactive=True,
-                        value=value,
-                    )
+    for spec in config_specs(config, key):
+        config_labels.append(spec["name"])
+        kind = spec["kind"]
+        value = spec["default"]
+        if kind == "literal":
+            # create a radio button
+            config_inputs.append(
+                gr.Radio(
+                    choices=spec["choices"],
+                    label=spec["name"],
+                    visible=visible,
+                    interactive=True,
+                    value=value,
                 )
+            )
         # if type is float, then add a textbox
-        elif isinstance(value, float):
+        elif kind == "float":
             config_inputs.append(
                 gr.Number(
-                    label=field.name,
+                    label=spec["name"],
                     value=value,
                     visible=visible,
                     interactive=True,
@@ -137,94 +102,101 @@ def generate_args(config, visible=True):
                 )
             )
         # if type is bool, then add a checkbox
-        elif isinstance(value, bool):
+        elif kind == "bool":
             config_inputs.append(
                 gr.Checkbox(
-                    label=field.name, value=value, visible=visible, interactive=True
+                    label=spec["name"], value=value, visible=visible, interactive=True
                 )
             )
         # if type is int, then add a number
-        elif isinstance(value, int):
+        elif kind == "int":
             config_inputs.append(
                 gr.Number(
-                    label=field.name,
+                    label=spec["name"],
                     value=value,
                     visible=visible,
                     interactive=True,
                     precision=0,
                 )
             )
-        elif isinstance(value, str):
+        else:
             config_inputs.append(
                 gr.Textbox(
-                    label=field.name,
+                    label=spec["name"],
                     lines=1,
                     value=value,
                     visible=visible,
                     interactive=True,
                 )
             )
-        else:
-            # erase the last one
-            config_labels.pop()
-            continue
-
-    # print(config_dict)
-    # for key, value in config_dict.items():
-    #     # if type is float, then add a textbox
-    #     config_labels.append(key)
-    #     if isinstance(value, float):
-    #         config_inputs.append(
-    #             gr.Number(
-    #                 label=key, value=value, visible=visible, interactive=True, step=0.01
-    #             )
-    #         )
-    #     # if type is bool, then add a checkbox
-    #     elif isinstance(value, bool):
-    #         config_inputs.append(
-    #             gr.Checkbox(label=key, value=value, visible=visible, interactive=True)
-    #         )
-    #     # if type is int, then add a number
-    #     elif isinstance(value, int):
-    #         config_inputs.append(
-    #             gr.Number(
-    #                 label=key,
-    #                 value=value,
-    #                 visible=visible,
-    #                 interactive=True,
-    #                 precision=0,
-    #             )
-    #         )
-    #     # if type is Literal, then add a radio
-    #     # TODO: fix this
-    #     elif hasattr(value, "__origin__") and value.__origin__ is Literal:
-    #         print(value.__args__)
-    #         config_inputs.append(
-    #             gr.Radio(
-    #                 choices=value.__args__, label=key, visible=visible, interactive=True
-    #             )
-    #         )
-    #     # if type is str, then add a textbox
-    #     elif isinstance(value, str):
-    #         config_inputs.append(
-    #             gr.Textbox(
-    #                 label=key, lines=1, value=value, visible=visible, interactive=True
-    #             )
-    #         )
-    #     else:
-    #         # erase the last one
-    #         config_labels.pop()
-    #         continue
-    # print(config_inputs)
     return config_inputs, config_labels
 
 
+# config key (e.g. model/nerfacto) → (labels, default values) of its components rendered on demand; the same
+# for every session, unlike the values a session changed, which are kept in its gr.State
+_rendered_defaults: Dict[str, Tuple[list, list]] = {}
+
+
+def track_rendered_args(components, labels, state, key):
+    """
+    Record the values of components created inside a ``gr.render`` block.
+
+    Components built on demand cannot be listed as inputs of the static run
+    buttons, so every change is stored in ``state``, a gr.State of the browser
+    session, as ``{"key": key, "values": {index: value}}``. ``rendered_args``
+    reads the values back for the config the run was started with.
+    """
+    _rendered_defaults[key] = (list(labels), [component.value for component in components])
+    for i, component in enumerate(components):
+        component.change(partial(_set_rendered_arg, key, i), inputs=[state, component], outputs=state)
+
+
+def _set_rendered_arg(key, index, current, value):
+    # values changed for another config (e.g. the previously selected method) are dropped
+    values = dict(current["values"]) if current and current.get("key") == key else {}
+    values[index] = value
+    return {"key": key, "values": values}
+
+
+def rendered_args(current, key):
+    """
+    (names, values) of the config ``key`` rendered on demand: the defaults of
+    its components with the values this session changed. Nothing if ``key``
+    was never rendered.
+    """
+    labels, defaults = _rendered_defaults.get(key, ([], []))
+    changed = current["values"] if current and current.get("key") == key else {}
+    return labels, [changed.get(i, default) for i, default in enumerate(defaults)]
+
+
 def get_folder_path(x):
     if len(x) > 0:
         x = x[0]
     return str(x)
 
 
+def run_picker(root_dir, target):
+    """
+    Sortable table of the training runs below ``root_dir``, read from the run
+    index instead of walking the tree. Selecting a row puts the config path of
+    the run into ``target``. Returns the table and the function refreshing it.
+    """
+    table = gr.Dataframe(
+        headers=RUN_COLUMNS,
+        label="Runs",
+        interactive=False,
+        max_height=300,
+        show_search="filter",
+    )
+    table.select(_selected_config, inputs=None, outputs=target)
+    return table, partial(run_rows, root_dir)
+
+
+def _selected_config(evt: gr.SelectData):
+    # the config path is the last column of the selected row
+    return evt.row_value[-1]
+
+
 def browse_folder():
     root = tk.Tk()
     root.wm_attributes("-topmost", 1)
@@ -0,0 +1,140 @@
+"""
+Extract frames from a video with several ffmpeg processes at once, then hand
+the frames to the images pipeline:
+
+    python utils/video_frames.py --data capture.mp4 --staging data/garden/video_frames --num-frames 300 \
+        -- ns-process-data images --data data/garden/video_frames --output_dir data/garden
+
+The video is split into one time segment per worker and every ffmpeg process
+decodes only its segment, so long (4K) videos use all cores instead of one
+decoder. The frames are sampled evenly over the whole video and numbered
+frame_00001.png, ... in time order. Needs ffmpeg and ffprobe on the PATH.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+# default of VideoToNerfstudioDataset.num_frames_target
+NUM_FRAMES_TARGET = 300
+
+
+@dataclass
+class Segment:
+    index: int
+    start: float  # seconds
+    length: float
+    frames: int  # frames sampled from this segment
+
+
+def probe_duration(video: Path, ffprobe: str = "ffprobe") -> float:
+    out = subprocess.run(
+        [ffprobe, "-v", "error", "-show_entries", "format=duration", "-of", "default=nw=1:nk=1", str(video)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(out.strip())
+
+
+def plan_segments(duration: float, num_frames: int, segments: int) -> List[Segment]:
+    """
+    Split the ``num_frames`` evenly spaced samples of ``duration`` into
+    ``segments`` runs of consecutive samples. Each segment spans the time of
+    its samples, so the segments tile the video.
+    """
+    segments = max(1, min(segments, num_frames))
+    period = duration / num_frames
+    bounds = [round(i * num_frames / segments) for i in range(segments + 1)]
+    return [
+        Segment(i, bounds[i] * period, (bounds[i + 1] - bounds[i]) * period, bounds[i + 1] - bounds[i])
+        for i in range(segments)
+    ]
+
+
+def segment_argv(
+    video: Path, segment: Segment, frame_rate: float, output_pattern: str, threads: int, ffmpeg: str = "ffmpeg"
+) -> List[str]:
+    """ffmpeg command sampling ``segment.frames`` frames at ``frame_rate`` from one segment."""
+    return [
+        ffmpeg, "-v", "error", "-nostdin", "-y",
+        "-threads", str(threads),
+        # seeking before -i jumps to the keyframe before start and decodes only from there
+        "-ss", f"{segment.start:.6f}",
+        "-t", f"{segment.length:.6f}",
+        "-i", str(video),
+        "-vf", f"fps={frame_rate:.9f}",
+        "-frames:v", str(segment.frames),
+        output_pattern,
+    ]
+
+
+def extract_frames(
+    video: Path,
+    output_dir: Path,
+    num_frames: int = NUM_FRAMES_TARGET,
+    workers: Optional[int] = None,
+    ffmpeg: str = "ffmpeg",
+    ffprobe: str = "ffprobe",
+) -> int:
+    """
+    Sample ``num_frames`` frames from ``video`` into ``output_dir`` with
+    ``workers`` ffmpeg processes (1 decodes the video in one pass). Returns
+    the number of frames written.
+    """
+    cores = os.cpu_count() or 1
+    workers = workers or cores
+    duration = probe_duration(video, ffprobe)
+    segments = plan_segments(duration, num_frames, workers)
+    frame_rate = num_frames / duration
+    threads = max(1, cores // len(segments))
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    def run(segment: Segment) -> List[Path]:
+        pattern = output_dir / f"segment_{segment.index:03d}_%05d.png"
+        subprocess.run(segment_argv(video, segment, frame_rate, str(pattern), threads, ffmpeg), check=True)
+        return sorted(output_dir.glob(f"segment_{segment.index:03d}_*.png"))
+
+    # every worker only waits for its ffmpeg process, the decoding runs in parallel processes
+    with ThreadPoolExecutor(max_workers=len(segments), thread_name_prefix="video-segment") as pool:
+        parts = list(pool.map(run, segments))
+    count = 0
+    for part in parts:
+        for frame in part:
+            count += 1
+            os.replace(frame, output_dir / f"frame_{count:05d}.png")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract video frames in parallel, then run a command on them")
+    parser.add_argument("--data", type=Path, required=True, help="video file")
+    parser.add_argument("--staging", type=Path, required=True, help="folder the frames are written to")
+    parser.add_argument("--num-frames", type=int, default=NUM_FRAMES_TARGET)
+    parser.add_argument("--workers", type=int, default=0, help="parallel ffmpeg processes (default: cores)")
+    parser.add_argument("--cleanup", action="store_true", help="remove the staging folder after the command succeeded")
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="command run on the frames, after --")
+    args = parser.parse_args()
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+
+    if args.staging.exists():
+        shutil.rmtree(args.staging)
+    start = time.time()
+    count = extract_frames(args.data, args.staging, args.num_frames, args.workers or None)
+    print(f"Extracted {count} frames in {time.time() - start:.1f}s", flush=True)
+    if not command:
+        return
+    returncode = subprocess.run(command).returncode
+    if returncode == 0 and args.cleanup:
+        shutil.rmtree(args.staging, ignore_errors=True)
+    sys.exit(returncode)
+
+
+if __name__ == "__main__":
+    main()
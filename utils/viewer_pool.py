@@ -0,0 +1,177 @@
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import yaml
+
+from utils.checkpoint_resume import checkpoint_steps
+from utils.job_manager import get_job_manager
+from utils.output_stream import OutputBuffer
+from utils.run_index import parse_run_config
+
+VIEWER_URL = re.compile(r"https?://\S+")
+VIEWER_COLUMNS = ["Config", "Step", "Port", "State", "Idle (min)"]
+# seconds between two checks for idle viewers
+SWEEP_INTERVAL = 60.0
+
+
+@dataclass
+class WarmViewer:
+    config_path: str
+    step: Optional[int]  # latest checkpoint step when the viewer was started
+    port: int
+    job: object  # Job
+    output: OutputBuffer = field(default_factory=OutputBuffer)
+    ready: threading.Event = field(default_factory=threading.Event)
+    last_used: float = field(default_factory=time.time)
+
+    def on_line(self, line: str):
+        if VIEWER_URL.search(line):
+            self.ready.set()
+
+
+def latest_step(config_path: str) -> Optional[int]:
+    """Latest checkpoint step in the model dir of a run's config.yml, which ns-viewer loads."""
+    try:
+        model_dir = parse_run_config(Path(config_path).read_text())["model_dir"]
+    except (OSError, yaml.YAMLError, AttributeError):
+        model_dir = "nerfstudio_models"
+    steps = checkpoint_steps(os.path.join(os.path.dirname(config_path), model_dir))
+    return steps[0] if steps else None
+
+
+class ViewerPool:
+    """
+    Keeps up to ``capacity`` ns-viewer processes warm, keyed by config path and
+    latest checkpoint step.
+
+    Opening a run that has a live viewer reuses it and its port. Otherwise a
+    viewer is started and, when the pool is full, the least recently used one
+    is stopped. A viewer of an older checkpoint of the same run is replaced.
+    Viewers not opened for ``idle_timeout`` seconds are stopped (0 keeps them).
+    """
+
+    def __init__(self, capacity: int, idle_timeout: float, port_factory: Callable[[], int]):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.capacity = max(1, capacity)
+        self.idle_timeout = idle_timeout
+        self.port_factory = port_factory
+        self.viewers: "OrderedDict[str, WarmViewer]" = OrderedDict()  # config path → viewer, LRU first
+        self._lock = threading.Lock()
+        self._sweeper = None
+
+    def acquire(self, config_path: str) -> Tuple[WarmViewer, bool]:
+        """The viewer of ``config_path``, and whether it was already running."""
+        config_path = os.path.abspath(config_path)
+        step = latest_step(config_path)
+        with self._lock:
+            self._drop_exited()
+            viewer = self.viewers.get(config_path)
+            if viewer is not None and viewer.step == step:
+                viewer.last_used = time.time()
+                self.viewers.move_to_end(config_path)
+                self.logger.info("Reusing warm viewer", extra={"config": config_path, "port": viewer.port})
+                return viewer, True
+            if viewer is not None:
+                # a newer checkpoint was saved since the viewer loaded the run
+                self._evict(config_path, "stale")
+            while len(self.viewers) >= self.capacity:
+                self._evict(next(iter(self.viewers)), "least recently used")
+            viewer = self._start(config_path, step)
+            self.viewers[config_path] = viewer
+            self._start_sweeper()
+        return viewer, False
+
+    def release(self, config_path: str) -> bool:
+        """Stop the viewer of ``config_path``. Returns False if there is none."""
+        with self._lock:
+            if os.path.abspath(config_path) not in self.viewers:
+                return False
+            self._evict(os.path.abspath(config_path), "stopped")
+            return True
+
+    def clear(self):
+        with self._lock:
+            for config_path in list(self.viewers):
+                self._evict(config_path, "stopped")
+
+    def sweep(self):
+        """Stop the viewers that were idle for longer than ``idle_timeout``."""
+        if not self.idle_timeout:
+            return
+        now = time.time()
+        with self._lock:
+            self._drop_exited()
+            for config_path, viewer in list(self.viewers.items()):
+                if now - viewer.last_used > self.idle_timeout:
+                    self._evict(config_path, "idle")
+
+    def rows(self) -> List[list]:
+        """One row per warm viewer in VIEWER_COLUMNS order, most recently used first."""
+        now = time.time()
+        with self._lock:
+            viewers = list(reversed(self.viewers.values()))
+        return [
+            [
+                v.config_path,
+                "" if v.step is None else v.step,
+                v.port,
+                "ready" if v.ready.is_set() else v.job.state,
+                round((now - v.last_used) / 60, 1),
+            ]
+            for v in viewers
+        ]
+
+    def _start(self, config_path: str, step: Optional[int]) -> WarmViewer:
+        # called with self._lock held
+        port = self.port_factory()
+        viewer = WarmViewer(config_path, step, port, job=None)
+        viewer.job = get_job_manager().submit(
+            f"viewer: {config_path}",
+            "viewer",
+            argv=self.viewer_argv(config_path, port),
+            output=viewer.output,
+            on_line=viewer.on_line,
+        )
+        self.logger.info("Viewer started", extra={"config": config_path, "port": port, "job_id": viewer.job.job_id})
+        return viewer
+
+    def viewer_argv(self, config_path: str, port: int) -> List[str]:
+        """Command line of the viewer of ``config_path`` on websocket ``port``."""
+        return ["ns-viewer", "--load-config", config_path, "--viewer.websocket-port", str(port)]
+
+    def _evict(self, config_path: str, reason: str):
+        # called with self._lock held
+        viewer = self.viewers.pop(config_path)
+        self.logger.info("Stopping viewer", extra={"config": config_path, "port": viewer.port, "reason": reason})
+        # cancel() may wait out the grace period of the process, not under the pool lock
+        threading.Thread(
+            target=get_job_manager().cancel, args=(viewer.job.job_id,), name="viewer-stop", daemon=True
+        ).start()
+
+    def _drop_exited(self):
+        # called with self._lock held
+        for config_path, viewer in list(self.viewers.items()):
+            if not viewer.job.is_active():
+                del self.viewers[config_path]
+
+    def _start_sweeper(self):
+        # called with self._lock held
+        if self._sweeper is not None or not self.idle_timeout:
+            return
+        self._sweeper = threading.Thread(target=self._sweep_loop, name="viewer-pool-sweep", daemon=True)
+        self._sweeper.start()
+
+    def _sweep_loop(self):
+        while True:
+            time.sleep(min(SWEEP_INTERVAL, self.idle_timeout))
+            try:
+                self.sweep()
+            except Exception:
+                self.logger.exception("Viewer sweep failed")
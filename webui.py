@@ -1,13 +1,26 @@
 import os
 import sys
 import json
+import queue
+import atexit
+import copy
 import logging
-from logging.handlers import RotatingFileHandler
+from collections import OrderedDict
+from contextlib import nullcontext
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 
 import gradio as gr
 import argparse
 
+from utils.checkpoint_eval import configure_checkpoint_evaluator
+from utils.dataset_cache import configure_dataset_cache
+from utils.device_slots import build_device_slots
+from utils.job_manager import DEFAULT_LIMITS, MAX_FINISHED_JOBS, configure_job_manager, job_id_of_thread
+from utils.output_log import DEFAULT_ERROR_PATTERN, OutputLogPolicy
+from utils.profiler import StartupProfiler
+from utils.schema_cache import get_schema_cache
+
 class JSONFormatter(logging.Formatter):
     def format(self, record):
         log_record = {
@@ -26,16 +39,92 @@ class JSONFormatter(logging.Formatter):
                 "pathname","filename","module","exc_info",
                 "exc_text","stack_info","lineno","funcName",
                 "created","msecs","relativeCreated","thread",
-                "threadName","processName","process",
+                "threadName","processName","process","taskName",
+                "message","asctime",
             )
         }
         log_record.update(extras)
-        return json.dumps(log_record)
+        if record.exc_info:
+            log_record["exc_info"] = self.formatException(record.exc_info)
+        # extras may hold paths, namespaces, ...
+        return json.dumps(log_record, default=str)
+
+
+class JobContextFilter(logging.Filter):
+    """Tag records emitted by a job's runner or output thread with its ``job_id``."""
+
+    def filter(self, record):
+        if not hasattr(record, "job_id"):
+            job_id = job_id_of_thread(record.threadName)
+            if job_id is not None:
+                record.job_id = job_id
+        return True
+
+
+class JobLogHandler(logging.Handler):
+    """
+    Write every record carrying a ``job_id`` to ``<log_dir>/job-<id>.log``.
+
+    At most ``max_open`` files are kept open; the least recently written one
+    is closed first.
+    """
+
+    def __init__(self, log_dir, max_open=32):
+        super().__init__()
+        self.log_dir = log_dir
+        self.max_open = max_open
+        self.handlers = OrderedDict()  # job_id → FileHandler
+        os.makedirs(log_dir, exist_ok=True)
+
+    def emit(self, record):
+        job_id = getattr(record, "job_id", None)
+        if job_id is None:
+            return
+        handler = self.handlers.pop(job_id, None)
+        if handler is None:
+            handler = logging.FileHandler(os.path.join(self.log_dir, f"job-{job_id}.log"))
+            handler.setFormatter(self.formatter)
+            if len(self.handlers) >= self.max_open:
+                _, oldest = self.handlers.popitem(last=False)
+                oldest.close()
+        self.handlers[job_id] = handler
+        handler.emit(record)
+
+    def close(self):
+        for handler in self.handlers.values():
+            handler.close()
+        self.handlers.clear()
+        super().close()
 
-def setup_logging():
+
+class RecordQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves the formatting to the listener's handlers.
+
+    ``QueueHandler.prepare`` formats the record, traceback included, into
+    ``msg`` and drops ``exc_info``, so the JSON formatter would lose its
+    ``exc_info`` field. Only the message arguments are merged here.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        return record
+
+
+def setup_logging(async_logging=False, log_format="text", job_log_dir="logs/jobs"):
+    """
+    Configure the root logger: console, rotating ``logs/webui.log`` and one file per job.
+
+    With ``async_logging`` the root logger only puts records on a queue and a
+    background listener does the formatting and I/O, so logging from request
+    and output threads never waits on the disk. Returns the listener, if any.
+    """
     lvl = os.getenv("WEBUI_LOG_LEVEL", "INFO").upper()
     fmt = "[%(levelname)s] [%(asctime)s] [%(module)s] [%(funcName)s] %(message)s"
     datefmt = "%Y-%m-%d %H:%M:%S"
+    formatter = JSONFormatter() if log_format == "json" else logging.Formatter(fmt, datefmt)
 
     # 1) Root logger
     root = logging.getLogger()
@@ -44,21 +133,44 @@ def setup_logging():
     # 2) Console handler
     ch = logging.StreamHandler(sys.stdout)
     ch.setLevel(lvl)
-    ch.setFormatter(logging.Formatter(fmt, datefmt))
-    root.addHandler(ch)
+    ch.setFormatter(formatter)
 
     # 3) Rotating file handler
     os.makedirs("logs", exist_ok=True)
     fh = RotatingFileHandler("logs/webui.log", maxBytes=10*1024*1024, backupCount=5)
     fh.setLevel(lvl)
-    fh.setFormatter(logging.Formatter(fmt, datefmt))
-    root.addHandler(fh)
+    fh.setFormatter(formatter)
+
+    handlers = [ch, fh]
+
+    # 4) One file per job
+    if job_log_dir:
+        jh = JobLogHandler(job_log_dir)
+        jh.setLevel(lvl)
+        jh.setFormatter(formatter)
+        handlers.append(jh)
+
+    if not async_logging:
+        for handler in handlers:
+            handler.addFilter(JobContextFilter())
+            root.addHandler(handler)
+        return None
+
+    qh = RecordQueueHandler(queue.SimpleQueue())
+    # tag records on the emitting thread, the listener thread has a different name
+    qh.addFilter(JobContextFilter())
+    root.addHandler(qh)
+    listener = QueueListener(qh.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
 
 
 class WebUI:
-    def __init__(self, args: argparse.Namespace):
+    def __init__(self, args: argparse.Namespace, profiler: StartupProfiler = None):
         super().__init__()
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.profiler = profiler
         self.logger.info(
             "Initializing WebUI",
             extra={
@@ -69,49 +181,139 @@ class WebUI:
 
         self.root_dir = args.root_dir
         self.run_in_new_terminal = args.run_in_new_terminal
+        self.lazy_ui = args.lazy_ui
         self.demo = gr.Blocks()
         self.tabs = []
+        self.job_manager = configure_job_manager(
+            {
+                "cpu": args.max_cpu_jobs,
+                "batch": args.max_batch_jobs,
+                "gpu": args.max_gpu_jobs,
+                "export": args.max_export_jobs,
+                "viewer": args.max_viewer_jobs,
+                "eval": args.max_eval_jobs,
+            },
+            output_log=OutputLogPolicy(
+                head=args.output_log_head,
+                rate=args.output_log_rate,
+                error_pattern=args.output_log_errors,
+                raw_dir=args.job_log_dir or None,
+            ),
+            max_finished=args.max_finished_jobs,
+        )
+        if args.train_supervisor:
+            # supervised runs are separate processes, so several can train at once on their own devices
+            slots = build_device_slots(
+                args.device_type,
+                args.num_devices,
+                devices=args.train_devices.split(",") if args.train_devices else None,
+                num_slots=args.train_slots,
+            )
+            self.job_manager.set_slots("gpu", slots)
+            self.logger.info("Training slots", extra={"slots": [slot.name for slot in slots]})
+        configure_dataset_cache(
+            args.dataset_cache_dir or None,
+            max_bytes=int(args.dataset_cache_gb * 2**30),
+            fast=args.dataset_cache_fast,
+        )
+        evaluator = configure_checkpoint_evaluator(
+            args.root_dir,
+            max_age=args.auto_eval_max_age * 3600,
+            alongside_training=args.eval_alongside_training,
+        )
+        if args.auto_eval:
+            evaluator.start()
 
         if args.enable_trainer_tab:
             from modules.trainer_tab import TrainerTab
             self.logger.info("Loading TrainerTab")
-            self.trainer_tab = TrainerTab(args)
+            with self._phase("TrainerTab.__init__"):
+                self.trainer_tab = TrainerTab(args)
             self.tabs.append(self.trainer_tab)
 
         if args.enable_visualizer_tab:
             from modules.visualizer_tab import VisualizerTab
             self.logger.info("Loading VisualizerTab")
-            self.visualizer_tab = VisualizerTab(args)
+            with self._phase("VisualizerTab.__init__"):
+                self.visualizer_tab = VisualizerTab(args)
             self.tabs.append(self.visualizer_tab)
 
         if args.enable_data_processor_tab:
             from modules.data_processor_tab import DataProcessorTab
             self.logger.info("Loading DataProcessorTab")
-            self.data_processor_tab = DataProcessorTab(args)
+            with self._phase("DataProcessorTab.__init__"):
+                self.data_processor_tab = DataProcessorTab(args)
             self.tabs.append(self.data_processor_tab)
 
         if args.enable_exporter_tab:
             from modules.exporter_tab import ExporterTab
             self.logger.info("Loading ExporterTab")
-            self.exporter_tab = ExporterTab(args)
+            with self._phase("ExporterTab.__init__"):
+                self.exporter_tab = ExporterTab(args)
             self.tabs.append(self.exporter_tab)
 
+        if args.enable_eval_tab:
+            from modules.eval_tab import EvalTab
+            self.logger.info("Loading EvalTab")
+            with self._phase("EvalTab.__init__"):
+                self.eval_tab = EvalTab(args)
+            self.tabs.append(self.eval_tab)
+
+        if args.enable_jobs_tab:
+            from modules.jobs_tab import JobsTab
+            self.logger.info("Loading JobsTab")
+            with self._phase("JobsTab.__init__"):
+                self.jobs_tab = JobsTab(args)
+            self.tabs.append(self.jobs_tab)
+
         self.setup_ui()
         self.logger.info("WebUI setup complete", extra={"tab_count": len(self.tabs)})
 
+    def _phase(self, name, blocks=None):
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.phase(name, blocks)
+
     def setup_ui(self):
         with self.demo:
-            for tab in self.tabs:
-                tab.setup_ui()
+            with gr.Tabs() as tab_bar:
+                for tab in self.tabs:
+                    with self._phase(f"{type(tab).__name__}.setup_ui", self.demo):
+                        tab.setup_ui()
+            if self.lazy_ui:
+                self._wire_lazy_tabs()
+            self._wire_poll_timers(tab_bar)
+        # persist the field specs resolved while building the panels
+        get_schema_cache().save()
+
+    def _wire_lazy_tabs(self):
+        """Let tabs that defer loading their registries fill their choices when first shown."""
+        for i, tab in enumerate(self.tabs):
+            if not hasattr(tab, "on_open"):
+                continue
+            # the first tab is visible on page load and never receives a select event
+            trigger = self.demo.load if i == 0 else tab.tab.select
+            trigger(tab.on_open, inputs=None, outputs=tab.open_outputs)
+
+    def _wire_poll_timers(self, tab_bar):
+        """Run the ``poll_timer`` of a tab only while that tab is selected."""
+        for i, tab in enumerate(self.tabs):
+            timer = getattr(tab, "poll_timer", None)
+            if timer is None:
+                continue
+            if i == 0:
+                self.demo.load(lambda: gr.update(active=True), inputs=None, outputs=timer)
+
+            def toggle(evt: gr.SelectData, index=i):
+                return gr.update(active=evt.index == index)
+
+            tab_bar.select(toggle, inputs=None, outputs=timer)
 
     def launch(self, **kwargs):
         self.logger.info("Launching Gradio app", extra=kwargs)
         self.demo.launch(**kwargs)
 
-if __name__ == "__main__":
-    setup_logging()
-    logger = logging.getLogger("main")
-
+def main(profiler: StartupProfiler = None):
     parser = argparse.ArgumentParser(
         prog="nerfstudio webui",
         description="A gradio based web-ui for nerfstudio.",
@@ -137,12 +339,61 @@ if __name__ == "__main__":
     parser.add_argument("--disable_data_processor_tab", action="store_false", dest="enable_data_processor_tab", help="Disable the Data Processor tab")
     parser.add_argument("--enable_exporter_tab", action="store_true", default=True, help="Enable the Exporter tab")
     parser.add_argument("--disable_exporter_tab", action="store_false", dest="enable_exporter_tab", help="Disable the Exporter tab")
+    parser.add_argument("--enable_eval_tab", action="store_true", default=True, help="Enable the Evaluate tab")
+    parser.add_argument("--disable_eval_tab", action="store_false", dest="enable_eval_tab", help="Disable the Evaluate tab")
+    parser.add_argument("--enable_jobs_tab", action="store_true", default=True, help="Enable the Jobs tab")
+    parser.add_argument("--disable_jobs_tab", action="store_false", dest="enable_jobs_tab", help="Disable the Jobs tab")
+    parser.add_argument("--train_supervisor", action="store_true", default=False, help="Run training in a supervised child process instead of the WebUI process")
+    parser.add_argument("--train_devices", type=str, default="", help="Comma separated CUDA device IDs for concurrent supervised runs (default: all visible)")
+    parser.add_argument("--train_slots", type=int, default=0, help="Max concurrent supervised runs (default: devices / num_devices for cuda, 1 otherwise)")
     parser.add_argument("--use_external_methods", action="store_true", default=False, help="Use external methods in the Trainer tab")
+    parser.add_argument("--profile_startup", "--profile-startup", action="store_true", default=False, help="Profile imports and tab construction, write a report and exit without launching")
+    parser.add_argument("--profile_output", type=str, default="logs/startup_profile.json", help="Path of the JSON report written by --profile_startup")
+    parser.add_argument("--profile_memory", action="store_true", default=False, help="Also trace the allocations of each phase in --profile_startup, which slows the timed phases down")
+    parser.add_argument("--streaming", action="store_true", default=False, help="Push job output to the browser from generator handlers instead of timer polling")
+    parser.add_argument("--stream_max_fps", type=float, default=4.0, help="Max status updates per second and job in --streaming mode")
+    parser.add_argument("--max_cpu_jobs", type=int, default=1, help="Max concurrent CPU jobs (data processing / COLMAP)")
+    parser.add_argument("--max_batch_jobs", type=int, default=DEFAULT_LIMITS["batch"], help="Parallel workers for batch data processing (default: available cores / 4)")
+    parser.add_argument("--max_gpu_jobs", type=int, default=1, help="Max concurrent GPU jobs (training); with --train_supervisor the device slots decide")
+    parser.add_argument("--max_export_jobs", type=int, default=1, help="Max concurrent export jobs")
+    parser.add_argument("--max_finished_jobs", type=int, default=MAX_FINISHED_JOBS, help="Finished jobs kept in the Jobs tab, the oldest are dropped first")
+    parser.add_argument("--max_viewer_jobs", type=int, default=4, help="Max concurrent viewer processes")
+    parser.add_argument("--viewer_pool_size", type=int, default=3, help="Viewers kept running for quick switching between runs (at most --max_viewer_jobs)")
+    parser.add_argument("--viewer_idle_minutes", type=float, default=30.0, help="Minutes after which a viewer that was not opened again is stopped, 0 to keep it")
+    parser.add_argument("--dataset_cache_dir", type=str, default="", help="Directory of the processed-dataset cache (default: ~/.cache/nerfstudio-webui/datasets)")
+    parser.add_argument("--dataset_cache_gb", type=float, default=20.0, help="Size of the processed-dataset cache in GB, 0 to disable it")
+    parser.add_argument("--dataset_cache_fast", action="store_true", default=False, help="Fingerprint data processing inputs by file size and mtime instead of content")
+    parser.add_argument("--max_eval_jobs", type=int, default=1, help="Max concurrent background checkpoint evaluations")
+    parser.add_argument("--auto_eval", action="store_true", default=False, help="Evaluate new checkpoints of the runs under root_dir in the background")
+    parser.add_argument("--auto_eval_max_age", type=float, default=24.0, help="Hours after which a checkpoint is no longer evaluated automatically")
+    parser.add_argument("--eval_alongside_training", action="store_true", default=False, help="Let background evaluations run while training jobs are running or queued")
+    parser.add_argument("--async_logging", action="store_true", default=False, help="Log through a queue drained by a background thread instead of writing on the calling thread")
+    parser.add_argument("--log_format", type=str, choices=["text", "json"], default="text", help="Format of the console and file logs")
+    parser.add_argument("--job_log_dir", type=str, default="logs/jobs", help="Directory for the per-job log files and compressed raw output, empty to disable")
+    parser.add_argument("--output_log_head", type=int, default=10, help="Subprocess output lines always logged at the start of a job")
+    parser.add_argument("--output_log_rate", type=float, default=1.0, help="Subprocess output lines per second logged after the head, the rest is summarized")
+    parser.add_argument("--processing_output_log_rate", type=float, default=0.2, help="Output lines per second logged after the head for data processing jobs, whose COLMAP output has a line per image and pair")
+    parser.add_argument("--output_log_errors", type=str, default=DEFAULT_ERROR_PATTERN, help="Regex of subprocess output lines that are always logged")
+    parser.add_argument("--lazy_ui", action="store_true", default=False, help="Import nerfstudio and build config panels only when a tab or method is first used")
+
+    parsed_args: argparse.Namespace = parser.parse_args()
+    if parsed_args.profile_startup and profiler is None:
+        # restart through the profiler, which also times the imports of this module
+        path = [os.path.dirname(os.path.abspath(__file__)), os.environ.get("PYTHONPATH")]
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, path))}
+        os.execve(sys.executable, [sys.executable, "-m", "utils.profiler", *sys.argv[1:]], env)
+    setup_logging(parsed_args.async_logging, parsed_args.log_format, parsed_args.job_log_dir)
+    logger = logging.getLogger("main")
 
     try:
-        parsed_args: argparse.Namespace = parser.parse_args()
         logger.info("Parsed CLI args", extra={"parsed_args": vars(parsed_args)})
 
+        if parsed_args.profile_startup:
+            WebUI(parsed_args, profiler=profiler)
+            report = profiler.write(parsed_args.profile_output)
+            print(profiler.format_table(report))
+            sys.exit(0)
+
         app = WebUI(parsed_args)
         app.launch(
             inbrowser=True,
@@ -153,3 +404,7 @@ if __name__ == "__main__":
     except Exception:
         logger.exception("Uncaught exception in main")
         raise
+
+
+if __name__ == "__main__":
+    main()